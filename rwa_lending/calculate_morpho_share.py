@@ -1,14 +1,13 @@
+import os
+import sys
 import pandas as pd
 
-print("\n" + "=" * 100)
-print("MORPHO MARKET SHARE OF RWA ASSETS ON PLUME")
-print("=" * 100)
-
-# Load Morpho market data
-df = pd.read_csv('morpho_plume_markets.csv')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from morpho_history import MorphoMarketHistory
+from morpho_markets import PLUME_CHAIN_ID, resolve_aliases
 
 # Total TVL for each asset (provided by user)
-total_tvl = {
+TOTAL_TVL = {
     'nALPHA': 15_000_000,   # $15M
     'nOpal': 2_300_000,     # $2.3M (Note: check if this is nOPAL in the data)
     'nBASIS': 7_200_000,    # $7.2M
@@ -18,123 +17,163 @@ total_tvl = {
     'nINSTO': 5_100_000     # $5.1M
 }
 
-print("\n📊 Calculating Morpho market share for each RWA asset...\n")
-
-# Get supply amounts for each collateral asset from Morpho
-# We need to sum up supply_usd for markets where this asset is the collateral
-morpho_supply = df.groupby('collateral_asset')['supply_usd'].sum().to_dict()
-
-# Get count of markets for each collateral asset
-morpho_market_count = df.groupby('collateral_asset')['market_id'].count().to_dict()
-
-# Also check if any of these are loan assets
-morpho_loan = df.groupby('loan_asset')['supply_usd'].sum().to_dict()
-
-print(f"{'Asset':<15} {'Total TVL':>15} {'Supplied on Morpho':>20} {'# Markets':>12} {'% on Morpho':>15}")
-print("-" * 110)
-
-results = []
-
-for asset, total in total_tvl.items():
-    # Check different possible naming variations
-    morpho_amount = 0
-    market_count = 0
-    
-    # Check exact match
-    if asset in morpho_supply:
-        morpho_amount = morpho_supply[asset]
-        market_count = morpho_market_count.get(asset, 0)
-    
-    # Check without 'n' prefix (e.g., ALPHA instead of nALPHA)
-    asset_without_n = asset[1:] if asset.startswith('n') else asset
-    if asset_without_n in morpho_supply:
-        morpho_amount = morpho_supply[asset_without_n]
-        market_count = morpho_market_count.get(asset_without_n, 0)
-    
-    # Check uppercase variations
-    asset_upper = asset.upper()
-    if asset_upper in morpho_supply:
-        morpho_amount = morpho_supply[asset_upper]
-        market_count = morpho_market_count.get(asset_upper, 0)
-    
-    # Calculate percentage
-    percentage = (morpho_amount / total * 100) if total > 0 else 0
-    
-    results.append({
-        'asset': asset,
-        'total_tvl': total,
-        'morpho_supply': morpho_amount,
-        'market_count': market_count,
-        'percentage': percentage
-    })
-    
-    print(f"{asset:<15} ${total:>14,.0f} ${morpho_amount:>18,.2f} {market_count:>11} {percentage:>14,.2f}%")
-
-# Summary statistics
-total_tvl_sum = sum(r['total_tvl'] for r in results)
-total_morpho_sum = sum(r['morpho_supply'] for r in results)
-total_markets = sum(r['market_count'] for r in results)
-overall_percentage = (total_morpho_sum / total_tvl_sum * 100) if total_tvl_sum > 0 else 0
-
-print("-" * 110)
-print(f"{'TOTAL':<15} ${total_tvl_sum:>14,.0f} ${total_morpho_sum:>18,.2f} {total_markets:>11} {overall_percentage:>14,.2f}%")
-
-print("\n" + "=" * 100)
-print("DETAILED BREAKDOWN BY ASSET")
-print("=" * 100)
-
-# Show detailed breakdown for each asset
-for result in results:
-    asset = result['asset']
-    print(f"\n{asset}")
-    print(f"{'─' * 60}")
-    print(f"  Total TVL on Plume:           ${result['total_tvl']:,.0f}")
-    print(f"  Supplied on Morpho:           ${result['morpho_supply']:,.2f}")
-    print(f"  Number of Morpho Markets:     {result['market_count']}")
-    print(f"  Not on Morpho:                ${result['total_tvl'] - result['morpho_supply']:,.2f}")
-    print(f"  Morpho Market Share:          {result['percentage']:.2f}%")
-    print(f"  Other Protocols Share:        {100 - result['percentage']:.2f}%")
-
-print("\n" + "=" * 100)
-print("ASSETS FOUND IN MORPHO DATA")
-print("=" * 100)
-
-# Show all collateral assets found in Morpho data for reference
-print("\nCollateral Assets in Morpho Markets:")
-print("-" * 80)
-print(f"  {'Asset':<20} {'Total Supply':>15} {'# Markets':>12}")
-print("-" * 80)
-for asset, amount in sorted(morpho_supply.items(), key=lambda x: x[1], reverse=True):
-    if asset and amount > 0:  # Skip empty strings and zero amounts
-        count = morpho_market_count.get(asset, 0)
-        print(f"  {asset:<20} ${amount:>14,.2f} {count:>11}")
-
-print("\n" + "=" * 100)
-print("✅ ANALYSIS COMPLETE")
-print("=" * 100)
-print(f"\n💡 Key Insights:")
-print(f"   • Overall Morpho penetration: {overall_percentage:.2f}% of tracked RWA TVL")
-print(f"   • Total RWA TVL tracked: ${total_tvl_sum:,.0f}")
-print(f"   • Total on Morpho: ${total_morpho_sum:,.2f}")
-
-# Identify high and low penetration assets
-high_penetration = [r for r in results if r['percentage'] > 30]
-low_penetration = [r for r in results if r['percentage'] < 10 and r['percentage'] > 0]
-
-if high_penetration:
-    print(f"\n   📈 High Morpho adoption (>30%):")
-    for r in sorted(high_penetration, key=lambda x: x['percentage'], reverse=True):
-        print(f"      • {r['asset']}: {r['percentage']:.2f}%")
-
-if low_penetration:
-    print(f"\n   📉 Low Morpho adoption (<10%):")
-    for r in sorted(low_penetration, key=lambda x: x['percentage']):
-        print(f"      • {r['asset']}: {r['percentage']:.2f}%")
-
-zero_penetration = [r for r in results if r['percentage'] == 0]
-if zero_penetration:
-    print(f"\n   ⚠️  Not found on Morpho:")
-    for r in zero_penetration:
-        print(f"      • {r['asset']}")
-
-print()
+
+def run(markets_path='morpho_plume_markets.csv', total_tvl=None):
+    """Share of each RWA asset's TVL supplied on Morpho; returns one result dict per asset.
+
+    total_tvl maps asset to its total TVL on Plume (default: TOTAL_TVL). The
+    market history is read from the directory of markets_path, and only its
+    Plume markets count; results then also hold 'supply_history', the supply
+    at each anchor date.
+    """
+    if total_tvl is None:
+        total_tvl = TOTAL_TVL
+
+    print("\n" + "=" * 100)
+    print("MORPHO MARKET SHARE OF RWA ASSETS ON PLUME")
+    print("=" * 100)
+
+    # Load Morpho market data
+    df = pd.read_csv(markets_path)
+
+    print("\n📊 Calculating Morpho market share for each RWA asset...\n")
+
+    # Get supply amounts for each collateral asset from Morpho
+    # We need to sum up supply_usd for markets where this asset is the collateral
+    morpho_supply = df.groupby('collateral_asset')['supply_usd'].sum().to_dict()
+
+    # Get count of markets for each collateral asset
+    morpho_market_count = df.groupby('collateral_asset')['market_id'].count().to_dict()
+
+    # Also check if any of these are loan assets
+    morpho_loan = df.groupby('loan_asset')['supply_usd'].sum().to_dict()
+
+    print(f"{'Asset':<15} {'Total TVL':>15} {'Supplied on Morpho':>20} {'# Markets':>12} {'% on Morpho':>15}")
+    print("-" * 110)
+
+    results = []
+    aliases = resolve_aliases(total_tvl, morpho_supply)
+
+    for asset, total in total_tvl.items():
+        # Name the asset is listed under (nALPHA may be ALPHA or NALPHA)
+        name = aliases.get(asset)
+        morpho_amount = morpho_supply[name] if name is not None else 0
+        market_count = morpho_market_count.get(name, 0) if name is not None else 0
+
+        # Calculate percentage
+        percentage = (morpho_amount / total * 100) if total > 0 else 0
+
+        results.append({
+            'asset': asset,
+            'total_tvl': total,
+            'morpho_supply': morpho_amount,
+            'market_count': market_count,
+            'percentage': percentage
+        })
+
+        print(f"{asset:<15} ${total:>14,.0f} ${morpho_amount:>18,.2f} {market_count:>11} {percentage:>14,.2f}%")
+
+    # Summary statistics
+    total_tvl_sum = sum(r['total_tvl'] for r in results)
+    total_morpho_sum = sum(r['morpho_supply'] for r in results)
+    total_markets = sum(r['market_count'] for r in results)
+    overall_percentage = (total_morpho_sum / total_tvl_sum * 100) if total_tvl_sum > 0 else 0
+
+    print("-" * 110)
+    print(f"{'TOTAL':<15} ${total_tvl_sum:>14,.0f} ${total_morpho_sum:>18,.2f} {total_markets:>11} {overall_percentage:>14,.2f}%")
+
+    print("\n" + "=" * 100)
+    print("DETAILED BREAKDOWN BY ASSET")
+    print("=" * 100)
+
+    # Show detailed breakdown for each asset
+    for result in results:
+        asset = result['asset']
+        print(f"\n{asset}")
+        print(f"{'─' * 60}")
+        print(f"  Total TVL on Plume:           ${result['total_tvl']:,.0f}")
+        print(f"  Supplied on Morpho:           ${result['morpho_supply']:,.2f}")
+        print(f"  Number of Morpho Markets:     {result['market_count']}")
+        print(f"  Not on Morpho:                ${result['total_tvl'] - result['morpho_supply']:,.2f}")
+        print(f"  Morpho Market Share:          {result['percentage']:.2f}%")
+        print(f"  Other Protocols Share:        {100 - result['percentage']:.2f}%")
+
+    print("\n" + "=" * 100)
+    print("ASSETS FOUND IN MORPHO DATA")
+    print("=" * 100)
+
+    # Show all collateral assets found in Morpho data for reference
+    print("\nCollateral Assets in Morpho Markets:")
+    print("-" * 80)
+    print(f"  {'Asset':<20} {'Total Supply':>15} {'# Markets':>12}")
+    print("-" * 80)
+    for asset, amount in sorted(morpho_supply.items(), key=lambda x: x[1], reverse=True):
+        if asset and amount > 0:  # Skip empty strings and zero amounts
+            count = morpho_market_count.get(asset, 0)
+            print(f"  {asset:<20} ${amount:>14,.2f} {count:>11}")
+
+    # Morpho supply over time from the market state history (appended by every fetch)
+    # The history also holds the other chains fetched by morpho_markets.py
+    history = MorphoMarketHistory.load(os.path.dirname(markets_path) or '.')
+    supply_series = history.asset_series('supply_usd', by='collateral_asset', chain_ids=[PLUME_CHAIN_ID])
+    if not supply_series.empty:
+        print("\n" + "=" * 100)
+        print("MORPHO SUPPLY OVER TIME")
+        print("=" * 100)
+        latest_date = supply_series.index[-1]
+        anchors = {'Now': latest_date}
+        for days in (7, 30, 90):
+            anchor = latest_date - pd.Timedelta(days=days)
+            if anchor >= supply_series.index[0]:
+                anchors[f'{days}d ago'] = anchor
+        print(f"\nHistory: {supply_series.index[0]:%Y-%m-%d} to {latest_date:%Y-%m-%d} "
+              f"({len(history.states):,} market states)\n")
+        print(f"{'Asset':<15}" + ''.join(f"{label:>20}" for label in anchors) + f"{'% on Morpho (now)':>20}")
+        print("-" * 100)
+        series_aliases = resolve_aliases(total_tvl, supply_series.columns)
+        for result in results:
+            name = series_aliases.get(result['asset'])
+            values = list(supply_series[name].reindex(list(anchors.values())).fillna(0)) if name is not None else [0] * len(anchors)
+            share = values[0] / result['total_tvl'] * 100 if result['total_tvl'] > 0 else 0
+            result['supply_history'] = dict(zip(anchors, values))
+            print(f"{result['asset']:<15}" + ''.join(f" ${value:>18,.2f}" for value in values) + f"{share:>19,.2f}%")
+
+    print("\n" + "=" * 100)
+    print("✅ ANALYSIS COMPLETE")
+    print("=" * 100)
+    print(f"\n💡 Key Insights:")
+    print(f"   • Overall Morpho penetration: {overall_percentage:.2f}% of tracked RWA TVL")
+    print(f"   • Total RWA TVL tracked: ${total_tvl_sum:,.0f}")
+    print(f"   • Total on Morpho: ${total_morpho_sum:,.2f}")
+
+    # Identify high and low penetration assets
+    high_penetration = [r for r in results if r['percentage'] > 30]
+    low_penetration = [r for r in results if r['percentage'] < 10 and r['percentage'] > 0]
+
+    if high_penetration:
+        print(f"\n   📈 High Morpho adoption (>30%):")
+        for r in sorted(high_penetration, key=lambda x: x['percentage'], reverse=True):
+            print(f"      • {r['asset']}: {r['percentage']:.2f}%")
+
+    if low_penetration:
+        print(f"\n   📉 Low Morpho adoption (<10%):")
+        for r in sorted(low_penetration, key=lambda x: x['percentage']):
+            print(f"      • {r['asset']}: {r['percentage']:.2f}%")
+
+    zero_penetration = [r for r in results if r['percentage'] == 0]
+    if zero_penetration:
+        print(f"\n   ⚠️  Not found on Morpho:")
+        for r in zero_penetration:
+            print(f"      • {r['asset']}")
+
+    print()
+
+    return results
+
+
+def main():
+    run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""Entry point for python src: runs the pipeline (see pipeline.py)"""
+
+from pipeline import main
+
+main()
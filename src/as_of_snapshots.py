@@ -0,0 +1,237 @@
+"""
+As-Of Snapshot Engine
+Chain DeFi TVL and stablecoin TVL as of any past date, with 30d/90d growth
+as of that date and growth from then to now, computed from locally stored
+histories without network calls:
+
+    engine = AsOfSnapshots.load()
+    report = engine.report(['2024-09-01', '2025-01-01'])
+
+The histories are the chain_tvl_history table (one row per chain and day
+from /v2/historicalChainTvl, written by defillama_import.py, Parquet when
+pyarrow is installed, CSV otherwise) and all_stablecoins_chain_distribution.csv.
+
+Every value is the point nearest to the requested date (the earlier one on
+a tie), like looking it up in each chain's (and each stablecoin's per-chain)
+history by hand. Each history is packed once into sorted numpy arrays
+(SeriesIndex), so all chains, dates and lookbacks are answered by one
+searchsorted, and stablecoin totals per chain and date are accumulated with
+one np.bincount: a multi-date report costs about the same as a single date.
+Stablecoin TVL sums the positive circulating values of every stablecoin in
+the distribution data. Current TVL is the latest point of each chain's
+history.
+
+Run directly for a CSV of any dates (python src/as_of_snapshots.py 2024-09-01
+2025-01-01); september_2024_tvl_analysis.py is the September 1, 2024 report.
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from protocol_tvls import has_parquet
+
+CHAIN_HISTORY_BASENAME = 'chain_tvl_history'
+DISTRIBUTION_FILE = 'all_stablecoins_chain_distribution.csv'
+LOOKBACK_DAYS = (30, 90)
+
+REPORT_COLUMNS = ['as_of_date', 'chain', 'defi_tvl', 'stablecoin_tvl', 'total_tvl', 'current_tvl',
+                  'current_vs_as_of_growth', 'stablecoin_percentage']
+
+
+def chain_history_frame(histories):
+    """Long (chain, date, tvl) table from {chain name: /v2/historicalChainTvl points}"""
+    chains, dates, values = [], [], []
+    for chain, points in histories.items():
+        points = [point for point in points if 'date' in point and 'tvl' in point]
+        chains.append(np.full(len(points), chain, dtype=object))
+        dates.append(np.array([point['date'] for point in points], dtype=np.int64))
+        values.append(np.array([point['tvl'] for point in points], dtype=float))
+    if not chains:
+        return pd.DataFrame({'chain': [], 'date': pd.to_datetime([]), 'tvl': []})
+    return pd.DataFrame({
+        'chain': np.concatenate(chains),
+        'date': pd.to_datetime(np.concatenate(dates), unit='s'),
+        'tvl': np.concatenate(values),
+    })
+
+
+def save_chain_tvl_history(df, directory='.'):
+    """Write the table as Parquet (or CSV without pyarrow); returns the path"""
+    if has_parquet():
+        path = os.path.join(directory, f"{CHAIN_HISTORY_BASENAME}.parquet")
+        df.to_parquet(path, index=False)
+    else:
+        path = os.path.join(directory, f"{CHAIN_HISTORY_BASENAME}.csv")
+        df.to_csv(path, index=False)
+    return path
+
+
+def load_chain_tvl_history(directory='.'):
+    """Load the table written by defillama_import.py"""
+    parquet_path = os.path.join(directory, f"{CHAIN_HISTORY_BASENAME}.parquet")
+    csv_path = os.path.join(directory, f"{CHAIN_HISTORY_BASENAME}.csv")
+    if os.path.exists(parquet_path) and has_parquet():
+        return pd.read_parquet(parquet_path)
+    if os.path.exists(csv_path):
+        return pd.read_csv(csv_path, parse_dates=['date'])
+    raise FileNotFoundError(
+        f"{CHAIN_HISTORY_BASENAME}.parquet/.csv not found. Please run the main import script first.")
+
+
+def epoch_seconds(dates):
+    return np.asarray(pd.to_datetime(dates).values.astype('datetime64[s]').astype(np.int64))
+
+
+class SeriesIndex:
+    """Many (group, timestamp, value) series packed into sorted numpy arrays.
+
+    Rows are ordered by group code, then timestamp, so the point nearest a
+    (group, timestamp) query is found with one searchsorted over the
+    combined key code * span + timestamp for any number of queries.
+    """
+
+    def __init__(self, codes, timestamps, values):
+        order = np.lexsort((timestamps, codes))
+        self.codes = np.asarray(codes, dtype=np.int64)[order]
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)[order]
+        self.values = np.asarray(values, dtype=float)[order]
+
+    @classmethod
+    def from_frame(cls, df, keys, value):
+        """Index df[value] by the keys columns and date; returns (index, group labels)"""
+        groups = pd.MultiIndex.from_frame(df[keys])
+        codes, labels = groups.factorize()
+        return cls(codes, epoch_seconds(df['date']), df[value].to_numpy(dtype=float)), labels.set_names(keys)
+
+    def positions(self, codes, timestamps):
+        """Sorted-row position of the point nearest each query in its group; -1 for empty groups"""
+        codes = np.asarray(codes, dtype=np.int64)
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        if not len(self.codes) or not len(codes):
+            return np.full(len(codes), -1, dtype=np.int64)
+        base = min(self.timestamps.min(), timestamps.min())
+        span = max(self.timestamps.max(), timestamps.max()) - base + 1
+        keys = self.codes * span + (self.timestamps - base)
+        after = np.searchsorted(keys, codes * span + (timestamps - base), side='left')
+        before = after - 1
+
+        last = len(keys) - 1
+        has_after = (after <= last) & (self.codes[np.minimum(after, last)] == codes)
+        has_before = (before >= 0) & (self.codes[np.maximum(before, 0)] == codes)
+        before_gap = timestamps - self.timestamps[np.maximum(before, 0)]
+        after_gap = self.timestamps[np.minimum(after, last)] - timestamps
+        use_before = has_before & (~has_after | (before_gap <= after_gap))
+        return np.where(use_before, before, np.where(has_after, after, -1))
+
+    def nearest(self, codes, timestamps):
+        """Value of the point nearest each query; NaN for empty groups"""
+        positions = self.positions(codes, timestamps)
+        return np.where(positions >= 0, self.values[np.maximum(positions, 0)], np.nan)
+
+
+class AsOfSnapshots:
+    """Nearest-point lookups over the chain TVL and stablecoin histories"""
+
+    def __init__(self, chain_tvl, stablecoins=None):
+        self.tvl_index, chains = SeriesIndex.from_frame(chain_tvl, ['chain'], 'tvl')
+        self.chains = chains.get_level_values('chain')
+        # Rows are sorted by chain code then date, so each chain's last row is its latest point
+        last = np.flatnonzero(np.r_[self.tvl_index.codes[1:] != self.tvl_index.codes[:-1], True])
+        self.current_tvl = pd.Series(self.tvl_index.values[last], index=self.chains[self.tvl_index.codes[last]])
+        self.stablecoins = None
+        if stablecoins is not None:
+            self.stablecoins, pairs = SeriesIndex.from_frame(stablecoins, ['stablecoin_id', 'chain'], 'circulating')
+            # Chain of every (stablecoin, chain) series, as a code into self.stablecoin_chains
+            self.pair_chains, self.stablecoin_chains = pd.factorize(pairs.get_level_values('chain'))
+
+    @classmethod
+    def load(cls, directory='.'):
+        """Build from the files written by defillama_import.py; stablecoins are optional"""
+        chain_tvl = load_chain_tvl_history(directory)
+        stablecoins = None
+        distribution_path = os.path.join(directory, DISTRIBUTION_FILE)
+        if os.path.exists(distribution_path):
+            stablecoins = pd.read_csv(distribution_path, usecols=['stablecoin_id', 'chain', 'date', 'circulating'],
+                                      parse_dates=['date'])
+        return cls(chain_tvl, stablecoins)
+
+    def defi_tvl(self, dates, days_before=(0,)):
+        """Chain TVL nearest to each date, and to days_before days before it.
+
+        Wide frame indexed by (as_of_date, chain) with one column per
+        days_before entry.
+        """
+        dates = pd.to_datetime(pd.Index(dates))
+        chain_codes = np.tile(np.arange(len(self.chains)), len(dates))
+        as_of = np.repeat(epoch_seconds(dates), len(self.chains))
+        index = pd.MultiIndex.from_arrays([np.repeat(dates.values, len(self.chains)), self.chains[chain_codes]],
+                                          names=['as_of_date', 'chain'])
+        return pd.DataFrame({
+            days: self.tvl_index.nearest(chain_codes, as_of - days * 86400) for days in days_before
+        }, index=index)
+
+    def stablecoin_tvl(self, dates):
+        """Positive stablecoin circulating supply summed per (as_of_date, chain)"""
+        dates = pd.to_datetime(pd.Index(dates))
+        if self.stablecoins is None:
+            return pd.Series(dtype=float, index=pd.MultiIndex.from_arrays([[], []], names=['as_of_date', 'chain']))
+        n_pairs, n_chains = len(self.pair_chains), len(self.stablecoin_chains)
+        circulating = self.stablecoins.nearest(np.tile(np.arange(n_pairs), len(dates)),
+                                               np.repeat(epoch_seconds(dates), n_pairs))
+        positive = circulating > 0
+        # One slot per (date, chain); every series adds its as-of value to its chain's slot
+        slots = (np.repeat(np.arange(len(dates)), n_pairs) * n_chains + np.tile(self.pair_chains, len(dates)))[positive]
+        totals = np.bincount(slots, weights=circulating[positive], minlength=len(dates) * n_chains)
+        counts = np.bincount(slots, minlength=len(dates) * n_chains)
+        index = pd.MultiIndex.from_product([dates, self.stablecoin_chains], names=['as_of_date', 'chain'])
+        return pd.Series(totals, index=index, name='circulating')[counts > 0]
+
+    def report(self, dates, lookback_days=LOOKBACK_DAYS):
+        """One row per (as_of_date, chain) with any TVL or stablecoins as of that date.
+
+        Columns: REPORT_COLUMNS plus growth_{n}d for each lookback (NaN when
+        the TVL n days earlier was 0). Sorted by date, then total TVL.
+        """
+        dates = pd.to_datetime(pd.Index(dates))
+        tvl = self.defi_tvl(dates, (0,) + tuple(lookback_days))
+        report = pd.DataFrame({'defi_tvl': tvl[0]})
+        report['stablecoin_tvl'] = self.stablecoin_tvl(dates).reindex(report.index, fill_value=0)
+        report['total_tvl'] = report['defi_tvl'] + report['stablecoin_tvl']
+        for days in lookback_days:
+            past = tvl[days]
+            report[f'growth_{days}d'] = ((report['defi_tvl'] - past) / past).where(past > 0)
+        report['current_tvl'] = self.current_tvl.reindex(report.index.get_level_values('chain')).values
+        report['current_vs_as_of_growth'] = (
+            (report['current_tvl'] - report['defi_tvl']) / report['defi_tvl']
+        ).where(report['defi_tvl'] > 0)
+        report['stablecoin_percentage'] = report['stablecoin_tvl'] / report['total_tvl'] * 100
+
+        report = report[report['total_tvl'] > 0].reset_index()
+        report = report.sort_values(['as_of_date', 'total_tvl'], ascending=[True, False], kind='stable')
+        growth_columns = [f'growth_{days}d' for days in lookback_days]
+        return report[REPORT_COLUMNS[:5] + growth_columns + REPORT_COLUMNS[5:]].reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Chain DeFi and stablecoin TVL as of past dates, from local histories')
+    parser.add_argument('dates', nargs='+', help='As-of dates (YYYY-MM-DD)')
+    parser.add_argument('--output', default='tvl_as_of_analysis.csv', help='CSV to write')
+    args = parser.parse_args()
+
+    engine = AsOfSnapshots.load()
+    report = engine.report(args.dates)
+    report.to_csv(args.output, index=False)
+
+    print(f"\n{'As of':<12} {'Chains':>8} {'DeFi TVL':>22} {'Stablecoin TVL':>22}  Top chain")
+    print("-" * 90)
+    for as_of_date, rows in report.groupby('as_of_date', sort=True):
+        print(f"{as_of_date:%Y-%m-%d}   {len(rows):>8} ${rows['defi_tvl'].sum():>20,.0f} "
+              f"${rows['stablecoin_tvl'].sum():>20,.0f}  {rows.iloc[0]['chain']}")
+    print(f"\n✅ Saved {len(report):,} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
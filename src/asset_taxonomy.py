@@ -0,0 +1,100 @@
+"""
+Asset Taxonomy Registry
+Classifies pool symbols into asset types (BTC Tokens, ETH LSTs, ETH,
+Stablecoins, Other Assets) and names the issuers of the tracked LST/LRT
+tokens, from one data file (asset_taxonomy.json at the repository root):
+
+    taxonomy = AssetTaxonomy.load()
+    taxonomy.classify('wstETH')                  # 'ETH LSTs'
+    df['asset_type'] = taxonomy.classify_symbols(df['symbol'])
+    taxonomy.lst_lrt_issuers['WEETH']            # 'Ether.fi'
+
+Exact symbols live in one dict (first listed type wins); the ordered
+substring rules are compiled into a single anchored regex whose alternatives
+are tried in rule order, so one match per symbol gives the first rule that
+applies. Results are memoized per distinct symbol, and classify_symbols()
+classifies each distinct symbol of a column once.
+
+Used by lending_assets_by_chain.py and lst_lrt_tvl_by_chain.py.
+"""
+
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+TAXONOMY_FILE = os.path.join(os.path.dirname(SRC_DIR), 'asset_taxonomy.json')
+
+
+def compile_rules(rules):
+    """One regex for the ordered substring rules; the matching group names the rule.
+
+    Each rule becomes a lookahead branch (?!excluded$)(?=.*(a|b))(?P<rN>), so
+    the first branch that matches at position 0 is the first rule in order,
+    whatever the position of its substring in the symbol.
+    """
+    branches = []
+    for i, rule in enumerate(rules):
+        contains = '|'.join(re.escape(token) for token in rule['contains'])
+        excluded = '|'.join(re.escape(symbol) for symbol in rule.get('except', []))
+        branch = f"(?=.*(?:{contains}))(?P<r{i}>)"
+        if excluded:
+            branch = f"(?!(?:{excluded})$)" + branch
+        branches.append(branch)
+    return re.compile('|'.join(branches) or r'(?!)', re.DOTALL)
+
+
+class AssetTaxonomy:
+    """Exact-match symbol table plus ordered substring rules"""
+
+    def __init__(self, config):
+        self.exact = {}
+        for asset_type, symbols in config.get('exact', {}).items():
+            for symbol in symbols:
+                self.exact.setdefault(symbol.upper(), asset_type)
+        self.rules = config.get('rules', [])
+        self.rule_types = [rule['asset_type'] for rule in self.rules]
+        self.pattern = compile_rules(self.rules)
+        self.default = config.get('default', 'Other Assets')
+        self.lst_lrt_issuers = {symbol.upper(): issuer for symbol, issuer in config.get('lst_lrt_issuers', {}).items()}
+        self._memo = {}
+
+    @classmethod
+    def load(cls, path=TAXONOMY_FILE):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def classify(self, symbol):
+        """Asset type of one symbol (case-insensitive)"""
+        try:
+            return self._memo[symbol]
+        except KeyError:
+            pass
+        symbol_upper = symbol.upper()
+        asset_type = self.exact.get(symbol_upper)
+        if asset_type is None:
+            match = self.pattern.match(symbol_upper)
+            asset_type = self.rule_types[int(match.lastgroup[1:])] if match else self.default
+        self._memo[symbol] = asset_type
+        return asset_type
+
+    def classify_symbols(self, symbols):
+        """Asset type of every symbol in a Series, classifying each distinct symbol once"""
+        codes, uniques = pd.factorize(symbols)
+        # Missing symbols have code -1 and pick up the trailing None
+        labels = np.array([self.classify(symbol) for symbol in uniques] + [None], dtype=object)
+        return pd.Series(labels[codes], index=symbols.index, name='asset_type')
+
+
+_default = None
+
+
+def get_taxonomy():
+    """The registry from asset_taxonomy.json, loaded once per process"""
+    global _default
+    if _default is None:
+        _default = AssetTaxonomy.load()
+    return _default
@@ -0,0 +1,419 @@
+"""
+Benchmark Suite for the Analysis Hot Paths
+Times each stage and measures its peak RSS against a fixed synthetic dataset
+(see synthetic_data.py) served in replay mode, and shows the results next to
+the JSON baselines in benchmark_baselines.json. Baselines are wall times and
+peaks from the machine that recorded them, so regressions only fail the run
+with --compare, on that machine; otherwise only stage errors do.
+
+Every stage runs in its own child process so peak RSS is measured per stage.
+Pipeline stages are called through their module's run() (see pipeline.py),
+and every section() they reach is recorded as a benchmark section, so the
+report shows where the time goes inside each stage.
+
+Usage:
+    python src/benchmarks.py                       # run all stages, show them next to the baselines
+    python src/benchmarks.py --compare             # ... and fail on regressions
+    python src/benchmarks.py stablecoin_analysis   # run selected stages
+    python src/benchmarks.py --update              # record new baselines
+    python src/benchmarks.py --list
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+from instrumentation import on_section
+from synthetic_data import SyntheticDataset, process_peak_rss_mb, replay_env, write_csvs, write_fixtures
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(SRC_DIR)
+DEFAULT_BASELINE_FILE = os.path.join(REPO_DIR, 'benchmark_baselines.json')
+DEFAULT_DATA_DIR = os.path.join(REPO_DIR, 'synthetic', 'bench')
+
+# Fixed dataset every benchmark runs against; changing it invalidates the baselines
+BENCH_DATASET = {'scale': 0.25, 'days': 1000, 'seed': 7}
+INPUT_FILES = ['all_stablecoins_chain_distribution.csv', 'tvl_data.csv', 'tvl_data.json', 'chain_tvl_data.csv',
+               'protocol_chain_tvls.parquet', 'protocol_chain_tvls.csv']
+UPDATE_SHEET_ROWS = 50000
+
+# Time differences below this are treated as noise
+MIN_SECONDS_DELTA = 0.05
+
+# Stage definitions. Module stages call the module's run() and record its
+# section() steps; call stages run a bench_* function of this file.
+STAGES = {
+    'defillama_import.records': {
+        'call': 'bench_stablecoin_records',
+    },
+    'stablecoin_analysis': {
+        'module': 'stablecoin_analysis',
+    },
+    'lending_tvl_by_chain': {
+        'module': 'lending_tvl_by_chain',
+    },
+    'lending_assets_by_chain': {
+        'module': 'lending_assets_by_chain',
+    },
+    'chain_launch_analysis': {
+        'module': 'chain_launch_analysis',
+    },
+    'chain_comparison.load_existing_data': {
+        'call': 'bench_load_existing_data',
+    },
+    'google_sheets.update_sheet': {
+        'call': 'bench_update_sheet',
+    },
+}
+
+
+class SectionRecorder:
+    """Collects wall time, RSS high-water mark and (optionally) traced peak per section"""
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.sections = []
+        self.marking = False
+        self.open_mark = None
+        if trace_memory:
+            tracemalloc.start()
+        on_section(self.mark)
+
+    def _start(self):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        return time.perf_counter()
+
+    def _record(self, label, start):
+        record = {
+            'section': label,
+            'seconds': time.perf_counter() - start,
+            'rss_high_water_mb': process_peak_rss_mb(),
+        }
+        if self.trace_memory:
+            record['traced_peak_mb'] = tracemalloc.get_traced_memory()[1] / 1e6
+        self.sections.append(record)
+
+    @contextmanager
+    def section(self, label):
+        start = self._start()
+        try:
+            yield
+        finally:
+            self._record(label, start)
+
+    def mark(self, label):
+        """section() listener: inside marks(), each section ends the previous one"""
+        if not self.marking:
+            return
+        self._end_mark()
+        self.open_mark = (label, self._start())
+
+    def _end_mark(self):
+        if self.open_mark:
+            self._record(*self.open_mark)
+            self.open_mark = None
+
+    @contextmanager
+    def marks(self):
+        """Record every section() reached in the block as a section"""
+        self.marking = True
+        try:
+            yield
+        finally:
+            self._end_mark()
+            self.marking = False
+
+
+def run_module_stage(spec, recorder):
+    """Import a pipeline stage module and call its run(), timing each of its sections"""
+    with recorder.section('setup'):
+        module = importlib.import_module(spec['module'])
+    with recorder.marks():
+        module.run()
+
+
+class _Executed:
+    def __init__(self, result):
+        self.result = result
+
+    def execute(self):
+        return self.result
+
+
+class NullSheetsService:
+    """Stands in for the Sheets API client; serializes payloads like the real client"""
+
+    def __init__(self):
+        self.payload_bytes = 0
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def get(self, **kwargs):
+        return _Executed({'sheets': [{'properties': {'title': 'Benchmark', 'sheetId': 0}}]})
+
+    def batchUpdate(self, **kwargs):
+        return _Executed({'replies': [{'addSheet': {'properties': {'sheetId': 1}}}]})
+
+    def clear(self, **kwargs):
+        return _Executed({})
+
+    def update(self, body=None, **kwargs):
+        self.payload_bytes += len(json.dumps(body))
+        return _Executed({})
+
+
+def bench_stablecoin_records(recorder):
+    with recorder.section('setup'):
+        from defillama import DefiLlama
+        from defillama_import import fetch_stablecoin_distribution, usdc_market_share
+        from llama_http import get_session
+        llama = DefiLlama()
+        llama.session = get_session()
+    with recorder.marks():
+        df, stablecoin_index = fetch_stablecoin_distribution(llama)
+        usdc_market_share(df, stablecoin_index)
+
+
+def bench_load_existing_data(recorder):
+    from chain_comparison_analysis import ChainComparisonAnalysis
+    with recorder.section('setup database'):
+        analysis = ChainComparisonAnalysis(db_path='bench_chain_data.db')
+    with recorder.section('load_existing_data'):
+        analysis.load_existing_data()
+
+
+def bench_update_sheet(recorder):
+    import pandas as pd
+    from google_sheets_upload import update_sheet
+    with recorder.section('read CSV'):
+        data = pd.read_csv('all_stablecoins_chain_distribution.csv', nrows=UPDATE_SHEET_ROWS)
+    with recorder.section('update_sheet'):
+        update_sheet(NullSheetsService(), 'Benchmark', data)
+
+
+def run_child(stage, result_path, trace_memory):
+    """Entry point inside the benchmark child process"""
+    spec = STAGES[stage]
+    recorder = SectionRecorder(trace_memory)
+    error = None
+    try:
+        if 'module' in spec:
+            run_module_stage(spec, recorder)
+        else:
+            globals()[spec['call']](recorder)
+    except SystemExit:
+        pass
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    with open(result_path, 'w') as f:
+        json.dump({'sections': recorder.sections, 'peak_rss_mb': process_peak_rss_mb(), 'error': error}, f)
+    return 1 if error else 0
+
+
+def ensure_dataset(data_dir):
+    """Generate the fixed benchmark dataset unless it is already present"""
+    marker = os.path.join(data_dir, 'dataset.json')
+    if os.path.exists(marker) and os.path.exists(os.path.join(data_dir, 'work', 'tvl_data.json')):
+        with open(marker) as f:
+            if json.load(f) == BENCH_DATASET:
+                return
+    print(f"🧪 Generating benchmark dataset {BENCH_DATASET} in {data_dir}")
+    shutil.rmtree(data_dir, ignore_errors=True)
+    dataset = SyntheticDataset.at_scale(BENCH_DATASET['scale'], days=BENCH_DATASET['days'], seed=BENCH_DATASET['seed'])
+    write_fixtures(dataset, os.path.join(data_dir, 'fixtures'))
+    write_csvs(dataset, os.path.join(data_dir, 'work'))
+    with open(marker, 'w') as f:
+        json.dump(BENCH_DATASET, f)
+
+
+def run_stage(stage, data_dir, trace_memory=False):
+    """Run one stage in a fresh working directory and child process"""
+    workdir = tempfile.mkdtemp(prefix=f"bench_{stage}_")
+    try:
+        for name in INPUT_FILES:
+            # Copies, not symlinks: some stages rewrite their inputs
+            source = os.path.join(data_dir, 'work', name)
+            if os.path.exists(source):
+                shutil.copy(source, workdir)
+        result_path = os.path.join(workdir, 'bench_result.json')
+        cmd = [sys.executable, os.path.abspath(__file__), '_child', stage, '--result', result_path]
+        if trace_memory:
+            cmd.append('--trace-memory')
+
+        start = time.perf_counter()
+        proc = subprocess.run(cmd, cwd=workdir, env=replay_env(os.path.join(data_dir, 'fixtures')),
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        seconds = time.perf_counter() - start
+
+        child = {'sections': [], 'peak_rss_mb': float('nan'), 'error': None}
+        if os.path.exists(result_path):
+            with open(result_path) as f:
+                child = json.load(f)
+        if proc.returncode != 0 and not child['error']:
+            child['error'] = proc.stderr.decode('utf-8', 'replace')[-2000:] or f"exit code {proc.returncode}"
+        return {
+            'seconds': round(seconds, 3),
+            'peak_rss_mb': round(child['peak_rss_mb'], 1),
+            'sections': {s['section']: {k: round(v, 3) for k, v in s.items() if k != 'section'}
+                         for s in child['sections']},
+            'error': child['error'],
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def load_baselines(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baselines(path, results, previous):
+    stages = dict(previous.get('stages', {}))
+    for stage, result in results.items():
+        if not result['error']:
+            stages[stage] = {k: v for k, v in result.items() if k != 'error'}
+    baselines = {
+        'dataset': BENCH_DATASET,
+        'recorded_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'stages': dict(sorted(stages.items())),
+    }
+    with open(path, 'w') as f:
+        json.dump(baselines, f, indent=2)
+        f.write('\n')
+    print(f"\n✓ Baselines saved to {path}")
+
+
+def compare(results, baselines, time_tolerance, memory_tolerance):
+    """Print a comparison table and return the list of regressed or failed stages"""
+    regressions = []
+    if baselines and baselines.get('dataset') != BENCH_DATASET:
+        print(f"⚠️  Baselines were recorded on dataset {baselines.get('dataset')}, run with --update")
+        baselines = {}
+
+    print("\n" + "=" * 92)
+    print(f"{'Stage':<38} {'Time (s)':>10} {'Base':>8} {'Δ':>8} {'RSS (MB)':>10} {'Base':>8} {'Δ':>8}")
+    print("=" * 92)
+    for stage, result in results.items():
+        if result['error']:
+            print(f"{stage:<38} ❌ {result['error'].strip().splitlines()[-1][:50]}")
+            regressions.append(stage)
+            continue
+        base = baselines.get('stages', {}).get(stage)
+        if not base:
+            print(f"{stage:<38} {result['seconds']:>10.2f} {'new':>8} {'':>8} {result['peak_rss_mb']:>10.0f}")
+            continue
+
+        time_delta = result['seconds'] / base['seconds'] - 1 if base['seconds'] else 0
+        rss_delta = result['peak_rss_mb'] / base['peak_rss_mb'] - 1 if base['peak_rss_mb'] else 0
+        slow = time_delta > time_tolerance and result['seconds'] - base['seconds'] > MIN_SECONDS_DELTA
+        heavy = rss_delta > memory_tolerance
+        flag = ' ❌' if slow or heavy else ''
+        print(f"{stage:<38} {result['seconds']:>10.2f} {base['seconds']:>8.2f} {time_delta:>+8.0%} "
+              f"{result['peak_rss_mb']:>10.0f} {base['peak_rss_mb']:>8.0f} {rss_delta:>+8.0%}{flag}")
+        if slow or heavy:
+            regressions.append(stage)
+    return regressions
+
+
+def print_sections(results):
+    for stage, result in results.items():
+        if not result['sections']:
+            continue
+        print(f"\n{stage}")
+        for label, stats in result['sections'].items():
+            extra = f"  traced peak {stats['traced_peak_mb']:.0f} MB" if 'traced_peak_mb' in stats else ''
+            print(f"  {label[:55]:<55} {stats['seconds']:>8.2f}s  RSS {stats['rss_high_water_mb']:>6.0f} MB{extra}")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '_child':
+        child_parser = argparse.ArgumentParser()
+        child_parser.add_argument('command')
+        child_parser.add_argument('stage', choices=list(STAGES))
+        child_parser.add_argument('--result', required=True)
+        child_parser.add_argument('--trace-memory', action='store_true')
+        args = child_parser.parse_args()
+        sys.exit(run_child(args.stage, args.result, args.trace_memory))
+
+    parser = argparse.ArgumentParser(description='Benchmark the analysis stages against a fixed synthetic dataset')
+    parser.add_argument('stages', nargs='*', help='Stages to run (default: all)')
+    parser.add_argument('--list', action='store_true', help='List stages and exit')
+    parser.add_argument('--update', action='store_true', help='Record results as the new baselines')
+    parser.add_argument('--compare', action='store_true',
+                        help='Fail on regressions against the baselines (only meaningful on the machine that recorded them)')
+    parser.add_argument('--baselines', default=DEFAULT_BASELINE_FILE)
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR)
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per stage; the fastest is kept')
+    parser.add_argument('--time-tolerance', type=float, default=0.25, help='Allowed slowdown (0.25 = 25%%)')
+    parser.add_argument('--memory-tolerance', type=float, default=0.15, help='Allowed peak RSS growth')
+    parser.add_argument('--trace-memory', action='store_true', help='Also record tracemalloc peaks per section')
+    parser.add_argument('--json', help='Write the raw results to this file')
+    args = parser.parse_args()
+
+    if args.list:
+        for stage in STAGES:
+            print(stage)
+        return
+
+    unknown = [s for s in args.stages if s not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+    stages = args.stages or list(STAGES)
+
+    ensure_dataset(args.data_dir)
+
+    results = {}
+    for stage in stages:
+        print(f"⏱️  {stage}...")
+        runs = [run_stage(stage, args.data_dir, args.trace_memory) for _ in range(max(args.repeat, 1))]
+        ok = [r for r in runs if not r['error']]
+        results[stage] = min(ok, key=lambda r: r['seconds']) if ok else runs[0]
+
+    print_sections(results)
+    baselines = load_baselines(args.baselines)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.update:
+        compare(results, {}, args.time_tolerance, args.memory_tolerance)
+        save_baselines(args.baselines, results, baselines)
+        return
+
+    regressions = compare(results, baselines, args.time_tolerance, args.memory_tolerance)
+    if not args.compare:
+        regressions = [stage for stage in regressions if results[stage]['error']]
+        if regressions:
+            print(f"\n❌ {len(regressions)} stage(s) failed: {', '.join(regressions)}")
+            sys.exit(1)
+        print(f"\n✅ All stages ran (baselines from {baselines.get('machine', 'unknown')} "
+              f"{baselines.get('recorded_at', '')}; pass --compare to enforce them)")
+        return
+    if regressions:
+        print(f"\n❌ {len(regressions)} stage(s) regressed or failed: {', '.join(regressions)}")
+        sys.exit(1)
+    print("\n✅ All stages within tolerance")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""
+Category Chain TVL Cube
+Aggregates the protocol_chain_tvls table (see protocol_tvls.py) into a
+(category × chain × metric) cube of summed values and protocol counts in a
+single groupby, so per-category chain breakdowns (Lending, Dexs, CDP, Liquid
+Staking, RWA, ...) are slices of one structure instead of one script per
+category re-parsing the same data.
+
+    cube = CategoryCube.load()
+    cube.chain_summary('Lending')          # TVL, borrowed, counts, utilization
+    cube.top_chains(5, category='CDP')     # top-N chains per category
+    cube.chain_share(category='RWA')       # each chain's share of the category
+
+Run directly to write category_chain_tvl.csv for every category.
+"""
+
+import pandas as pd
+
+from protocol_tvls import load_protocol_chain_tvls, normalize_chain_tvls
+
+CUBE_LEVELS = ['category', 'chain', 'metric']
+
+
+class CategoryCube:
+    """Summed value and protocol count per category, chain and metric"""
+
+    def __init__(self, table):
+        positive = table[table['value'] > 0]
+        self.cube = (
+            positive.groupby(CUBE_LEVELS, observed=True)['value']
+            .agg(['sum', 'count'])
+            .rename(columns={'sum': 'value', 'count': 'protocols'})
+        )
+
+    @classmethod
+    def from_protocols(cls, protocols):
+        """Build from the raw /protocols JSON list"""
+        return cls(normalize_chain_tvls(protocols))
+
+    @classmethod
+    def load(cls, directory='.'):
+        """Build from the table written by defillama_import.py"""
+        return cls(load_protocol_chain_tvls(directory))
+
+    def categories(self):
+        return sorted(self.cube.index.get_level_values('category').unique().astype(str))
+
+    def metric(self, metric='base', category=None):
+        """value/protocols per (category, chain) for one metric"""
+        rows = self.cube[self.cube.index.get_level_values('metric') == metric].droplevel('metric')
+        if category is not None:
+            rows = rows[rows.index.get_level_values('category') == category]
+        return rows
+
+    def chain_summary(self, category=None, metrics=('base', 'borrowed')):
+        """Wide per-chain table: one value and one *_protocols column per metric.
+
+        Only chains with a positive base value are kept; utilization_rate is
+        borrowed / base in percent when 'borrowed' is requested. With a
+        category the result is indexed by chain alone.
+        """
+        wide = self.cube[self.cube.index.get_level_values('metric').isin(metrics)].unstack('metric', fill_value=0)
+        wide = wide.reindex(columns=pd.MultiIndex.from_product([['value', 'protocols'], list(metrics)]), fill_value=0)
+        wide.columns = [metric if stat == 'value' else f"{metric}_protocols" for stat, metric in wide.columns]
+        wide = wide[wide['base_protocols'] > 0]
+        if 'borrowed' in metrics:
+            wide['utilization_rate'] = (wide['borrowed'] / wide['base'] * 100).round(2)
+        if category is not None:
+            wide = wide[wide.index.get_level_values('category') == category].droplevel('category')
+        return wide
+
+    def chain_table(self):
+        """chain_summary() of every category with each chain's share, as a flat CSV-ready frame"""
+        table = self.chain_summary()
+        table['share'] = self.chain_share()['share'].reindex(table.index)
+        return table.reset_index().sort_values(['category', 'base'], ascending=[True, False])
+
+    def category_totals(self, metric='base'):
+        """Total value, chain count and protocol-chain count per category, largest first"""
+        rows = self.metric(metric)
+        totals = rows.groupby(level='category', observed=True).agg(
+            value=('value', 'sum'),
+            chains=('value', 'size'),
+            protocols=('protocols', 'sum'),
+        )
+        return totals.sort_values('value', ascending=False)
+
+    def chain_share(self, metric='base', category=None):
+        """Each chain's share (%) of its category's total for one metric"""
+        rows = self.metric(metric, category).copy()
+        totals = rows.groupby(level='category', observed=True)['value'].transform('sum')
+        rows['share'] = (rows['value'] / totals * 100).round(2)
+        return rows
+
+    def top_chains(self, n=10, metric='base', category=None):
+        """The n largest chains of every category (or one category) with their share"""
+        rows = self.chain_share(metric, category).sort_values(['category', 'value'], ascending=[True, False])
+        return rows.groupby(level='category', observed=True).head(n)
+
+    def categories_on_chain(self, chain, metric='base'):
+        """Category mix of one chain, largest first, with each category's share of the chain"""
+        rows = self.metric(metric)
+        rows = rows[rows.index.get_level_values('chain') == chain].droplevel('chain').copy()
+        rows['share'] = (rows['value'] / rows['value'].sum() * 100).round(2)
+        return rows.sort_values('value', ascending=False)
+
+
+def main():
+    print("\n" + "=" * 60)
+    print("TVL by Chain for Every Protocol Category")
+    print("=" * 60)
+
+    cube = CategoryCube.load()
+    summary = cube.chain_table()
+    summary.to_csv('category_chain_tvl.csv', index=False)
+
+    totals = cube.category_totals()
+    print(f"\n{'Category':<30} {'TVL':>20} {'Chains':>8}")
+    print("-" * 60)
+    for category, row in totals.head(25).iterrows():
+        print(f"{category:<30} ${row['value']:>18,.0f} {int(row['chains']):>8}")
+
+    print("\n📊 Top 3 chains per category:")
+    top = cube.top_chains(3)
+    for category in totals.head(15).index:
+        chains = top.xs(category, level='category')
+        ranked = ', '.join(f"{chain} ({row['share']:.1f}%)" for chain, row in chains.iterrows())
+        print(f"  {category:<28} {ranked}")
+
+    print(f"\n✅ Saved {len(summary):,} category/chain rows to category_chain_tvl.csv")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,13 @@
 import pandas as pd
 import numpy as np
-import requests
 import json
 import sqlite3
 from datetime import datetime, timedelta
-import time
 import os
 from pathlib import Path
 import urllib3
 import warnings
+from llama_http import get_session, throttle
 
 # Suppress SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -17,8 +16,7 @@ class ChainComparisonAnalysis:
     def __init__(self, db_path='chain_data.db'):
         """Initialize the analysis with database connection"""
         self.db_path = db_path
-        self.session = requests.Session()
-        self.session.verify = False
+        self.session = get_session()
         self.setup_database()
         
     def setup_database(self):
@@ -119,7 +117,7 @@ class ChainComparisonAnalysis:
             historical_url = f"https://api.llama.fi/v2/historicalChainTvl/{chain_name}"
             headers = {'User-Agent': 'curl/7.64.1'}
             response = self.session.get(historical_url, headers=headers)
-            time.sleep(1)  # Rate limiting
+            throttle(1)  # Rate limiting
             
             if response.status_code == 200:
                 hist_data = response.json()
@@ -236,7 +234,7 @@ class ChainComparisonAnalysis:
             url = f"https://api.llama.fi/stablecoins"
             headers = {'User-Agent': 'curl/7.64.1'}
             response = self.session.get(url, headers=headers)
-            time.sleep(0.5)  # Rate limiting
+            throttle(0.5)  # Rate limiting
             
             if response.status_code == 200:
                 stablecoins_data = response.json()
@@ -266,7 +264,7 @@ class ChainComparisonAnalysis:
             url = f"https://api.llama.fi/stablecoins"
             headers = {'User-Agent': 'curl/7.64.1'}
             response = self.session.get(url, headers=headers)
-            time.sleep(0.5)  # Rate limiting
+            throttle(0.5)  # Rate limiting
             
             if response.status_code == 200:
                 stablecoins_data = response.json()
@@ -0,0 +1,284 @@
+"""
+Chain Metrics Enrichment Pipeline
+Builds per-chain metric records (token price, stablecoin market cap, bridged
+TVL, active addresses, ...) from pluggable metric sources. Network sources
+are fetched concurrently, one task per (chain, source), under one rate
+limiter per API host, so the bridges and overview hosts are queried side by
+side instead of one blocking request and sleep after another:
+
+    pipeline = ChainMetricsPipeline([
+        TokenPriceSource(),
+        StablecoinMcapSource(stablecoin_index),
+        BridgeVolumeSource(),
+        ChainOverviewSource(),
+    ])
+    records, messages = pipeline.run(chains, base_metrics)
+
+A new metric is a MetricSource subclass: its columns with defaults, an
+optional prepare() for work shared by all chains (batched lookups,
+precomputed indexes) and fetch() for one chain.
+
+comprehensive_chain_metrics() runs the standard sources over a /v2/chains
+list and returns the comprehensive_chain_metrics.csv frame; both
+comprehensive_chain_analysis.py and defillama_import.py call it.
+"""
+
+from datetime import datetime
+
+import pandas as pd
+
+from coin_prices import PriceService
+from llama_http import RateLimiter, fetch_concurrent, get_with_retry
+
+DEFAULT_WORKERS = 8
+HOST_INTERVAL = 0.25  # At most 4 requests/second per API host
+
+
+class MetricUnavailable(Exception):
+    """Raised by fetch() when a chain has no data for the metric; the message is reported"""
+
+
+class MetricSource:
+    """One set of per-chain metric columns.
+
+    host names the API host the source calls (None for local data); sources
+    on the same host share one rate limiter. fetch() returns the column
+    values for one chain; a failed fetch leaves the defaults in place.
+    """
+
+    host = None
+    defaults = {}
+    error_label = 'data'
+
+    def __init__(self):
+        self.limiter = None
+
+    def prepare(self, chains):
+        """Work shared by all chains, run once before the per-chain fetches"""
+
+    def fetch(self, chain):
+        raise NotImplementedError
+
+    def report(self, chain, values):
+        """Console lines for a successful fetch"""
+        return []
+
+    def get(self, url):
+        """GET through the host's rate limiter on the worker thread's session"""
+        return get_with_retry(url, self.limiter)
+
+
+class TokenPriceSource(MetricSource):
+    """Native token price from one batched coins.llama.fi lookup.
+
+    Market cap and FDV are not in the coins API and stay 0.
+    """
+
+    defaults = {'token_price': 0, 'market_cap': 0, 'fdv': 0}
+
+    def __init__(self, price_service=None):
+        super().__init__()
+        self.price_service = price_service or PriceService()
+        self.prices = {}
+
+    def prepare(self, chains):
+        self.prices = self.price_service.by_gecko_id([chain.get('gecko_id') for chain in chains])
+
+    def fetch(self, chain):
+        gecko_id = chain.get('gecko_id')
+        if not gecko_id:
+            raise MetricUnavailable("No gecko_id for price lookup")
+        if gecko_id not in self.prices:
+            raise MetricUnavailable(self.price_service.error(gecko_id) or "No price data available")
+        return {'token_price': self.prices[gecko_id].get('price', 0)}
+
+    def report(self, chain, values):
+        return [f"Token: {chain.get('tokenSymbol', '')}", f"Price: ${values['token_price']:,.4f}"]
+
+
+class StablecoinMcapSource(MetricSource):
+    """Stablecoin circulating supply on each chain at the latest date of the distribution data"""
+
+    defaults = {'stablecoin_mcap': 0}
+    error_label = 'stablecoin data'
+
+    def __init__(self, stablecoin_index=None):
+        super().__init__()
+        self.stablecoin_index = stablecoin_index
+        self.totals = None
+
+    def prepare(self, chains):
+        if self.stablecoin_index is not None:
+            self.totals = self.stablecoin_index.chain_totals()
+
+    def fetch(self, chain):
+        if self.totals is None:
+            return {}
+        return {'stablecoin_mcap': self.totals.get(chain['name'], 0)}
+
+    def report(self, chain, values):
+        if self.totals is None:
+            return []
+        return [f"Stablecoin Market Cap: ${values['stablecoin_mcap']:,.0f}"]
+
+
+class BridgeVolumeSource(MetricSource):
+    """Latest daily bridge deposits into the chain"""
+
+    host = 'bridges.llama.fi'
+    defaults = {'bridged_tvl': 0}
+    error_label = 'bridge data'
+
+    def fetch(self, chain):
+        response = self.get(f"https://bridges.llama.fi/bridgevolume/{chain['name']}?id=0")
+        if response.status_code != 200:
+            raise MetricUnavailable(f"Bridge API error: {response.status_code}")
+        bridges_data = response.json()
+        if not isinstance(bridges_data, list) or not bridges_data:
+            raise MetricUnavailable("No bridge data available")
+        return {'bridged_tvl': bridges_data[-1].get('depositUSD', 0)}
+
+    def report(self, chain, values):
+        return [f"Bridged TVL: ${values['bridged_tvl']:,.0f}"]
+
+
+class ChainOverviewSource(MetricSource):
+    """Active addresses from the chain overview (may require the Pro API)"""
+
+    host = 'api.llama.fi'
+    defaults = {'active_addresses': 0}
+    error_label = 'active addresses'
+
+    def fetch(self, chain):
+        response = self.get(f"https://api.llama.fi/overview/chains/{chain['name']}")
+        if response.status_code != 200:
+            raise MetricUnavailable(f"Overview API error: {response.status_code}")
+        active_addresses = response.json().get('activeAddresses', 0)
+        if not active_addresses > 0:
+            raise MetricUnavailable("Active addresses not available")
+        return {'active_addresses': active_addresses}
+
+    def report(self, chain, values):
+        return [f"Active Addresses: {values['active_addresses']:,}"]
+
+
+class ChainMetricsPipeline:
+    """Runs metric sources over a list of /v2/chains entries"""
+
+    def __init__(self, sources, workers=DEFAULT_WORKERS, host_interval=HOST_INTERVAL):
+        self.sources = sources
+        self.workers = workers
+        limiters = {}
+        for source in sources:
+            if source.host is not None:
+                source.limiter = limiters.setdefault(source.host, RateLimiter(host_interval))
+
+    def run(self, chains, base_metrics):
+        """One record per chain and the console report of each.
+
+        base_metrics(chain) gives the leading columns of a record; every
+        source's defaults follow in source order, overwritten by what its
+        fetch returned. messages[i] lists the (ok, text) lines of records[i].
+        """
+        for source in self.sources:
+            source.prepare(chains)
+
+        tasks = [(i, source) for i in range(len(chains)) for source in self.sources]
+        outcomes = {}
+        local = [(i, source) for i, source in tasks if source.host is None]
+        remote = [(i, source) for i, source in tasks if source.host is not None]
+        for task in local:
+            outcomes[task] = self._fetch(chains, task)
+        # _fetch() catches everything, so fetch_concurrent never reports an error
+        for task, outcome, _ in fetch_concurrent(remote, lambda task: self._fetch(chains, task), self.workers):
+            outcomes[task] = outcome
+
+        records, messages = [], []
+        for i, chain in enumerate(chains):
+            record = base_metrics(chain)
+            lines = []
+            for source in self.sources:
+                record.update(source.defaults)
+                values, error = outcomes[(i, source)]
+                if error is not None:
+                    lines.append((False, error))
+                    continue
+                record.update(values)
+                lines.extend((True, line) for line in source.report(chain, record))
+            records.append(record)
+            messages.append(lines)
+        return records, messages
+
+    def _fetch(self, chains, task):
+        i, source = task
+        try:
+            return source.fetch(chains[i]), None
+        except MetricUnavailable as e:
+            return None, str(e)
+        except Exception as e:
+            return None, f"Error fetching {source.error_label}: {str(e)}"
+
+
+def chain_base_metrics(chain):
+    """Identifying columns of a comprehensive_chain_metrics.csv row"""
+    return {
+        'chain': chain['name'],
+        'defi_tvl': chain.get('tvl', 0),
+        'token_symbol': chain.get('tokenSymbol', ''),
+        'chain_id': chain.get('chainId', ''),
+        'gecko_id': chain.get('gecko_id', ''),
+        'cmc_id': chain.get('cmcId', ''),
+    }
+
+
+def add_ratios(chain_metrics):
+    if chain_metrics['defi_tvl'] > 0:
+        chain_metrics['stablecoin_to_tvl_ratio'] = (
+            chain_metrics['stablecoin_mcap'] / chain_metrics['defi_tvl']
+        ) if chain_metrics['stablecoin_mcap'] > 0 else 0
+
+        chain_metrics['market_cap_to_tvl_ratio'] = (
+            chain_metrics['market_cap'] / chain_metrics['defi_tvl']
+        ) if chain_metrics['market_cap'] > 0 else 0
+    else:
+        chain_metrics['stablecoin_to_tvl_ratio'] = 0
+        chain_metrics['market_cap_to_tvl_ratio'] = 0
+    return chain_metrics
+
+
+def comprehensive_chain_metrics(chains, stablecoin_index=None, num_chains=100, session=None, verbose=True):
+    """The comprehensive_chain_metrics.csv frame for the top num_chains of a /v2/chains list.
+
+    Shared by comprehensive_chain_analysis.py and defillama_import.py, which
+    pass the chains list they already fetched and the stablecoin market cap
+    index (stablecoin_index.py; None leaves stablecoin_mcap at 0). verbose
+    prints the per-chain report.
+    """
+    top_chains = sorted(chains, key=lambda chain: chain.get('tvl', 0), reverse=True)[:num_chains]
+
+    price_service = PriceService(session)
+    price_source = TokenPriceSource(price_service)
+    pipeline = ChainMetricsPipeline([
+        price_source,
+        StablecoinMcapSource(stablecoin_index),
+        BridgeVolumeSource(),
+        ChainOverviewSource(),
+    ])
+    records, messages = pipeline.run(top_chains, chain_base_metrics)
+    if verbose:
+        print(f"✓ Fetched {len(price_source.prices)} token prices in {price_service.requests} requests\n")
+
+    for i, (chain_metrics, lines) in enumerate(zip(records, messages), 1):
+        add_ratios(chain_metrics)
+        if verbose:
+            print(f"[{i}/{len(top_chains)}] Processing: {chain_metrics['chain']}")
+            for ok, text in lines:
+                print(f"  {'✓' if ok else '✗'} {text}")
+            print(f"  ✓ DeFi TVL: ${chain_metrics['defi_tvl']:,.0f}\n")
+
+    df = pd.DataFrame(records)
+    if df.empty:
+        return df
+    df = df.sort_values('defi_tvl', ascending=False)
+    df['data_timestamp'] = datetime.now()
+    return df
@@ -0,0 +1,56 @@
+"""
+Checkpoint Store
+One JSON file per key under a directory, written atomically as each item
+finishes, so long fetch loops can be interrupted and resumed without redoing
+the work already done:
+
+    store = CheckpointStore('protocol_history_checkpoints', max_age=12 * 3600)
+    payload = store.get(slug)        # None if missing, stale or unreadable
+    store.put(slug, payload)
+
+max_age (seconds) makes old checkpoints count as missing so a later run
+refreshes them; None keeps them forever.
+"""
+
+import json
+import os
+import time
+from urllib.parse import quote
+
+
+class CheckpointStore:
+    """Per-key JSON checkpoints in a directory"""
+
+    def __init__(self, directory, max_age=None):
+        self.directory = directory
+        self.max_age = max_age
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{quote(str(key), safe='')}.json")
+
+    def get(self, key):
+        path = self.path(key)
+        try:
+            if self.max_age is not None and time.time() - os.path.getmtime(path) > self.max_age:
+                return None
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, payload):
+        path = self.path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(payload, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def clear(self):
+        """Delete every checkpoint, e.g. to force a fresh run"""
+        for name in os.listdir(self.directory):
+            if name.endswith('.json') or name.endswith('.tmp'):
+                os.remove(os.path.join(self.directory, name))
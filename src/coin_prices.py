@@ -0,0 +1,118 @@
+"""
+Coin Price Service
+Looks up DeFiLlama coin prices (coins.llama.fi) for many coins at once. The
+prices endpoints take comma-separated coin keys, so lookups are packed into
+as few requests as the URL length allows instead of one request per coin:
+
+    prices = PriceService()
+    prices.current(['coingecko:ethereum', 'coingecko:solana'])
+    prices.historical(1704067200, coins)        # as of a unix timestamp
+    prices.by_gecko_id(gecko_ids)               # keyed by gecko_id
+
+Current prices are cached for PRICE_TTL seconds; historical prices do not
+change and stay cached for the life of the service. Coins whose request
+failed are listed in .errors with the reason and retried on the next lookup.
+"""
+
+import time
+
+from llama_http import RateLimiter, get_session, get_with_retry
+
+COINS_API = "https://coins.llama.fi"
+MAX_URL_LENGTH = 2000
+PRICE_TTL = 300
+REQUEST_INTERVAL = 0.25
+
+
+def coin_key(gecko_id):
+    return f"coingecko:{gecko_id}"
+
+
+def prices_url(timestamp=None):
+    """URL prefix of the current (or historical as-of timestamp) prices endpoint"""
+    if timestamp is None:
+        return f"{COINS_API}/prices/current/"
+    return f"{COINS_API}/prices/historical/{int(timestamp)}/"
+
+
+def batch_urls(prefix, coins, max_url_length=MAX_URL_LENGTH):
+    """Pack coin keys into comma-joined URLs no longer than max_url_length.
+
+    Yields (url, coins in that url). A single key longer than the limit still
+    gets its own request.
+    """
+    batch, length = [], len(prefix)
+    for coin in coins:
+        extra = len(coin) + (1 if batch else 0)
+        if batch and length + extra > max_url_length:
+            yield prefix + ','.join(batch), batch
+            batch, length, extra = [], len(prefix), len(coin)
+        batch.append(coin)
+        length += extra
+    if batch:
+        yield prefix + ','.join(batch), batch
+
+
+class PriceService:
+    """Batched, cached coin price lookups"""
+
+    def __init__(self, session=None, ttl=PRICE_TTL, max_url_length=MAX_URL_LENGTH, interval=REQUEST_INTERVAL):
+        self.session = session or get_session()
+        self.ttl = ttl
+        self.max_url_length = max_url_length
+        self.limiter = RateLimiter(interval)
+        self.requests = 0
+        self.errors = {}
+        self._cache = {}  # (timestamp or None, coin) -> (fetched at, coin info or None)
+
+    def _fresh(self, timestamp, coin, now):
+        cached = self._cache.get((timestamp, coin))
+        if cached is None or (timestamp is None and now - cached[0] > self.ttl):
+            return None
+        return cached
+
+    def lookup(self, coins, timestamp=None):
+        """{coin key: coin info} for the coins with a price; current prices unless timestamp is given"""
+        now = time.time()
+        results, missing = {}, []
+        for coin in dict.fromkeys(coins):
+            cached = self._fresh(timestamp, coin, now)
+            if cached is None:
+                missing.append(coin)
+            elif cached[1] is not None:
+                results[coin] = cached[1]
+
+        # Sorted so the same set of coins always maps to the same requests
+        for url, batch in batch_urls(prices_url(timestamp), sorted(missing), self.max_url_length):
+            try:
+                response = get_with_retry(url, self.limiter, session=self.session)
+                self.requests += 1
+                if response.status_code != 200:
+                    self.errors.update((coin, f"Price API error: {response.status_code}") for coin in batch)
+                    continue
+                found = response.json().get('coins', {})
+            except Exception as e:
+                self.errors.update((coin, f"Error fetching token data: {str(e)}") for coin in batch)
+                continue
+            for coin in batch:
+                info = found.get(coin)
+                self._cache[(timestamp, coin)] = (now, info)
+                self.errors.pop(coin, None)
+                if info is not None:
+                    results[coin] = info
+        return results
+
+    def current(self, coins):
+        return self.lookup(coins)
+
+    def historical(self, timestamp, coins):
+        return self.lookup(coins, timestamp)
+
+    def by_gecko_id(self, gecko_ids, timestamp=None):
+        """Prices keyed by CoinGecko id instead of coin key"""
+        gecko_ids = [gecko_id for gecko_id in gecko_ids if gecko_id]
+        found = self.lookup([coin_key(gecko_id) for gecko_id in gecko_ids], timestamp)
+        return {gecko_id: found[coin_key(gecko_id)] for gecko_id in gecko_ids if coin_key(gecko_id) in found}
+
+    def error(self, gecko_id):
+        return self.errors.get(coin_key(gecko_id))
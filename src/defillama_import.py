@@ -1,114 +1,21 @@
 from defillama import DefiLlama
 import pandas as pd
+import ast
 import json
-import subprocess
-import requests
+import sys
 from datetime import datetime, timedelta
-import time
 import urllib3
-import os
+from llama_http import get_session, throttle, is_offline
+from instrumentation import section
+from chain_metrics import comprehensive_chain_metrics
+from protocol_tvls import normalize_chain_tvls, save_protocol_chain_tvls
+from stablecoin_index import StablecoinMcapIndex
+from as_of_snapshots import chain_history_frame, save_chain_tvl_history
+from pipeline import ANALYSIS_STAGES, run_stage, run_stages
 urllib3.disable_warnings()
 
-print("\n🔄 Fetching fresh data from DeFiLlama APIs...")
-
-# initialize api client with verify=False
-llama = DefiLlama()
-llama.session.verify = False
-
-# Create a requests session with SSL verification disabled
-session = requests.Session()
-session.verify = False
-
-# get list of stablecoins
-response = llama.get_stablecoins(include_prices=True)
-time.sleep(0.25)  # Add sleep after first API call
-
-# saving response to json
-with open('stablecoins_list.json', 'w') as f:
-    json.dump(response, f)
-
-# Print the response structure
-print("Response type:", type(response))
-print("Response keys:", response.keys() if isinstance(response, dict) else "Not a dict")
-print("Response length:", len(response) if hasattr(response, '__len__') else "No length")
-
-# Create DataFrame from peggedAssets
-df = pd.DataFrame(response['peggedAssets'])
-
-# saving to csv
-df.to_csv('stablecoins_list.csv', index=False)
-
-# Function to extract peggedUSD value from circulating field
-def extract_circulating(value):
-    try:
-        # Convert string representation of dict to actual dict
-        if isinstance(value, str):
-            value = eval(value)  # Using eval since the string is a valid Python dict
-        return value.get('peggedUSD', 0)
-    except:
-        return 0
-
-# Extract circulating supply values from existing df
-df['circulating_supply'] = df['circulating'].apply(extract_circulating)
-
-# Sort by circulating supply in descending order and get top 100
-top_100_stablecoins = df.sort_values('circulating_supply', ascending=False).head(200)
-
-# Save top 100 to a new CSV
-top_100_stablecoins.to_csv('top_100_stablecoins.csv', index=False)
-
-print("\nTop 100 stablecoins by circulating supply:")
-print(top_100_stablecoins[['name', 'symbol', 'circulating_supply']].to_string())
-
-# List to store all records
-all_records = []
-
-# Iterate over top stablecoins
-for _, stablecoin in top_100_stablecoins.iterrows():
-    stablecoin_id = stablecoin['id']
-    print(f"Processing stablecoin: {stablecoin['name']} (ID: {stablecoin_id})")
-    
-    try:
-        # Get historical mcap sum of all stablecoins in a chain
-        response = llama.get_stablecoins_historical_mcap_n_chain_distribution(stablecoin_id=stablecoin_id)
-        time.sleep(0.25)  # Add sleep after each stablecoin API call
-        
-        # Print response structure for debugging
-        print(f"Response type for {stablecoin['name']}:", type(response))
-        print(f"Response keys for {stablecoin['name']}:", response.keys() if isinstance(response, dict) else "Not a dict")
-        
-        # Transform the data into records
-        for chain, daily_data in response['chainBalances'].items():
-            for data_point in daily_data['tokens']:
-                try:
-                    # Extract circulating amount, defaulting to 0 if not present
-                    circulating = data_point.get('circulating', {}).get('peggedUSD', 0)
-                    
-                    record = {
-                        'stablecoin_id': stablecoin_id,
-                        'stablecoin_name': response.get('name', 'Unknown'),
-                        'stablecoin_symbol': response.get('symbol', 'Unknown'),
-                        'date': pd.to_datetime(data_point['date'], unit='s'),
-                        'chain': chain,
-                        'circulating': circulating
-                    }
-                    all_records.append(record)
-                except Exception as e:
-                    print(f"Error processing data point for chain {chain}: {str(e)}")
-                    continue
-                
-    except Exception as e:
-        print(f"Error processing stablecoin {stablecoin['name']}: {str(e)}")
-        continue
-
-# Create DataFrame from all records
-df = pd.DataFrame(all_records)
-
-# Add native_bridged_standard column with blank values
-df['native_bridged_standard'] = ''
-
-# Set USDT0 for specific chains
-usdt0_chains = [
+# Chains whose USDT is USDT0
+USDT0_CHAINS = [
     'Corn', 
     'Unichain', 
     'Sei', 
@@ -128,11 +35,10 @@ usdt0_chains = [
     'X Layer',
     'Monad',
     'Stable'
-    ]
-df.loc[(df['stablecoin_symbol'] == 'USDT') & (df['chain'].isin(usdt0_chains)), 'native_bridged_standard'] = 'USDT0'
+]
 
-# Set USDC as native for specific chains
-usdc_native_chains = [
+# Chains with native USDC
+USDC_NATIVE_CHAINS = [
     'Ethereum', 
     'Solana', 
     'Base', 
@@ -165,11 +71,10 @@ usdc_native_chains = [
     'Plume Mainnet',
     'Monad',
     'StarkNet'
-    ]
-df.loc[(df['stablecoin_symbol'] == 'USDC') & (df['chain'].isin(usdc_native_chains)), 'native_bridged_standard'] = 'native'
+]
 
-# Set USDT as native for specific chains
-usdt_native_chains = [
+# Chains with native USDT
+USDT_NATIVE_CHAINS = [
     'Bitcoin',  # Omni Protocol Token via Bitcoin Blockchain
     'Ethereum', 
     'Avalanche', 
@@ -189,423 +94,510 @@ usdt_native_chains = [
     'Kaia',  # Fungible Asset via Kaia Blockchain
     
 ]
-df.loc[(df['stablecoin_symbol'] == 'USDT') & (df['chain'].isin(usdt_native_chains)), 'native_bridged_standard'] = 'native'
 
-# Set USDC as xReserves for specific chains
-usdc_xreserves_chains = [
+# Chains whose USDC is issued through xReserves
+USDC_XRESERVES_CHAINS = [
     'Canton',
     'Aleo',
     'Stacks'
 ]
-df.loc[(df['stablecoin_symbol'] == 'USDC') & (df['chain'].isin(usdc_xreserves_chains)), 'native_bridged_standard'] = 'xReserves'
 
-# Sort by date, stablecoin, and chain
-df = df.sort_values(['date', 'stablecoin_id', 'chain'])
 
-# saving to csv
-df.to_csv('all_stablecoins_chain_distribution.csv', index=False)
+# Function to extract peggedUSD value from circulating field
+def extract_circulating(value):
+    try:
+        # Convert string representation of dict to actual dict
+        if isinstance(value, str):
+            value = ast.literal_eval(value)  # The string is a Python dict literal
+        return value.get('peggedUSD', 0)
+    except:
+        return 0
 
-# creating a dataframe of just meta stablecoin in df; dropping date and circulating and grouping by chain and stablecoin symbol
-meta_df = df.drop(columns=['date', 'circulating']).groupby(['chain', 'stablecoin_symbol', 'native_bridged_standard', 'stablecoin_id', 'stablecoin_name']).sum().reset_index()
 
-# saving meta df to csv
-meta_df.to_csv('meta_stablecoins_chain_distribution.csv', index=False)
+def fetch_stablecoin_distribution(llama):
+    """Fetch the top stablecoins' chain histories; returns (distribution, StablecoinMcapIndex).
+
+    Writes the stablecoin list, the chain distribution CSV and its index
+    snapshot, and the per-chain metadata.
+    """
+    # get list of stablecoins
+    section('stablecoin list')
+    response = llama.get_stablecoins(include_prices=True)
+    throttle(0.25)  # Add sleep after first API call
+
+    # saving response to json
+    with open('stablecoins_list.json', 'w') as f:
+        json.dump(response, f)
+
+    # Print the response structure
+    print("Response type:", type(response))
+    print("Response keys:", response.keys() if isinstance(response, dict) else "Not a dict")
+    print("Response length:", len(response) if hasattr(response, '__len__') else "No length")
+
+    # Create DataFrame from peggedAssets
+    df = pd.DataFrame(response['peggedAssets'])
+
+    # saving to csv
+    df.to_csv('stablecoins_list.csv', index=False)
+
+    # Extract circulating supply values from existing df
+    df['circulating_supply'] = df['circulating'].apply(extract_circulating)
+
+    # Sort by circulating supply in descending order and get top 100
+    top_100_stablecoins = df.sort_values('circulating_supply', ascending=False).head(200)
+
+    # Save top 100 to a new CSV
+    top_100_stablecoins.to_csv('top_100_stablecoins.csv', index=False)
+
+    print("\nTop 100 stablecoins by circulating supply:")
+    print(top_100_stablecoins[['name', 'symbol', 'circulating_supply']].to_string())
+
+    # List to store all records
+    section('stablecoin records')
+    all_records = []
+
+    # Iterate over top stablecoins
+    for _, stablecoin in top_100_stablecoins.iterrows():
+        stablecoin_id = stablecoin['id']
+        print(f"Processing stablecoin: {stablecoin['name']} (ID: {stablecoin_id})")
+
+        try:
+            # Get historical mcap sum of all stablecoins in a chain
+            response = llama.get_stablecoins_historical_mcap_n_chain_distribution(stablecoin_id=stablecoin_id)
+            throttle(0.25)  # Add sleep after each stablecoin API call
+
+            # Print response structure for debugging
+            print(f"Response type for {stablecoin['name']}:", type(response))
+            print(f"Response keys for {stablecoin['name']}:", response.keys() if isinstance(response, dict) else "Not a dict")
+
+            # Transform the data into records
+            for chain, daily_data in response['chainBalances'].items():
+                for data_point in daily_data['tokens']:
+                    try:
+                        # Extract circulating amount, defaulting to 0 if not present
+                        circulating = data_point.get('circulating', {}).get('peggedUSD', 0)
+
+                        record = {
+                            'stablecoin_id': stablecoin_id,
+                            'stablecoin_name': response.get('name', 'Unknown'),
+                            'stablecoin_symbol': response.get('symbol', 'Unknown'),
+                            'date': pd.to_datetime(data_point['date'], unit='s'),
+                            'chain': chain,
+                            'circulating': circulating
+                        }
+                        all_records.append(record)
+                    except Exception as e:
+                        print(f"Error processing data point for chain {chain}: {str(e)}")
+                        continue
+
+        except Exception as e:
+            print(f"Error processing stablecoin {stablecoin['name']}: {str(e)}")
+            continue
 
-# USDC Market Share Analysis
-print("\n=== USDC Market Share Analysis ===")
+    # Create DataFrame from all records
+    section('build distribution')
+    df = pd.DataFrame(all_records)
 
-# Filter data for the last 90 days
-ninety_days_ago = datetime.now() - timedelta(days=90)
-recent_df = df[df['date'] >= ninety_days_ago].copy()
+    # Add native_bridged_standard column with blank values
+    df['native_bridged_standard'] = ''
 
-# Get all chains where USDC is present
-usdc_chains = recent_df[recent_df['stablecoin_symbol'] == 'USDC']['chain'].unique()
-print(f"USDC is present on {len(usdc_chains)} chains")
+    # Mark USDT0, native and xReserves deployments
+    df.loc[(df['stablecoin_symbol'] == 'USDT') & (df['chain'].isin(USDT0_CHAINS)), 'native_bridged_standard'] = 'USDT0'
+    df.loc[(df['stablecoin_symbol'] == 'USDC') & (df['chain'].isin(USDC_NATIVE_CHAINS)), 'native_bridged_standard'] = 'native'
+    df.loc[(df['stablecoin_symbol'] == 'USDT') & (df['chain'].isin(USDT_NATIVE_CHAINS)), 'native_bridged_standard'] = 'native'
+    df.loc[(df['stablecoin_symbol'] == 'USDC') & (df['chain'].isin(USDC_XRESERVES_CHAINS)), 'native_bridged_standard'] = 'xReserves'
 
-# Get today's total stablecoin circulating supply for each chain to determine top 10
-latest_date = recent_df['date'].max()
-today_total_data = recent_df[recent_df['date'] == latest_date].copy()
+    # Sort by date, stablecoin, and chain
+    df = df.sort_values(['date', 'stablecoin_id', 'chain'])
 
-# Calculate total stablecoin supply per chain today
-today_total_stablecoins = today_total_data.groupby('chain')['circulating'].sum().sort_values(ascending=False)
+    # saving to csv
+    df.to_csv('all_stablecoins_chain_distribution.csv', index=False)
 
-# Get top 10 chains by total stablecoin circulating supply today
-top_10_total_chains = today_total_stablecoins.head(10).index.tolist()
+    # Latest and anchor-date chain totals for every chain-level report (see stablecoin_index.py)
+    stablecoin_index = StablecoinMcapIndex.build(df)
+    stablecoin_index.save()
 
-print(f"\nTop 10 chains by total stablecoin circulating supply today ({latest_date.strftime('%Y-%m-%d')}):")
-for i, chain in enumerate(top_10_total_chains, 1):
-    supply = today_total_stablecoins[chain]
-    print(f"{i:2d}. {chain}: ${supply:,.2f}")
+    # creating a dataframe of just meta stablecoin in df; dropping date and circulating and grouping by chain and stablecoin symbol
+    meta_df = df.drop(columns=['date', 'circulating']).groupby(['chain', 'stablecoin_symbol', 'native_bridged_standard', 'stablecoin_id', 'stablecoin_name']).sum().reset_index()
 
-# Combine top 10 chains with all USDC native chains
-# First, get all chains with native USDC that have data in our dataset
-usdc_native_chains_with_data = [chain for chain in usdc_native_chains if chain in usdc_chains]
+    # saving meta df to csv
+    meta_df.to_csv('meta_stablecoins_chain_distribution.csv', index=False)
 
-# Combine top 10 chains with native USDC chains and remove duplicates
-combined_chains = list(set(top_10_total_chains + usdc_native_chains_with_data))
+    return df, stablecoin_index
 
-print(f"\nCombined analysis will include:")
-print(f"  • Top 10 chains by stablecoin volume: {len(top_10_total_chains)} chains")
-print(f"  • USDC native chains with data: {len(usdc_native_chains_with_data)} chains")
-print(f"  • Total unique chains to analyze: {len(combined_chains)} chains")
 
-# Show which native USDC chains are being included
-native_chains_not_in_top10 = [chain for chain in usdc_native_chains_with_data if chain not in top_10_total_chains]
-if native_chains_not_in_top10:
-    print(f"  • Additional native USDC chains (not in top 10): {', '.join(native_chains_not_in_top10)}")
+def usdc_market_share(df, stablecoin_index):
+    """Daily USDC share of stablecoins over 90 days on the top 10 and native USDC chains"""
+    # USDC Market Share Analysis
+    section('USDC market share')
+    print("\n=== USDC Market Share Analysis ===")
 
-# Calculate daily market share for combined set of chains
-usdc_market_share_data = []
+    # Filter data for the last 90 days
+    ninety_days_ago = datetime.now() - timedelta(days=90)
+    recent_df = df[df['date'] >= ninety_days_ago].copy()
 
-for chain in combined_chains:
-    print(f"\nProcessing USDC market share for chain: {chain}")
-    
-    # Get data for this specific chain
-    chain_data = recent_df[recent_df['chain'] == chain].copy()
-    
-    # Group by date and calculate total stablecoin supply and USDC supply
-    daily_totals = chain_data.groupby('date')['circulating'].sum().reset_index()
-    daily_totals.rename(columns={'circulating': 'total_stablecoin_supply'}, inplace=True)
-    
-    # Get USDC data for this chain
-    usdc_data = chain_data[chain_data['stablecoin_symbol'] == 'USDC'].copy()
-    
-    # Merge USDC data with daily totals
-    if not usdc_data.empty:
-        usdc_daily = usdc_data.groupby('date')['circulating'].sum().reset_index()
-        usdc_daily.rename(columns={'circulating': 'usdc_supply'}, inplace=True)
-        
-        # Merge with daily totals
-        merged_data = pd.merge(daily_totals, usdc_daily, on='date', how='left')
-        merged_data['usdc_supply'] = merged_data['usdc_supply'].fillna(0)
-        
-        # Calculate market share percentage
-        merged_data['usdc_market_share_pct'] = (
-            merged_data['usdc_supply'] / merged_data['total_stablecoin_supply'] * 100
+    # Get all chains where USDC is present
+    usdc_chains = recent_df[recent_df['stablecoin_symbol'] == 'USDC']['chain'].unique()
+    print(f"USDC is present on {len(usdc_chains)} chains")
+
+    # Get today's total stablecoin circulating supply for each chain to determine top 10
+    latest_date = stablecoin_index.latest_date
+    today_total_stablecoins = stablecoin_index.chain_totals().sort_values(ascending=False)
+    today_usdc_supplies = stablecoin_index.symbol_values(symbol='USDC')
+
+    # Get top 10 chains by total stablecoin circulating supply today
+    top_10_total_chains = today_total_stablecoins.head(10).index.tolist()
+
+    print(f"\nTop 10 chains by total stablecoin circulating supply today ({latest_date.strftime('%Y-%m-%d')}):")
+    for i, chain in enumerate(top_10_total_chains, 1):
+        supply = today_total_stablecoins[chain]
+        print(f"{i:2d}. {chain}: ${supply:,.2f}")
+
+    # Combine top 10 chains with all USDC native chains
+    # First, get all chains with native USDC that have data in our dataset
+    usdc_native_chains_with_data = [chain for chain in USDC_NATIVE_CHAINS if chain in usdc_chains]
+
+    # Combine top 10 chains with native USDC chains and remove duplicates
+    combined_chains = list(set(top_10_total_chains + usdc_native_chains_with_data))
+
+    print(f"\nCombined analysis will include:")
+    print(f"  • Top 10 chains by stablecoin volume: {len(top_10_total_chains)} chains")
+    print(f"  • USDC native chains with data: {len(usdc_native_chains_with_data)} chains")
+    print(f"  • Total unique chains to analyze: {len(combined_chains)} chains")
+
+    # Show which native USDC chains are being included
+    native_chains_not_in_top10 = [chain for chain in usdc_native_chains_with_data if chain not in top_10_total_chains]
+    if native_chains_not_in_top10:
+        print(f"  • Additional native USDC chains (not in top 10): {', '.join(native_chains_not_in_top10)}")
+
+    # Calculate daily market share for combined set of chains
+    usdc_market_share_data = []
+
+    for chain in combined_chains:
+        print(f"\nProcessing USDC market share for chain: {chain}")
+
+        # Get data for this specific chain
+        chain_data = recent_df[recent_df['chain'] == chain].copy()
+
+        # Group by date and calculate total stablecoin supply and USDC supply
+        daily_totals = chain_data.groupby('date')['circulating'].sum().reset_index()
+        daily_totals.rename(columns={'circulating': 'total_stablecoin_supply'}, inplace=True)
+
+        # Get USDC data for this chain
+        usdc_data = chain_data[chain_data['stablecoin_symbol'] == 'USDC'].copy()
+
+        # Merge USDC data with daily totals
+        if not usdc_data.empty:
+            usdc_daily = usdc_data.groupby('date')['circulating'].sum().reset_index()
+            usdc_daily.rename(columns={'circulating': 'usdc_supply'}, inplace=True)
+
+            # Merge with daily totals
+            merged_data = pd.merge(daily_totals, usdc_daily, on='date', how='left')
+            merged_data['usdc_supply'] = merged_data['usdc_supply'].fillna(0)
+
+            # Calculate market share percentage
+            merged_data['usdc_market_share_pct'] = (
+                merged_data['usdc_supply'] / merged_data['total_stablecoin_supply'] * 100
+            )
+
+            # Add chain information
+            merged_data['chain'] = chain
+
+            # Select relevant columns and add to results
+            result_data = merged_data[['date', 'chain', 'usdc_supply', 'total_stablecoin_supply', 'usdc_market_share_pct']].copy()
+            usdc_market_share_data.append(result_data)
+
+            # Print summary statistics
+            avg_market_share = merged_data['usdc_market_share_pct'].mean()
+            max_market_share = merged_data['usdc_market_share_pct'].max()
+            min_market_share = merged_data['usdc_market_share_pct'].min()
+            latest_market_share = merged_data['usdc_market_share_pct'].iloc[-1]
+            today_total_supply = today_total_stablecoins[chain]
+            today_usdc_supply = today_usdc_supplies.get(chain, 0)
+
+            print(f"  ✓ {chain}: Avg: {avg_market_share:.2f}%, Max: {max_market_share:.2f}%, Min: {min_market_share:.2f}%, Latest: {latest_market_share:.2f}%")
+            print(f"     Today's Total Stablecoins: ${today_total_supply:,.2f}")
+            print(f"     Today's USDC Supply: ${today_usdc_supply:,.2f}")
+        else:
+            print(f"  ✗ No USDC data found for {chain}")
+
+    # Combine all chain data
+    if usdc_market_share_data:
+        usdc_market_share_df = pd.concat(usdc_market_share_data, ignore_index=True)
+
+        # Sort by date and chain
+        usdc_market_share_df = usdc_market_share_df.sort_values(['date', 'chain'])
+
+        # Save to CSV
+        usdc_market_share_df.to_csv('usdc_market_share_90days.csv', index=False)
+
+        print(f"\nUSDC market share data saved to usdc_market_share_90days.csv")
+        print(f"Total records: {len(usdc_market_share_df)}")
+
+        # Print summary statistics across all analyzed chains
+        print(f"\n=== USDC Market Share Summary - Top 10 Chains + Native USDC Chains (Last 90 Days) ===")
+        print(f"Total chains analyzed: {len(combined_chains)}")
+        summary_stats = usdc_market_share_df.groupby('chain')['usdc_market_share_pct'].agg([
+            'mean', 'max', 'min', 'std'
+        ]).round(2)
+        summary_stats.columns = ['Avg_Market_Share_%', 'Max_Market_Share_%', 'Min_Market_Share_%', 'Std_Dev_%']
+
+        # Add today's total stablecoin supply and USDC supply to the summary
+        summary_stats['Today_Total_Stablecoins'] = summary_stats.index.map(today_total_stablecoins)
+
+        # Add today's USDC supply for each chain
+        summary_stats['Today_USDC_Supply'] = summary_stats.index.map(today_usdc_supplies).fillna(0)
+
+        # Add a column to identify chain type for better understanding
+        summary_stats['Chain_Type'] = summary_stats.index.map(
+            lambda x: 'Top 10 + Native' if x in top_10_total_chains and x in usdc_native_chains_with_data
+            else 'Top 10 Only' if x in top_10_total_chains
+            else 'Native Only'
         )
-        
-        # Add chain information
-        merged_data['chain'] = chain
-        
-        # Select relevant columns and add to results
-        result_data = merged_data[['date', 'chain', 'usdc_supply', 'total_stablecoin_supply', 'usdc_market_share_pct']].copy()
-        usdc_market_share_data.append(result_data)
-        
-        # Print summary statistics
-        avg_market_share = merged_data['usdc_market_share_pct'].mean()
-        max_market_share = merged_data['usdc_market_share_pct'].max()
-        min_market_share = merged_data['usdc_market_share_pct'].min()
-        latest_market_share = merged_data['usdc_market_share_pct'].iloc[-1]
-        today_total_supply = today_total_stablecoins[chain]
-        today_usdc_supply = today_total_data[
-            (today_total_data['chain'] == chain) & 
-            (today_total_data['stablecoin_symbol'] == 'USDC')
-        ]['circulating'].sum()
-        
-        print(f"  ✓ {chain}: Avg: {avg_market_share:.2f}%, Max: {max_market_share:.2f}%, Min: {min_market_share:.2f}%, Latest: {latest_market_share:.2f}%")
-        print(f"     Today's Total Stablecoins: ${today_total_supply:,.2f}")
-        print(f"     Today's USDC Supply: ${today_usdc_supply:,.2f}")
+
+        summary_stats = summary_stats.sort_values('Today_Total_Stablecoins', ascending=False)
+
+        print(summary_stats.to_string())
+
+        # Save summary statistics
+        summary_stats.to_csv('usdc_market_share_summary.csv')
+        print(f"\nSummary statistics saved to usdc_market_share_summary.csv")
     else:
-        print(f"  ✗ No USDC data found for {chain}")
+        print("No USDC market share data available")
+
+    print("✅ USDC market share analysis complete!")
+
+
+def fetch_protocols(llama):
+    """Fetch /protocols; returns the protocol/chain/metric table (protocol_tvls.py)"""
+    # Get TVL data for all chains
+    section('protocols TVL')
+    print("\nFetching TVL data for all chains...")
+    tvl_data = llama.get_all_protocols()
+    throttle(0.25)  # Add sleep after TVL API call
+
+    # Save TVL data to JSON
+    with open('tvl_data.json', 'w') as f:
+        json.dump(tvl_data, f)
+
+    # Convert TVL data to DataFrame
+    tvl_df = pd.DataFrame(tvl_data)
+
+    # Save TVL data to CSV
+    tvl_df.to_csv('tvl_data.csv', index=False)
+
+    print("TVL data saved to tvl_data.json and tvl_data.csv")
+
+    # Save chainTvls as a long protocol/chain/metric table for the lending analyses
+    protocol_chain_tvls = normalize_chain_tvls(tvl_data)
+    protocol_chain_tvls_path = save_protocol_chain_tvls(protocol_chain_tvls)
+    print(f"Protocol chain TVLs saved to {protocol_chain_tvls_path} ({len(protocol_chain_tvls):,} rows)")
+
+    return protocol_chain_tvls
+
+
+def fetch_chain_tvls(session):
+    """Fetch every chain's TVL history; returns the /v2/chains list"""
+    # Get chain TVL data
+    section('chain TVL history')
+    print("\nFetching chain TVL data...")
+    chains_url = "https://api.llama.fi/v2/chains"
+    response = session.get(chains_url)
+    throttle(0.25)  # Add sleep after chains API call12
+    chains_data = response.json()
+
+    # Sort chains by TVL and get top 200
+    chains_data.sort(key=lambda x: x['tvl'], reverse=True)
+    top_chains = chains_data[:500]
+
+    print(f"\nProcessing top {len(top_chains)} chains by TVL...")
+    print(f"First chain example: {top_chains[0]}")  # Debug print first chain data
+
+    # Get historical TVL for each chain
+    chain_tvl_data = []
+    chain_histories = {}
+    for i, chain in enumerate(top_chains, 1):
+        chain_name = chain['name']
+        print(f"\nProcessing chain {i}/{len(top_chains)}: {chain_name}")
+        try:
+            # Get historical TVL data
+            historical_url = f"https://api.llama.fi/v2/historicalChainTvl/{chain_name}"
+            print(f"Fetching data from: {historical_url}")  # Debug print URL
+            headers = {'User-Agent': 'curl/7.64.1'}
+            hist_response = session.get(historical_url, headers=headers)
+            throttle(0.25)  # Add sleep after each historical TVL API call
+            print(f"Status code: {hist_response.status_code}")
+            print(f"Headers: {hist_response.headers}")
+            if hist_response.status_code == 200:
+                hist_data = hist_response.json()
+                if not hist_data or not isinstance(hist_data, list):
+                    print(f"✗ Invalid data format for {chain_name}")
+                    continue
+                chain_histories[chain_name] = hist_data
 
-# Combine all chain data
-if usdc_market_share_data:
-    usdc_market_share_df = pd.concat(usdc_market_share_data, ignore_index=True)
-    
-    # Sort by date and chain
-    usdc_market_share_df = usdc_market_share_df.sort_values(['date', 'chain'])
-    
-    # Save to CSV
-    usdc_market_share_df.to_csv('usdc_market_share_90days.csv', index=False)
-    
-    print(f"\nUSDC market share data saved to usdc_market_share_90days.csv")
-    print(f"Total records: {len(usdc_market_share_df)}")
-    
-    # Print summary statistics across all analyzed chains
-    print(f"\n=== USDC Market Share Summary - Top 10 Chains + Native USDC Chains (Last 90 Days) ===")
-    print(f"Total chains analyzed: {len(combined_chains)}")
-    summary_stats = usdc_market_share_df.groupby('chain')['usdc_market_share_pct'].agg([
-        'mean', 'max', 'min', 'std'
-    ]).round(2)
-    summary_stats.columns = ['Avg_Market_Share_%', 'Max_Market_Share_%', 'Min_Market_Share_%', 'Std_Dev_%']
-    
-    # Add today's total stablecoin supply and USDC supply to the summary
-    summary_stats['Today_Total_Stablecoins'] = summary_stats.index.map(today_total_stablecoins)
-    
-    # Calculate today's USDC supply for each chain
-    today_usdc_supplies = {}
-    for chain in summary_stats.index:
-        usdc_supply = today_total_data[
-            (today_total_data['chain'] == chain) & 
-            (today_total_data['stablecoin_symbol'] == 'USDC')
-        ]['circulating'].sum()
-        today_usdc_supplies[chain] = usdc_supply
-    
-    summary_stats['Today_USDC_Supply'] = summary_stats.index.map(today_usdc_supplies)
-    
-    # Add a column to identify chain type for better understanding
-    summary_stats['Chain_Type'] = summary_stats.index.map(
-        lambda x: 'Top 10 + Native' if x in top_10_total_chains and x in usdc_native_chains_with_data
-        else 'Top 10 Only' if x in top_10_total_chains
-        else 'Native Only'
-    )
-    
-    summary_stats = summary_stats.sort_values('Today_Total_Stablecoins', ascending=False)
-    
-    print(summary_stats.to_string())
-    
-    # Save summary statistics
-    summary_stats.to_csv('usdc_market_share_summary.csv')
-    print(f"\nSummary statistics saved to usdc_market_share_summary.csv")
-else:
-    print("No USDC market share data available")
-
-print("✅ USDC market share analysis complete!")
-
-# Get TVL data for all chains
-print("\nFetching TVL data for all chains...")
-tvl_data = llama.get_all_protocols()
-time.sleep(0.25)  # Add sleep after TVL API call
-
-# Save TVL data to JSON
-with open('tvl_data.json', 'w') as f:
-    json.dump(tvl_data, f)
-
-# Convert TVL data to DataFrame
-tvl_df = pd.DataFrame(tvl_data)
-
-# Save TVL data to CSV
-tvl_df.to_csv('tvl_data.csv', index=False)
-
-print("TVL data saved to tvl_data.json and tvl_data.csv")
-
-# Get chain TVL data
-print("\nFetching chain TVL data...")
-chains_url = "https://api.llama.fi/v2/chains"
-response = session.get(chains_url)
-time.sleep(0.25)  # Add sleep after chains API call12
-chains_data = response.json()
-
-# Sort chains by TVL and get top 200
-chains_data.sort(key=lambda x: x['tvl'], reverse=True)
-top_chains = chains_data[:500]
-
-print(f"\nProcessing top {len(top_chains)} chains by TVL...")
-print(f"First chain example: {top_chains[0]}")  # Debug print first chain data
-
-# Get historical TVL for each chain
-chain_tvl_data = []
-for i, chain in enumerate(top_chains, 1):
-    chain_name = chain['name']
-    print(f"\nProcessing chain {i}/{len(top_chains)}: {chain_name}")
-    try:
-        # Get historical TVL data
-        historical_url = f"https://api.llama.fi/v2/historicalChainTvl/{chain_name}"
-        print(f"Fetching data from: {historical_url}")  # Debug print URL
-        headers = {'User-Agent': 'curl/7.64.1'}
-        hist_response = session.get(historical_url, headers=headers)
-        time.sleep(0.25)  # Add sleep after each historical TVL API call
-        print(f"Status code: {hist_response.status_code}")
-        print(f"Headers: {hist_response.headers}")
-        if hist_response.status_code == 200:
-            hist_data = hist_response.json()
-            if not hist_data or not isinstance(hist_data, list):
-                print(f"✗ Invalid data format for {chain_name}")
-                continue
-                
-            # Convert timestamps to dates and get TVL values
-            tvl_history = [(datetime.fromtimestamp(entry['date']), entry['tvl']) 
-                         for entry in hist_data]
-            
-            if not tvl_history:
-                print(f"✗ No TVL history found for {chain_name}")
+                # Convert timestamps to dates and get TVL values
+                tvl_history = [(datetime.fromtimestamp(entry['date']), entry['tvl']) 
+                             for entry in hist_data]
+
+                if not tvl_history:
+                    print(f"✗ No TVL history found for {chain_name}")
+                    continue
+
+                # Get earliest date with TVL
+                earliest_date = min(date for date, _ in tvl_history)
+                current_tvl = tvl_history[-1][1]  # Latest TVL
+            else:
+                print(f"Error fetching data for {chain_name}")
                 continue
-                
-            # Get earliest date with TVL
-            earliest_date = min(date for date, _ in tvl_history)
-            current_tvl = tvl_history[-1][1]  # Latest TVL
-        else:
-            print(f"Error fetching data for {chain_name}")
+
+            # Calculate growth rates
+            latest_date = tvl_history[-1][0]
+            seven_days_ago = latest_date - timedelta(days=7)
+            thirty_days_ago = latest_date - timedelta(days=30)
+            ninety_days_ago = latest_date - timedelta(days=90)
+
+            # Find closest dates for comparison
+            def find_closest_date(target_date):
+                return min(tvl_history, key=lambda x: abs(x[0] - target_date))
+
+            seven_days_ago_tvl = find_closest_date(seven_days_ago)[1]
+            thirty_days_ago_tvl = find_closest_date(thirty_days_ago)[1]
+            ninety_days_ago_tvl = find_closest_date(ninety_days_ago)[1]
+
+            # Calculate growth rates
+            growth_7d = (current_tvl - seven_days_ago_tvl) / seven_days_ago_tvl if seven_days_ago_tvl > 0 else None
+            growth_30d = (current_tvl - thirty_days_ago_tvl) / thirty_days_ago_tvl if thirty_days_ago_tvl > 0 else None
+            growth_90d = (current_tvl - ninety_days_ago_tvl) / ninety_days_ago_tvl if ninety_days_ago_tvl > 0 else None
+
+            chain_data = {
+                'Chain': chain_name,
+                'Current TVL': current_tvl,
+                'DeFi Launch Date': earliest_date,
+                '7d Growth': growth_7d,
+                '30d Growth': growth_30d,
+                '90d Growth': growth_90d
+            }
+            chain_tvl_data.append(chain_data)
+            print(f"✓ Successfully processed {chain_name} - TVL: ${current_tvl:,.2f}")
+            print(f"  Data collected: {chain_data}")  # Debug print collected data
+
+        except Exception as e:
+            print(f"✗ Error processing {chain_name}: {str(e)}")
             continue
-        
-        # Calculate growth rates
-        latest_date = tvl_history[-1][0]
-        seven_days_ago = latest_date - timedelta(days=7)
-        thirty_days_ago = latest_date - timedelta(days=30)
-        ninety_days_ago = latest_date - timedelta(days=90)
-        
-        # Find closest dates for comparison
-        def find_closest_date(target_date):
-            return min(tvl_history, key=lambda x: abs(x[0] - target_date))
-        
-        seven_days_ago_tvl = find_closest_date(seven_days_ago)[1]
-        thirty_days_ago_tvl = find_closest_date(thirty_days_ago)[1]
-        ninety_days_ago_tvl = find_closest_date(ninety_days_ago)[1]
-        
-        # Calculate growth rates
-        growth_7d = (current_tvl - seven_days_ago_tvl) / seven_days_ago_tvl if seven_days_ago_tvl > 0 else None
-        growth_30d = (current_tvl - thirty_days_ago_tvl) / thirty_days_ago_tvl if thirty_days_ago_tvl > 0 else None
-        growth_90d = (current_tvl - ninety_days_ago_tvl) / ninety_days_ago_tvl if ninety_days_ago_tvl > 0 else None
-        
-        chain_data = {
-            'Chain': chain_name,
-            'Current TVL': current_tvl,
-            'DeFi Launch Date': earliest_date,
-            '7d Growth': growth_7d,
-            '30d Growth': growth_30d,
-            '90d Growth': growth_90d
-        }
-        chain_tvl_data.append(chain_data)
-        print(f"✓ Successfully processed {chain_name} - TVL: ${current_tvl:,.2f}")
-        print(f"  Data collected: {chain_data}")  # Debug print collected data
-        
-    except Exception as e:
-        print(f"✗ Error processing {chain_name}: {str(e)}")
-        continue
-
-print(f"\nTotal chains processed successfully: {len(chain_tvl_data)}")
-
-# Create DataFrame from chain TVL data
-chain_tvl_df = pd.DataFrame(chain_tvl_data)
-
-# Debug print to verify DataFrame structure
-print("\nDataFrame columns:", chain_tvl_df.columns.tolist())
-print("Number of rows:", len(chain_tvl_df))
-if len(chain_tvl_df) > 0:
-    print("\nFirst row of data:")
-    print(chain_tvl_df.iloc[0].to_dict())
-
-# Sort by TVL
-chain_tvl_df = chain_tvl_df.sort_values('Current TVL', ascending=False)
-
-# Save chain TVL data to CSV
-chain_tvl_df.to_csv('chain_tvl_data.csv', index=False)
-
-print("\nChain TVL data saved to chain_tvl_data.csv")
-
-# Comprehensive Chain Metrics Analysis
-print("\n" + "=" * 60)
-print("Fetching Comprehensive Chain Metrics")
-print("=" * 60)
-
-comprehensive_chain_data = []
-
-# Get all chains data first
-chains_url = "https://api.llama.fi/v2/chains"
-chains_response = session.get(chains_url)
-time.sleep(0.25)
-all_chains = chains_response.json()
-
-# Sort by TVL and get top 100 chains
-all_chains.sort(key=lambda x: x.get('tvl', 0), reverse=True)
-top_chains_for_analysis = all_chains[:100]
-
-print(f"\nProcessing top {len(top_chains_for_analysis)} chains for comprehensive metrics...")
-
-for i, chain in enumerate(top_chains_for_analysis, 1):
-    chain_name = chain['name']
-    
-    chain_metrics = {
-        'chain': chain_name,
-        'defi_tvl': chain.get('tvl', 0),
-        'token_symbol': chain.get('tokenSymbol', ''),
-        'chain_id': chain.get('chainId', ''),
-        'gecko_id': chain.get('gecko_id', ''),
-        'cmcId': chain.get('cmcId', ''),
-    }
-    
-    # 1. Get stablecoin market cap for this chain
-    try:
-        # Use our existing stablecoin data
-        latest_stable_date = df['date'].max()
-        chain_stablecoins = df[(df['chain'] == chain_name) & (df['date'] == latest_stable_date)]
-        stable_mcap = chain_stablecoins['circulating'].sum()
-        chain_metrics['stablecoin_mcap'] = stable_mcap
-    except Exception as e:
-        chain_metrics['stablecoin_mcap'] = 0
-    
-    # 2. Get bridged TVL
-    try:
-        bridges_url = f"https://bridges.llama.fi/bridgevolume/{chain_name}?id=0"
-        bridges_response = session.get(bridges_url)
-        time.sleep(0.25)
-        
-        if bridges_response.status_code == 200:
-            bridges_data = bridges_response.json()
-            # Get the most recent bridged volume data
-            if isinstance(bridges_data, list) and len(bridges_data) > 0:
-                # Sum up deposits and withdrawals for the most recent data point
-                latest_bridge_data = bridges_data[-1] if bridges_data else {}
-                chain_metrics['bridged_tvl'] = latest_bridge_data.get('depositUSD', 0)
-            else:
-                chain_metrics['bridged_tvl'] = 0
-        else:
-            chain_metrics['bridged_tvl'] = 0
-    except Exception as e:
-        chain_metrics['bridged_tvl'] = 0
-    
-    # 3. Get active addresses (Note: This may require Pro API)
-    try:
-        # Try to get active addresses from the overview endpoint
-        overview_url = f"https://api.llama.fi/overview/chains/{chain_name}"
-        overview_response = session.get(overview_url)
-        time.sleep(0.25)
-        
-        if overview_response.status_code == 200:
-            overview_data = overview_response.json()
-            # Active addresses might be in different fields depending on the chain
-            chain_metrics['active_addresses'] = overview_data.get('activeAddresses', 0)
-        else:
-            chain_metrics['active_addresses'] = 0
-    except Exception as e:
-        chain_metrics['active_addresses'] = 0
-    
-    comprehensive_chain_data.append(chain_metrics)
-
-# Create DataFrame from comprehensive chain data
-comprehensive_df = pd.DataFrame(comprehensive_chain_data)
-
-# Sort by DeFi TVL
-comprehensive_df = comprehensive_df.sort_values('defi_tvl', ascending=False)
-
-# Save to CSV
-comprehensive_df.to_csv('comprehensive_chain_metrics.csv', index=False)
-
-print("\n" + "=" * 60)
-print("Comprehensive Chain Metrics Analysis Complete!")
-print("=" * 60)
-print(f"Total chains analyzed: {len(comprehensive_chain_data)}")
-print(f"Data saved to: comprehensive_chain_metrics.csv")
-print("\nSample of top 5 chains:")
-print(comprehensive_df.head()[['chain', 'defi_tvl', 'stablecoin_mcap']].to_string())
-
-# run stablecoin_analysis.py
-subprocess.run(['venv/bin/python', 'src/stablecoin_analysis.py'])
-
-# run lending TVL by chain analysis
-print("\n📊 Running Lending TVL by Chain Analysis...")
-subprocess.run(['venv/bin/python', 'src/lending_tvl_by_chain.py'])
-
-# run new chains lending growth analysis
-print("\n📊 Running New Chains Lending Growth Analysis (First 180 Days)...")
-subprocess.run(['venv/bin/python', 'src/new_chains_lending_growth_simple.py'])
-
-# run lending assets by chain analysis
-print("\n📊 Running Lending Assets by Chain Analysis...")
-subprocess.run(['venv/bin/python', 'src/lending_assets_by_chain.py'])
-
-# run LST/LRT TVL by chain analysis
-print("\n📊 Running LST/LRT TVL by Chain Analysis...")
-subprocess.run(['venv/bin/python', 'src/lst_lrt_tvl_by_chain.py'])
-
-# After analysis is complete, automatically upload to Google Sheets
-print("\n" + "=" * 60)
-print("Analysis Complete!")
-print("=" * 60)
-
-print("📊 Uploading to Google Sheets...")
-try:
-    subprocess.run(['venv/bin/python', 'src/google_sheets_upload.py'])
-    print("✅ Upload complete!")
-except Exception as e:
-    print(f"❌ Upload failed: {e}")
\ No newline at end of file
+
+    print(f"\nTotal chains processed successfully: {len(chain_tvl_data)}")
+
+    # Create DataFrame from chain TVL data
+    chain_tvl_df = pd.DataFrame(chain_tvl_data)
+
+    # Debug print to verify DataFrame structure
+    print("\nDataFrame columns:", chain_tvl_df.columns.tolist())
+    print("Number of rows:", len(chain_tvl_df))
+    if len(chain_tvl_df) > 0:
+        print("\nFirst row of data:")
+        print(chain_tvl_df.iloc[0].to_dict())
+
+    # Sort by TVL
+    chain_tvl_df = chain_tvl_df.sort_values('Current TVL', ascending=False)
+
+    # Save chain TVL data to CSV
+    chain_tvl_df.to_csv('chain_tvl_data.csv', index=False)
+
+    print("\nChain TVL data saved to chain_tvl_data.csv")
+
+    # Keep the daily histories for as-of reports (see as_of_snapshots.py)
+    chain_tvl_history_path = save_chain_tvl_history(chain_history_frame(chain_histories))
+    print(f"Chain TVL histories saved to {chain_tvl_history_path}")
+
+    return chains_data
+
+
+def comprehensive_metrics(chains_data, stablecoin_index, session):
+    """Chain metrics for the top 100 chains (see chain_metrics.py)"""
+    # Comprehensive Chain Metrics Analysis
+    section('comprehensive chain metrics')
+    print("\n" + "=" * 60)
+    print("Fetching Comprehensive Chain Metrics")
+    print("=" * 60)
+
+    # Reuses the /v2/chains list and stablecoin index built above (see chain_metrics.py)
+    print(f"\nProcessing top {min(len(chains_data), 100)} chains for comprehensive metrics...")
+    comprehensive_df = comprehensive_chain_metrics(chains_data, stablecoin_index, num_chains=100, session=session, verbose=False)
+
+    # Save to CSV
+    comprehensive_df.to_csv('comprehensive_chain_metrics.csv', index=False)
+
+    print("\n" + "=" * 60)
+    print("Comprehensive Chain Metrics Analysis Complete!")
+    print("=" * 60)
+    print(f"Total chains analyzed: {len(comprehensive_df)}")
+    print(f"Data saved to: comprehensive_chain_metrics.csv")
+    print("\nSample of top 5 chains:")
+    print(comprehensive_df.head()[['chain', 'defi_tvl', 'stablecoin_mcap']].to_string())
+
+    return comprehensive_df
+
+
+def import_data():
+    """Fetch and save everything the analyses read; returns (stablecoin index, protocol chain TVLs)"""
+    print("\n🔄 Fetching fresh data from DeFiLlama APIs...")
+
+    # initialize api client with verify=False
+    llama = DefiLlama()
+    llama.session = get_session()
+
+    # Create a requests session with SSL verification disabled
+    session = get_session()
+
+    df, stablecoin_index = fetch_stablecoin_distribution(llama)
+    usdc_market_share(df, stablecoin_index)
+    protocol_chain_tvls = fetch_protocols(llama)
+    chains_data = fetch_chain_tvls(session)
+    comprehensive_metrics(chains_data, stablecoin_index, session)
+    return stablecoin_index, protocol_chain_tvls
+
+
+def run():
+    """Import, then run the analysis stages in this process and upload to Google Sheets.
+
+    The stages get the stablecoin index and protocol chain TVLs in memory;
+    everything else they read from the files written here. Returns
+    {stage name: outputs}, or None when any analysis stage failed.
+    """
+    stablecoin_index, protocol_chain_tvls = import_data()
+
+    section('analysis stages')
+    results = run_stages(ANALYSIS_STAGES, {
+        'stablecoin_analysis': {'stablecoin_index': stablecoin_index},
+        'lending_tvl_by_chain': {'chain_tvls': protocol_chain_tvls},
+        'new_chains_lending_growth_simple': {'chain_tvls': protocol_chain_tvls},
+    })
+
+    # After analysis is complete, automatically upload to Google Sheets
+    section('google_sheets_upload')
+    print("\n" + "=" * 60)
+    print("Analysis Complete!")
+    print("=" * 60)
+
+    if is_offline():
+        print("⏭️  Skipping Google Sheets upload (running from recorded fixtures)")
+    else:
+        print("📊 Uploading to Google Sheets...")
+        try:
+            run_stage('google_sheets_upload')
+            print("✅ Upload complete!")
+        except Exception as e:
+            print(f"❌ Upload failed: {e}")
+
+    if any(outputs is None for outputs in results.values()):
+        return None
+    return results
+
+
+def main():
+    if run() is None:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,80 @@
-from defillama import DefiLlama
+import argparse
+import sys
+import numpy as np
 import pandas as pd
 import json
-import requests
-import time
 import urllib3
 from datetime import datetime, timedelta
+from protocol_history import CHECKPOINT_DIR, DEFAULT_WORKERS, ProtocolHistoryStore
 
 urllib3.disable_warnings()
 
-def fetch_protocol_tvl_history():
-    """Fetch daily TVL history for all filtered protocols over the past year"""
+
+def history_frame(histories, start_timestamp):
+    """Long past-year frame (date, timestamp, protocol, category, tvl) from checkpointed histories.
+
+    Each history's date/tvl lists become numpy arrays, the window is one mask
+    over all of them, and protocol/category columns are categoricals built
+    from integer codes rather than repeated strings.
+    """
+    counts = np.array([len(history['date']) for history in histories], dtype=np.int64)
+    timestamps = np.concatenate([np.asarray(h['date'], dtype=np.int64) for h in histories] or [np.empty(0, np.int64)])
+    tvl = np.concatenate([np.asarray(h['tvl'], dtype=float) for h in histories] or [np.empty(0)])
+    owner = np.repeat(np.arange(len(histories)), counts)
+    
+    in_window = timestamps >= start_timestamp
+    timestamps, tvl, owner = timestamps[in_window], tvl[in_window], owner[in_window]
+    
+    columns = {
+        'date': pd.to_datetime(timestamps, unit='s').floor('D'),
+        'timestamp': timestamps,
+    }
+    for column, field in [('protocol_name', 'name'), ('protocol_slug', 'slug'), ('category', 'category')]:
+        codes, uniques = pd.factorize(pd.Series([h[field] for h in histories], dtype=object), sort=True)
+        columns[column] = pd.Categorical.from_codes(codes[owner], categories=uniques)
+    columns['tvl'] = tvl
+    
+    df = pd.DataFrame(columns)
+    return df.sort_values(['date', 'category', 'protocol_name'], kind='stable')
+
+
+def category_daily_totals(df):
+    """Daily TVL per category as a (date x category) pivot and in long form.
+
+    Summed with np.add.at over integer (day, category) codes; the long form
+    keeps only the pairs that have data, the pivot fills the rest with 0.
+    """
+    df = df[df['category'].notna()]
+    day_codes, days = pd.factorize(df['date'], sort=True)
+    category_codes = df['category'].cat.codes.to_numpy()
+    categories = df['category'].cat.categories
+    
+    totals = np.zeros((len(days), len(categories)))
+    present = np.zeros((len(days), len(categories)), dtype=bool)
+    np.add.at(totals, (day_codes, category_codes), np.nan_to_num(df['tvl'].to_numpy()))
+    present[day_codes, category_codes] = True
+    
+    used = present.any(axis=0)
+    pivot_table = pd.DataFrame(totals[:, used], index=pd.DatetimeIndex(days, name='date'),
+                               columns=pd.Index(categories[used], name='category'))
+    
+    day_index, category_index = np.nonzero(present)
+    category_daily_tvl = pd.DataFrame({
+        'date': days[day_index],
+        'category': categories[category_index],
+        'tvl': totals[day_index, category_index],
+    })
+    return pivot_table, category_daily_tvl
+
+
+def run(limit=None, workers=DEFAULT_WORKERS, fresh=False):
+    """Fetch daily TVL history for the filtered protocols over the past year.
+
+    Histories are fetched concurrently and checkpointed per protocol, so an
+    interrupted run picks up where it stopped. limit keeps only the top N
+    protocols by TVL (all by default). Returns the raw, per-category, pivot
+    and growth frames, or None when there is nothing to process.
+    """
     
     print("=" * 80)
     print("DeFiLlama Protocol TVL History Fetcher")
@@ -22,127 +87,54 @@ def fetch_protocol_tvl_history():
             filtered_protocols = json.load(f)
         print(f"✅ Loaded {len(filtered_protocols)} protocols")
         
-        # Sort by TVL and take top 250 (handle None values)
+        # Sort by TVL (handle None values) and optionally keep the top N
         filtered_protocols = sorted(filtered_protocols, key=lambda x: x.get('tvl') or 0, reverse=True)
-        filtered_protocols = filtered_protocols[:250]
-        print(f"📊 Limiting to top 250 protocols by TVL")
+        if limit:
+            filtered_protocols = filtered_protocols[:limit]
+            print(f"📊 Limiting to top {limit} protocols by TVL")
         
     except FileNotFoundError:
         print("❌ Error: filtered_protocols_by_category.json not found!")
         print("Please run fetch_protocols_by_category.py first.")
         return
     
-    # Create a requests session with SSL verification disabled
-    session = requests.Session()
-    session.verify = False
-    
     # Calculate date range (past 1 year)
     end_date = datetime.now()
     start_date = end_date - timedelta(days=365)
     
     print(f"\n📅 Date range: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
-    print(f"📊 Fetching TVL history for {len(filtered_protocols)} protocols...")
-    print("⏱️  This will take approximately {:.1f} minutes...".format(len(filtered_protocols) * 0.5 / 60))
+    store = ProtocolHistoryStore()
+    failed_protocols = store.populate(filtered_protocols, workers, fresh)
+    histories = [store.histories[p['slug']] for p in filtered_protocols if p.get('slug') in store.histories]
     
-    all_tvl_data = []
-    successful_protocols = 0
-    failed_protocols = 0
-    
-    for i, protocol in enumerate(filtered_protocols, 1):
-        protocol_slug = protocol.get('slug', '')
-        protocol_name = protocol.get('name', '')
-        protocol_category = protocol.get('category', '')
-        
-        if not protocol_slug:
-            print(f"[{i}/{len(filtered_protocols)}] ⚠️  Skipping {protocol_name} - no slug available")
-            failed_protocols += 1
-            continue
-        
-        print(f"\n[{i}/{len(filtered_protocols)}] Processing: {protocol_name} ({protocol_category})")
-        
-        try:
-            # Fetch TVL history from DeFiLlama API
-            url = f"https://api.llama.fi/protocol/{protocol_slug}"
-            response = session.get(url)
-            time.sleep(0.5)  # Rate limiting - increased to avoid rate limits
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Extract TVL history
-                if 'tvl' in data and isinstance(data['tvl'], list):
-                    tvl_history = data['tvl']
-                    
-                    # Filter for past year and convert to records
-                    for entry in tvl_history:
-                        entry_date = datetime.fromtimestamp(entry['date'])
-                        
-                        # Only include data from the past year
-                        if entry_date >= start_date:
-                            record = {
-                                'date': entry_date.strftime('%Y-%m-%d'),
-                                'timestamp': entry['date'],
-                                'protocol_name': protocol_name,
-                                'protocol_slug': protocol_slug,
-                                'category': protocol_category,
-                                'tvl': entry.get('totalLiquidityUSD', 0)
-                            }
-                            all_tvl_data.append(record)
-                    
-                    print(f"  ✅ Successfully fetched {len([e for e in tvl_history if datetime.fromtimestamp(e['date']) >= start_date])} daily records")
-                    successful_protocols += 1
-                else:
-                    print(f"  ⚠️  No TVL history found in response")
-                    failed_protocols += 1
-            else:
-                print(f"  ❌ API returned status {response.status_code}")
-                failed_protocols += 1
-                
-        except Exception as e:
-            print(f"  ❌ Error: {str(e)}")
-            failed_protocols += 1
-            continue
-        
-        # Progress update every 50 protocols
-        if i % 50 == 0:
-            print(f"\n{'=' * 80}")
-            print(f"Progress: {i}/{len(filtered_protocols)} protocols processed")
-            print(f"Success: {successful_protocols} | Failed: {failed_protocols}")
-            print(f"Total records collected: {len(all_tvl_data):,}")
-            print(f"{'=' * 80}\n")
+    successful_protocols = len(histories)
     
     print("\n" + "=" * 80)
     print("Data Collection Complete!")
     print("=" * 80)
     print(f"✅ Successful: {successful_protocols} protocols")
     print(f"❌ Failed: {failed_protocols} protocols")
-    print(f"📊 Total records: {len(all_tvl_data):,}")
-    
-    if len(all_tvl_data) == 0:
-        print("\n❌ No data collected. Exiting.")
-        return
     
-    # Convert to DataFrame
+    # Build the past-year frame straight from the history arrays
     print("\n📊 Creating DataFrame...")
-    df = pd.DataFrame(all_tvl_data)
-    
-    # Convert date to datetime
-    df['date'] = pd.to_datetime(df['date'])
+    df = history_frame(histories, start_date.timestamp())
+    print(f"📊 Total records: {len(df):,}")
     
-    # Sort by date and protocol
-    df = df.sort_values(['date', 'category', 'protocol_name'])
+    if len(df) == 0:
+        print("\n❌ No data collected. Exiting.")
+        return
     
     # Save raw data
-    output_file = 'protocol_tvl_history_1year_top250.csv'
+    suffix = f"top{limit}" if limit else 'all'
+    output_file = f'protocol_tvl_history_1year_{suffix}.csv'
     df.to_csv(output_file, index=False)
     print(f"✅ Saved raw data to: {output_file}")
     
     # Create aggregated data by category and date
     print("\n📈 Creating category aggregations...")
-    category_daily_tvl = df.groupby(['date', 'category'])['tvl'].sum().reset_index()
-    category_daily_tvl = category_daily_tvl.sort_values(['date', 'category'])
+    pivot_table, category_daily_tvl = category_daily_totals(df)
     
-    category_output_file = 'category_tvl_history_1year_top250.csv'
+    category_output_file = f'category_tvl_history_1year_{suffix}.csv'
     category_daily_tvl.to_csv(category_output_file, index=False)
     print(f"✅ Saved category aggregation to: {category_output_file}")
     
@@ -165,10 +157,11 @@ def fetch_protocol_tvl_history():
     print("TVL by Category (Latest Date):")
     print("=" * 80)
     
-    latest_category_tvl = latest_data.groupby('category')['tvl'].sum().sort_values(ascending=False)
+    latest_category_tvl = latest_data.groupby('category', observed=True)['tvl'].sum().sort_values(ascending=False)
+    latest_protocol_counts = latest_data.groupby('category', observed=True)['protocol_slug'].nunique()
     
     for category, tvl in latest_category_tvl.items():
-        protocol_count = latest_data[latest_data['category'] == category]['protocol_slug'].nunique()
+        protocol_count = latest_protocol_counts[category]
         print(f"{category:30s}: ${tvl:20,.2f} ({protocol_count:3d} protocols)")
     
     print(f"\n{'Total':30s}: ${latest_category_tvl.sum():20,.2f}")
@@ -181,7 +174,7 @@ def fetch_protocol_tvl_history():
     # Get earliest date data (1 year ago)
     earliest_date = df['date'].min()
     earliest_data = df[df['date'] == earliest_date]
-    earliest_category_tvl = earliest_data.groupby('category')['tvl'].sum()
+    earliest_category_tvl = earliest_data.groupby('category', observed=True)['tvl'].sum()
     
     growth_data = []
     for category in latest_category_tvl.index:
@@ -215,16 +208,13 @@ def fetch_protocol_tvl_history():
         print(f"{row['category']:30s}: {growth_str:>10s} (${row['growth_absolute']:+,.0f})")
     
     # Save growth summary
-    growth_output_file = 'category_growth_summary_top250.csv'
+    growth_output_file = f'category_growth_summary_{suffix}.csv'
     growth_df.to_csv(growth_output_file, index=False)
     print(f"\n✅ Saved growth summary to: {growth_output_file}")
     
     # Create a pivot table for easy charting
-    print("\n📊 Creating pivot table for charting...")
-    pivot_table = category_daily_tvl.pivot(index='date', columns='category', values='tvl')
-    pivot_table = pivot_table.fillna(0)
-    
-    pivot_output_file = 'category_tvl_pivot_1year_top250.csv'
+    print("\n📊 Saving pivot table for charting...")
+    pivot_output_file = f'category_tvl_pivot_1year_{suffix}.csv'
     pivot_table.to_csv(pivot_output_file)
     print(f"✅ Saved pivot table to: {pivot_output_file}")
     
@@ -244,6 +234,18 @@ def fetch_protocol_tvl_history():
     
     return df, category_daily_tvl, pivot_table, growth_df
 
+
+def main():
+    parser = argparse.ArgumentParser(description='Fetch daily TVL history for the filtered protocols')
+    parser.add_argument('--limit', type=int, default=None, help='Only the top N protocols by TVL (default: all)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Concurrent requests')
+    parser.add_argument('--fresh', action='store_true', help=f'Ignore checkpoints in {CHECKPOINT_DIR}/')
+    args = parser.parse_args()
+    
+    if run(args.limit, args.workers, args.fresh) is None:
+        sys.exit(1)
+
+
 if __name__ == "__main__":
-    df, category_daily_tvl, pivot_table, growth_df = fetch_protocol_tvl_history()
+    main()
 
@@ -1,9 +1,9 @@
 from defillama import DefiLlama
 import pandas as pd
 import json
-import requests
-import time
 import urllib3
+from llama_http import get_session, throttle
+from category_cube import CategoryCube
 
 urllib3.disable_warnings()
 
@@ -42,18 +42,17 @@ def fetch_protocols_by_categories():
     
     # Initialize API client
     llama = DefiLlama()
-    llama.session.verify = False
+    llama.session = get_session()
     
     # Create a requests session with SSL verification disabled
-    session = requests.Session()
-    session.verify = False
+    session = get_session()
     
     print("\n🔄 Fetching all protocols from DeFiLlama API...")
     
     try:
         # Fetch all protocols
         all_protocols = llama.get_all_protocols()
-        time.sleep(0.25)
+        throttle(0.25)
         
         print(f"✅ Successfully fetched {len(all_protocols)} protocols")
         
@@ -63,20 +62,10 @@ def fetch_protocols_by_categories():
         print(f"📁 Saved all protocols to: all_protocols.json")
         
         # Filter protocols by target categories
-        filtered_protocols = []
-        category_counts = {}
-        
-        for protocol in all_protocols:
-            # Check if protocol has a category field
-            protocol_category = protocol.get('category', '')
-            
-            if protocol_category in TARGET_CATEGORIES:
-                filtered_protocols.append(protocol)
-                
-                # Count protocols per category
-                if protocol_category not in category_counts:
-                    category_counts[protocol_category] = 0
-                category_counts[protocol_category] += 1
+        protocols_df = pd.DataFrame(all_protocols)
+        category_mask = protocols_df['category'].isin(TARGET_CATEGORIES).to_numpy()
+        filtered_protocols = [protocol for protocol, keep in zip(all_protocols, category_mask) if keep]
+        category_counts = protocols_df.loc[category_mask, 'category'].value_counts(sort=False).to_dict()
         
         print(f"\n✅ Filtered to {len(filtered_protocols)} protocols matching target categories")
         
@@ -140,6 +129,11 @@ def fetch_protocols_by_categories():
         category_summary.to_csv('category_summary.csv')
         print(f"\n📁 Saved category summary to: category_summary.csv")
         
+        # Per-chain breakdown of every target category from one pass over chainTvls
+        category_chains = CategoryCube.from_protocols(filtered_protocols).chain_table()
+        category_chains.to_csv('category_chain_tvl.csv', index=False)
+        print(f"📁 Saved per-chain category breakdown to: category_chain_tvl.csv")
+        
         print("\n" + "=" * 80)
         print("Category Summary (by Total TVL):")
         print("=" * 80)
@@ -149,10 +143,7 @@ def fetch_protocols_by_categories():
         print("\n" + "=" * 80)
         print("All Available Categories in DeFiLlama:")
         print("=" * 80)
-        all_categories = set()
-        for protocol in all_protocols:
-            if 'category' in protocol and protocol['category']:
-                all_categories.add(protocol['category'])
+        all_categories = set(protocols_df['category'].dropna()) - {''}
         
         for category in sorted(all_categories):
             matched = "✓" if category in TARGET_CATEGORIES else " "
@@ -169,6 +160,7 @@ def fetch_protocols_by_categories():
         print("  2. filtered_protocols_by_category.json - Filtered protocols")
         print("  3. filtered_protocols_by_category.csv - Filtered protocols (CSV)")
         print("  4. category_summary.csv - Summary statistics by category")
+        print("  5. category_chain_tvl.csv - TVL by chain for each category")
         
         return filtered_protocols, df, category_summary
         
@@ -3,6 +3,7 @@ from googleapiclient.discovery import build
 import os.path
 import pandas as pd
 import numpy as np
+from instrumentation import stage
 
 # If modifying these scopes, delete the file token.json.
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
@@ -151,6 +152,8 @@ def update_sheet(service, sheet_name, data):
     ).execute()
 
 def main(files_to_upload=None):
+    """Upload the CSVs to their sheets; returns the updated sheet names, None if the upload failed"""
+    updated = []
     try:
         creds = get_credentials()
         service = build('sheets', 'v4', credentials=creds)
@@ -195,18 +198,23 @@ def main(files_to_upload=None):
         
         for csv_file, sheet_name in files_to_upload:
             if os.path.exists(csv_file):
-                data = pd.read_csv(csv_file)
-                update_sheet(service, sheet_name, data)
+                with stage(f"sheets {sheet_name}"):
+                    data = pd.read_csv(csv_file)
+                    update_sheet(service, sheet_name, data)
                 print(f"Updated {sheet_name} sheet")
+                updated.append(sheet_name)
             else:
                 print(f"Warning: {csv_file} not found")
                 
     except FileNotFoundError as e:
         print(f"Error uploading to Google Sheets: {e}")
         print("Skipping Google Sheets upload. Data files have been saved locally.")
+        return None
     except Exception as e:
         print(f"Error uploading to Google Sheets: {e}")
         print("Skipping Google Sheets upload. Data files have been saved locally.")
+        return None
+    return updated
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
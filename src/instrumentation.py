@@ -0,0 +1,519 @@
+"""
+Run Timing Instrumentation
+Records where a pipeline run spends its time: every HTTP call made through
+llama_http (endpoint template, status, bytes, latency, JSON decode), every
+throttle sleep, every pipeline stage/section, and the main pandas operations
+(read_csv, to_csv, concat, merge, pivot_table).
+
+Off by default. Enable it with environment variables:
+
+    LLAMA_TIMING=1          turn instrumentation on
+    LLAMA_TIMING_DIR        where run reports go (default: run_reports)
+    LLAMA_MEMORY=rss|trace  also profile memory at stage boundaries (see memory_profile.py)
+
+Child scripts started as separate processes inherit the run and attach their
+timings under the stage that launched them. When the top-level process exits
+it writes run_reports/<run id>/ with:
+
+    report.json   stage tree, category totals and per-endpoint stats
+    stages.csv    one row per stage path (calls, total and self seconds)
+    http.csv      one row per HTTP request
+    memory.csv    per-stage RSS, peak RSS and budgets (when LLAMA_MEMORY is set)
+    flame.folded  folded stacks (self time in microseconds) for flamegraph.pl or speedscope
+
+Scripts and stage functions mark their sequential steps with section() and
+nested blocks with stage()/timed(); both are no-ops costing one function
+call when timing is off. pipeline.py runs every stage under stage(), so the
+sections of a stage nest under it.
+"""
+
+import atexit
+import csv
+import functools
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from memory_profile import MEMORY_FIELDS, MemoryBudgetExceeded, MemoryProfiler, memory_mode, print_memory_summary
+
+DEFAULT_REPORT_DIR = 'run_reports'
+
+# Endpoint templates so per-chain / per-id URLs aggregate into one row
+ENDPOINT_TEMPLATES = [
+    (re.compile(r'^/v2/historicalChainTvl/[^/]+$'), '/v2/historicalChainTvl/{chain}'),
+    (re.compile(r'^/stablecoin/[^/]+$'), '/stablecoin/{id}'),
+    (re.compile(r'^/stablecoincharts/[^/]+$'), '/stablecoincharts/{chain}'),
+    (re.compile(r'^/protocol/[^/]+$'), '/protocol/{slug}'),
+    (re.compile(r'^/bridgevolume/[^/]+$'), '/bridgevolume/{chain}'),
+    (re.compile(r'^/overview/chains/[^/]+$'), '/overview/chains/{chain}'),
+    (re.compile(r'^/prices/current/[^/]+$'), '/prices/current/{coins}'),
+    (re.compile(r'^/prices/historical/\d+/[^/]+$'), '/prices/historical/{timestamp}/{coins}'),
+    (re.compile(r'^/chart/[^/]+$'), '/chart/{pool}'),
+]
+
+HTTP_FIELDS = ['started_at', 'stage', 'method', 'host', 'endpoint', 'status', 'bytes',
+               'latency_s', 'json_s', 'mode', 'pid']
+
+_lock = threading.Lock()
+_section_listeners = []
+_local = threading.local()
+_state = {
+    'enabled': False,
+    'root': None,
+    'main_stack': None,
+    'memory': None,
+    'nodes': {},
+    'http': [],
+}
+
+
+def enabled():
+    """True when timing is being recorded"""
+    return _state['enabled']
+
+
+def endpoint_template(url):
+    """Return (host, templated path) for a request URL"""
+    parts = urlsplit(url)
+    path = parts.path
+    for pattern, template in ENDPOINT_TEMPLATES:
+        if pattern.match(path):
+            return parts.netloc, template
+    return parts.netloc, path
+
+
+def category(name):
+    """Bucket a stage-tree node name for the category totals"""
+    if name.startswith('http '):
+        return 'network'
+    if name.startswith('json '):
+        return 'json'
+    if name == 'throttle':
+        return 'sleep'
+    if name == 'startup':
+        return 'startup'
+    if name.startswith(('pandas.read_', 'pandas.to_')):
+        return 'file io'
+    if name.startswith('pandas.'):
+        return 'pandas'
+    if name.startswith('sheets'):
+        return 'sheets'
+    return 'python'
+
+
+def _stack():
+    stack = getattr(_local, 'stack', None)
+    if stack is None or (len(stack) == 1 and stack is not _state['main_stack']):
+        # Worker threads attribute their work to the main thread's current stage
+        main = _state['main_stack'] or [_state['root']]
+        stack = _local.stack = [main[-1]]
+    return stack
+
+
+def _add(path, seconds, calls=1):
+    with _lock:
+        node = _state['nodes'].get(path)
+        if node is None:
+            node = _state['nodes'][path] = [0, 0.0]
+        node[0] += calls
+        node[1] += seconds
+
+
+def _on_main_thread():
+    return threading.current_thread() is threading.main_thread()
+
+
+def _export_parent(path):
+    # Child processes started from this stage inherit it through the environment
+    if _on_main_thread():
+        os.environ['LLAMA_TIMING_PARENT'] = json.dumps(list(path))
+
+
+@contextmanager
+def stage(name, memory=True):
+    """Time a block as a child of the current stage.
+
+    section() calls inside the block (a pipeline stage's own steps) nest
+    under it and end with it; the section open around the block resumes.
+    """
+    if not _state['enabled']:
+        yield
+        return
+    stack = _stack()
+    path = stack[-1] + (name,)
+    stack.append(path)
+    _export_parent(path)
+    outer_section = getattr(_local, 'section', None)
+    _local.section = None
+    profiler = _state['memory'] if memory and _on_main_thread() else None
+    if profiler:
+        profiler.enter(path)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _end_section(stack)
+        _local.section = outer_section
+        _add(path, time.perf_counter() - start)
+        stack.pop()
+        _export_parent(stack[-1])
+        if profiler:
+            profiler.exit(path)
+
+
+def timed(name=None):
+    """Decorator form of stage(); defaults to the function name"""
+    def decorator(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _state['enabled']:
+                return func(*args, **kwargs)
+            with stage(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def on_section(listener):
+    """Call listener(name) at every section() boundary, even with timing off (see benchmarks.py)"""
+    _section_listeners.append(listener)
+
+
+def section(name):
+    """Start a sequential section, ending the previous one.
+
+    Call section('...') where a step of a script or stage function starts;
+    the last section ends with the enclosing stage() or when the script
+    exits.
+    """
+    for listener in _section_listeners:
+        listener(name)
+    if not _state['enabled']:
+        return
+    stack = _stack()
+    _end_section(stack)
+    path = stack[-1] + (name,)
+    stack.append(path)
+    _local.section = (path, time.perf_counter())
+    _export_parent(path)
+    if _state['memory'] and _on_main_thread():
+        _state['memory'].enter(path)
+
+
+def _end_section(stack):
+    current = getattr(_local, 'section', None)
+    if current is None:
+        return
+    path, start = current
+    _add(path, time.perf_counter() - start)
+    if stack and stack[-1] == path:
+        stack.pop()
+    _local.section = None
+    _export_parent(stack[-1])
+    if _state['memory'] and _on_main_thread():
+        _state['memory'].exit(path)
+
+
+def record(name, seconds, calls=1):
+    """Add an already measured leaf under the current stage"""
+    if _state['enabled']:
+        _add(_stack()[-1] + (name,), seconds, calls)
+
+
+def record_http(method, url, status, size, latency, mode):
+    """Record one HTTP request; returns the row so JSON decode time can be added"""
+    if not _state['enabled']:
+        return None
+    host, endpoint = endpoint_template(url)
+    parent = _stack()[-1]
+    _add(parent + (f"http {method} {host}{endpoint}",), latency)
+    row = {
+        'started_at': round(time.time() - latency, 3),
+        'stage': ';'.join(parent),
+        'method': method,
+        'host': host,
+        'endpoint': endpoint,
+        'status': status,
+        'bytes': size,
+        'latency_s': round(latency, 6),
+        'json_s': 0.0,
+        'mode': mode,
+        'pid': os.getpid(),
+    }
+    with _lock:
+        _state['http'].append(row)
+    return row
+
+
+def instrument_response(response, row):
+    """Time response.json() and attribute it to the request's row"""
+    if row is None:
+        return response
+    decode = response.json
+
+    def timed_json(**kwargs):
+        start = time.perf_counter()
+        try:
+            return decode(**kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            row['json_s'] = round(row['json_s'] + seconds, 6)
+            record(f"json {row['host']}{row['endpoint']}", seconds)
+
+    response.json = timed_json
+    return response
+
+
+def _wrap_pandas(owner, attr, label):
+    original = getattr(owner, attr)
+
+    @functools.wraps(original)
+    def wrapper(*args, **kwargs):
+        if not _state['enabled']:
+            return original(*args, **kwargs)
+        with stage(label, memory=False):
+            return original(*args, **kwargs)
+
+    wrapper.__wrapped_by_instrumentation__ = True
+    setattr(owner, attr, wrapper)
+
+
+def _patch_pandas():
+    try:
+        import pandas as pd
+    except ImportError:
+        return
+    if getattr(pd.read_csv, '__wrapped_by_instrumentation__', False):
+        return
+    for attr in ('read_csv', 'read_json', 'concat', 'merge', 'pivot_table'):
+        _wrap_pandas(pd, attr, f"pandas.{attr}")
+    for attr in ('to_csv', 'to_json', 'merge', 'pivot_table'):
+        _wrap_pandas(pd.DataFrame, attr, f"pandas.{attr}")
+
+
+def _process_age():
+    """Seconds since this process started (interpreter startup and imports), 0 if unknown"""
+    try:
+        with open('/proc/self/stat') as f:
+            # Field 22 is the start time in clock ticks since boot; skip past the command name
+            fields = f.read().rsplit(')', 1)[1].split()
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return max(uptime - int(fields[19]) / os.sysconf('SC_CLK_TCK'), 0.0)
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+def _script_name():
+    name = os.path.splitext(os.path.basename(sys.argv[0] or 'python'))[0]
+    return name or 'python'
+
+
+def start(root=None):
+    """Turn instrumentation on for this process (called on import when LLAMA_TIMING or LLAMA_MEMORY is set)"""
+    if _state['enabled']:
+        return
+    parent = os.environ.get('LLAMA_TIMING_PARENT')
+    root_path = tuple(json.loads(parent)) if parent else ()
+    root_path += (root or _script_name(),)
+
+    if not os.environ.get('LLAMA_TIMING_RUN'):
+        os.environ['LLAMA_TIMING_RUN'] = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{root_path[-1]}"
+        _state['is_root'] = True
+    else:
+        _state['is_root'] = False
+
+    _state['enabled'] = True
+    _state['root'] = root_path
+    startup = _process_age()
+    _state['started'] = time.perf_counter() - startup
+    _local.stack = [root_path]
+    _add(root_path + ('startup',), startup)
+    _state['main_stack'] = _local.stack
+    mode = memory_mode()
+    if mode:
+        _state['memory'] = MemoryProfiler(mode)
+        _state['memory'].enter(root_path)
+    _patch_pandas()
+    atexit.register(finish)
+
+
+def run_dir():
+    base = os.environ.get('LLAMA_TIMING_DIR', DEFAULT_REPORT_DIR)
+    return os.path.join(base, os.environ['LLAMA_TIMING_RUN'])
+
+
+def finish():
+    """Close open sections and write this process's timings (and the merged report in the root process)"""
+    if not _state['enabled']:
+        return
+    stack = _state['main_stack']
+    failed = False
+    try:
+        _end_section(stack)
+    except MemoryBudgetExceeded as e:
+        print(f"❌ {e}", file=sys.stderr)
+        failed = True
+    _add(_state['root'], time.perf_counter() - _state['started'])
+    profiler = _state['memory']
+    if profiler:
+        try:
+            profiler.exit(_state['root'])
+        except MemoryBudgetExceeded as e:
+            print(f"❌ {e}", file=sys.stderr)
+            failed = True
+    _state['enabled'] = False
+
+    directory = run_dir()
+    os.makedirs(directory, exist_ok=True)
+    part = {
+        'pid': os.getpid(),
+        'nodes': [[list(path), calls, seconds] for path, (calls, seconds) in _state['nodes'].items()],
+        'http': _state['http'],
+        'memory': profiler.records if profiler else [],
+        'memory_action': profiler.action if profiler else None,
+    }
+    with open(os.path.join(directory, f"part-{os.getpid()}.json"), 'w') as f:
+        json.dump(part, f)
+
+    if _state['is_root']:
+        report = write_report(directory)
+        failed = failed or (profiler is not None and profiler.action == 'fail' and report['memory_violations'] > 0)
+    if failed:
+        # Budget enforcement in fail mode: exit non-zero even though the script itself finished
+        sys.stdout.flush()
+        os._exit(1)
+
+
+def load_parts(directory):
+    nodes = {}
+    http = []
+    memory = []
+    for name in sorted(os.listdir(directory)):
+        if not (name.startswith('part-') and name.endswith('.json')):
+            continue
+        with open(os.path.join(directory, name)) as f:
+            part = json.load(f)
+        for path, calls, seconds in part['nodes']:
+            node = nodes.setdefault(tuple(path), [0, 0.0])
+            node[0] += calls
+            node[1] += seconds
+        http.extend(part['http'])
+        memory.extend(part.get('memory', []))
+    return nodes, http, memory
+
+
+def self_times(nodes):
+    """Total minus time spent in direct children, floored at zero"""
+    children = {}
+    for path, (_, seconds) in nodes.items():
+        if len(path) > 1:
+            children[path[:-1]] = children.get(path[:-1], 0.0) + seconds
+    return {path: max(seconds - children.get(path, 0.0), 0.0) for path, (_, seconds) in nodes.items()}
+
+
+def endpoint_stats(http):
+    stats = {}
+    for row in http:
+        key = f"{row['method']} {row['host']}{row['endpoint']}"
+        entry = stats.setdefault(key, {'requests': 0, 'errors': 0, 'bytes': 0, 'latency_s': 0.0,
+                                       'max_latency_s': 0.0, 'json_s': 0.0})
+        entry['requests'] += 1
+        entry['errors'] += 0 if row['status'] == 200 else 1
+        entry['bytes'] += row['bytes'] or 0
+        entry['latency_s'] += row['latency_s']
+        entry['max_latency_s'] = max(entry['max_latency_s'], row['latency_s'])
+        entry['json_s'] += row['json_s']
+    for entry in stats.values():
+        entry['mean_latency_s'] = entry['latency_s'] / entry['requests']
+    return dict(sorted(stats.items(), key=lambda item: -item[1]['latency_s']))
+
+
+def write_report(directory):
+    """Merge every process's timings into the run report"""
+    nodes, http, memory = load_parts(directory)
+    selfs = self_times(nodes)
+
+    categories = {}
+    for path, seconds in selfs.items():
+        key = category(path[-1])
+        categories[key] = categories.get(key, 0.0) + seconds
+
+    roots = [path for path in nodes if len(path) == 1]
+    wall = sum(nodes[path][1] for path in roots)
+    report = {
+        'run': os.path.basename(directory),
+        'wall_s': wall,
+        'categories': dict(sorted(categories.items(), key=lambda item: -item[1])),
+        'endpoints': endpoint_stats(http),
+        'memory': memory,
+        'memory_violations': sum(1 for record in memory if record['over_budget']),
+        'stages': [
+            {'path': list(path), 'calls': calls, 'total_s': seconds, 'self_s': selfs[path]}
+            for path, (calls, seconds) in sorted(nodes.items())
+        ],
+    }
+    with open(os.path.join(directory, 'report.json'), 'w') as f:
+        json.dump(report, f, indent=2)
+
+    with open(os.path.join(directory, 'stages.csv'), 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['stage', 'depth', 'category', 'calls', 'total_s', 'self_s'])
+        for path, (calls, seconds) in sorted(nodes.items()):
+            writer.writerow([';'.join(path), len(path), category(path[-1]), calls,
+                             round(seconds, 6), round(selfs[path], 6)])
+
+    with open(os.path.join(directory, 'http.csv'), 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=HTTP_FIELDS)
+        writer.writeheader()
+        writer.writerows(sorted(http, key=lambda row: row['started_at']))
+
+    if memory:
+        with open(os.path.join(directory, 'memory.csv'), 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=MEMORY_FIELDS)
+            writer.writeheader()
+            writer.writerows(memory)
+
+    with open(os.path.join(directory, 'flame.folded'), 'w') as f:
+        for path, seconds in sorted(selfs.items()):
+            micros = int(seconds * 1e6)
+            if micros:
+                f.write(f"{';'.join(path)} {micros}\n")
+
+    print_summary(report, directory)
+    return report
+
+
+def print_summary(report, directory):
+    print("\n" + "=" * 60)
+    print(f"⏱️  Run timing report ({report['wall_s']:.1f}s wall)")
+    print("=" * 60)
+    for key, seconds in report['categories'].items():
+        share = seconds / report['wall_s'] if report['wall_s'] else 0
+        print(f"  {key:<10} {seconds:>9.2f}s  {share:>6.1%}")
+
+    print("\nSlowest steps (self time):")
+    for entry in sorted(report['stages'], key=lambda e: -e['self_s'])[:10]:
+        print(f"  {entry['self_s']:>9.2f}s  {' > '.join(entry['path'][-3:])}")
+
+    if report['endpoints']:
+        print("\nEndpoints by total latency:")
+        for key, stats in list(report['endpoints'].items())[:8]:
+            print(f"  {stats['latency_s']:>9.2f}s  {stats['requests']:>5} req  "
+                  f"{stats['bytes'] / 1e6:>8.1f} MB  {key}")
+    print_memory_summary(report['memory'])
+    if report['memory_violations']:
+        print(f"\n❌ {report['memory_violations']} stage(s) exceeded their memory budget")
+    print(f"\nReport saved to {directory}/")
+
+
+if os.environ.get('LLAMA_TIMING', '').lower() in ('1', 'true', 'yes', 'on') or memory_mode():
+    start()
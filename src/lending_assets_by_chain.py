@@ -1,328 +1,260 @@
+import sys
 import pandas as pd
-import json
-import requests
-import time
 import urllib3
 from datetime import datetime
+from asset_taxonomy import get_taxonomy
+from instrumentation import section
+from yield_pools import load_pools
 
 urllib3.disable_warnings()
 
-print("\n" + "=" * 80)
-print("Lending Protocol Supplied Assets Breakdown by Chain")
-print("=" * 80)
-
-# Create a requests session with SSL verification disabled
-session = requests.Session()
-session.verify = False
-
-# Fetch yield pools data from DeFiLlama
-print("\n📊 Fetching yield pools data from DeFiLlama...")
-pools_url = "https://yields.llama.fi/pools"
-
-try:
-    response = session.get(pools_url)
-    time.sleep(0.25)
-    
-    if response.status_code == 200:
-        pools_data = response.json()
-        print(f"✓ Successfully fetched {len(pools_data.get('data', []))} pools")
-        
-        # Save raw data for debugging
-        with open('yield_pools_raw.json', 'w') as f:
-            json.dump(pools_data, f, indent=2)
-        print(f"✓ Raw data saved to yield_pools_raw.json")
-    else:
-        print(f"✗ Error fetching pools data: Status code {response.status_code}")
-        exit(1)
-except Exception as e:
-    print(f"✗ Error fetching pools data: {str(e)}")
-    exit(1)
-
-# Convert to DataFrame
-pools_df = pd.DataFrame(pools_data['data'])
-
-print(f"\nTotal pools: {len(pools_df)}")
-print(f"Columns available: {list(pools_df.columns)}")
-
-# Get list of lending protocols from TVL data
-print("\n🏦 Loading lending protocols list...")
-tvl_df = pd.read_csv('tvl_data.csv')
-lending_protocols = tvl_df[tvl_df['category'] == 'Lending']['slug'].unique().tolist()
-print(f"Found {len(lending_protocols)} lending protocols")
-
-# Filter pools for lending protocols only
-print("\n🏦 Filtering pools for lending protocols...")
-lending_pools = pools_df[pools_df['project'].isin(lending_protocols)].copy()
-print(f"Total lending pools: {len(lending_pools)}")
-
-# Define EVM chains (common EVM-compatible chains)
-evm_chains = [
-    'Ethereum', 'Arbitrum', 'Optimism', 'Polygon', 'Base', 'Avalanche', 
-    'BSC', 'Fantom', 'Gnosis', 'Celo', 'Moonbeam', 'Moonriver', 
-    'Cronos', 'Kava', 'Aurora', 'Harmony', 'Metis', 'Boba', 
-    'Linea', 'Scroll', 'zkSync Era', 'Polygon zkEVM', 'Mantle',
-    'Manta', 'Blast', 'Mode', 'OP Mainnet', 'Arbitrum Nova',
-    'Rootstock', 'Kroma', 'Taiko', 'Fraxtal', 'Sei', 'Worldchain',
-    'Sonic', 'Ink', 'Unichain', 'Berachain', 'X Layer', 'Zircuit',
-    'zkLink Nova', 'BOB', 'Corn', 'Lisk', 'World Chain', 'Monad',
-    'opBNB', 'Gravity', 'Plume Mainnet', 'Flare', 'Conflux', 'Plasma'
-]
-
-# Filter for EVM chains
-print("\n⛓️  Filtering for EVM chains...")
-evm_lending_pools = lending_pools[lending_pools['chain'].isin(evm_chains)].copy()
-print(f"Total lending pools on EVM chains: {len(evm_lending_pools)}")
-
-# Check if we have the necessary columns
-print("\n🔍 Checking available data fields...")
-sample_pool = evm_lending_pools.iloc[0] if len(evm_lending_pools) > 0 else None
-if sample_pool is not None:
-    print("\nSample pool data:")
-    print(f"  Project: {sample_pool.get('project', 'N/A')}")
-    print(f"  Symbol: {sample_pool.get('symbol', 'N/A')}")
-    print(f"  Chain: {sample_pool.get('chain', 'N/A')}")
-    print(f"  TVL: ${sample_pool.get('tvlUsd', 0):,.2f}")
-    print(f"  Available keys: {list(sample_pool.keys())}")
-
-# Group by chain and asset symbol
-print("\n📈 Aggregating TVL by chain and asset...")
-
-# Create a list to store aggregated data
-asset_breakdown = []
-
-for chain in evm_lending_pools['chain'].unique():
-    chain_pools = evm_lending_pools[evm_lending_pools['chain'] == chain]
-    
-    print(f"\n  Processing {chain}: {len(chain_pools)} pools")
-    
-    # Group by symbol (asset)
-    for symbol in chain_pools['symbol'].unique():
-        symbol_pools = chain_pools[chain_pools['symbol'] == symbol]
-        
-        # Sum up TVL for this asset on this chain
-        total_tvl = symbol_pools['tvlUsd'].sum()
-        
-        # Get unique protocols providing this asset
-        protocols = symbol_pools['project'].unique()
-        num_protocols = len(protocols)
-        
-        # Get the underlying tokens if available
-        underlyingTokens = symbol_pools['underlyingTokens'].iloc[0] if 'underlyingTokens' in symbol_pools.columns else []
-        
-        asset_breakdown.append({
-            'chain': chain,
-            'symbol': symbol,
-            'total_tvl_usd': total_tvl,
-            'num_protocols': num_protocols,
-            'protocols': ', '.join(protocols),
-            'underlyingTokens': underlyingTokens
-        })
-        
-        if total_tvl > 1000000:  # Only print assets with > $1M TVL
-            print(f"    {symbol}: ${total_tvl:,.2f} across {num_protocols} protocols")
-
-# Create DataFrame from aggregated data
-asset_breakdown_df = pd.DataFrame(asset_breakdown)
-
-# Define asset type classifications
-def classify_asset(symbol):
-    """Classify assets into categories based on symbol"""
-    symbol_upper = symbol.upper()
-    
-    # BTC tokens
-    btc_tokens = [
-        'WBTC', 'CBBTC', 'BTCB', 'LBTC', 'BTC.B', 'TBTC', 'SOLVBTC', 
-        'VBGTWBTC', 'XSOLVBTC', 'EBTC', 'FBTC', 'ENZOBTC', 'UBTC', 
-        'STBTC', 'M-BTC', 'HYPERCBBTCD', 'GTWBTCC', 'MHYPERBTC',
-        'NWBTC', 'YBTC.B', 'BTC', 'CDCBTC', 'FIABTC', 'MWCBBTC',
-        'SMCBBTC', 'HGBTC'
-    ]
-    if symbol_upper in btc_tokens:
-        return 'BTC Tokens'
-    
-    # ETH LSTs (Liquid Staking Tokens)
-    eth_lsts = [
-        'WEETH', 'WSTETH', 'STETH', 'RSETH', 'RETH', 'TETH', 
-        'EZETH', 'OSETH', 'WRSETH', 'ETH+', 'WSTETH-ETH-25X',
-        'WEETHS', 'WSUPEROETHB', 'CBETH', 'SFRXETH', 'FRXETH',
-        'EETH', 'PUFETH', 'AGETH', 'SAVETH', 'OETH', 'SVETH',
-        'ETHX', 'METH', 'DETH', 'BSDETH', 'CSETH', 'HGETH',
-        'YNETHX', 'GTMSETHC', 'STEAKETH', 'AVGWETHCORE', 'NWETH',
-        'AWETH', 'MHYETH', 'HYPERETHD', 'MHYPERETH', 'YOETH',
-        'GTMSUSDC', 'FLRETH', 'STHETH'
+
+def run(tvl_path='tvl_data.csv'):
+    """Assets supplied to lending pools per chain; returns the (chain, asset) breakdown, or None if the pools fetch fails"""
+    print("\n" + "=" * 80)
+    print("Lending Protocol Supplied Assets Breakdown by Chain")
+    print("=" * 80)
+
+    # Fetch yield pools data from DeFiLlama (shared snapshot, see yield_pools.py)
+    section('fetch pools')
+    print("\n📊 Fetching yield pools data from DeFiLlama...")
+
+    try:
+        pools_df = load_pools()
+    except Exception as e:
+        print(f"✗ Error fetching pools data: {str(e)}")
+        return None
+
+    # Filter the pools down to lending protocols on EVM chains
+    section('filter lending pools')
+    print(f"\nTotal pools: {len(pools_df)}")
+    print(f"Columns available: {list(pools_df.columns)}")
+
+    # Get list of lending protocols from TVL data
+    print("\n🏦 Loading lending protocols list...")
+    tvl_df = pd.read_csv(tvl_path)
+    lending_protocols = tvl_df[tvl_df['category'] == 'Lending']['slug'].unique().tolist()
+    print(f"Found {len(lending_protocols)} lending protocols")
+
+    # Filter pools for lending protocols only
+    print("\n🏦 Filtering pools for lending protocols...")
+    lending_pools = pools_df[pools_df['project'].isin(lending_protocols)].copy()
+    print(f"Total lending pools: {len(lending_pools)}")
+
+    # Define EVM chains (common EVM-compatible chains)
+    evm_chains = [
+        'Ethereum', 'Arbitrum', 'Optimism', 'Polygon', 'Base', 'Avalanche', 
+        'BSC', 'Fantom', 'Gnosis', 'Celo', 'Moonbeam', 'Moonriver', 
+        'Cronos', 'Kava', 'Aurora', 'Harmony', 'Metis', 'Boba', 
+        'Linea', 'Scroll', 'zkSync Era', 'Polygon zkEVM', 'Mantle',
+        'Manta', 'Blast', 'Mode', 'OP Mainnet', 'Arbitrum Nova',
+        'Rootstock', 'Kroma', 'Taiko', 'Fraxtal', 'Sei', 'Worldchain',
+        'Sonic', 'Ink', 'Unichain', 'Berachain', 'X Layer', 'Zircuit',
+        'zkLink Nova', 'BOB', 'Corn', 'Lisk', 'World Chain', 'Monad',
+        'opBNB', 'Gravity', 'Plume Mainnet', 'Flare', 'Conflux', 'Plasma'
     ]
-    if symbol_upper in eth_lsts:
-        return 'ETH LSTs'
-    
-    # ETH - all other ETH variants
-    if 'ETH' in symbol_upper and symbol_upper not in ['BETH', 'SETH']:
-        # Already classified as LST above, so this catches remaining ETH tokens
-        return 'ETH'
-    
-    # Stablecoins - anything containing USD or EUR
-    if 'USD' in symbol_upper or 'EUR' in symbol_upper or 'DAI' in symbol_upper:
-        return 'Stablecoins'
-    
-    # All other assets
-    return 'Other Assets'
-
-# Add asset type classification
-asset_breakdown_df['asset_type'] = asset_breakdown_df['symbol'].apply(classify_asset)
-
-# Sort by chain and TVL
-asset_breakdown_df = asset_breakdown_df.sort_values(['chain', 'total_tvl_usd'], ascending=[True, False])
-
-# Save detailed breakdown
-output_file = 'lending_assets_by_chain_detailed.csv'
-asset_breakdown_df.to_csv(output_file, index=False)
-print(f"\n✓ Detailed data saved to {output_file}")
-
-# Create summary by chain
-chain_summary = asset_breakdown_df.groupby('chain').agg({
-    'total_tvl_usd': 'sum',
-    'symbol': 'count',
-    'num_protocols': 'sum'
-}).reset_index()
-chain_summary.columns = ['chain', 'total_tvl', 'num_unique_assets', 'total_protocol_count']
-chain_summary = chain_summary.sort_values('total_tvl', ascending=False)
-
-# Save chain summary
-chain_summary.to_csv('lending_assets_by_chain_summary.csv', index=False)
-print(f"✓ Chain summary saved to lending_assets_by_chain_summary.csv")
-
-# Print summary
-print("\n" + "=" * 80)
-print("Summary: Lending Assets by Chain (EVM only)")
-print("=" * 80)
-print(f"\nTotal EVM chains analyzed: {len(chain_summary)}")
-print(f"Total unique assets: {asset_breakdown_df['symbol'].nunique()}")
-print(f"Total TVL in lending on EVM chains: ${chain_summary['total_tvl'].sum():,.2f}")
-
-print("\n📊 Top 20 Chains by Total Lending TVL:")
-print("-" * 100)
-print(f"{'Chain':<20} {'Total TVL':>20} {'# Assets':>12} {'# Protocols':>15}")
-print("-" * 100)
-top_20_chains = chain_summary.head(20)
-for idx, row in top_20_chains.iterrows():
-    print(f"{row['chain']:<20} ${row['total_tvl']:>18,.2f} {row['num_unique_assets']:>11} {row['total_protocol_count']:>14}")
-
-# Print top assets across all EVM chains
-print("\n" + "=" * 80)
-print("Top 30 Supplied Assets Across All EVM Chains (Aggregated)")
-print("=" * 80)
-print("-" * 100)
-print(f"{'Asset':<15} {'Total TVL':>20} {'# Chains':>12} {'# Protocols':>15}")
-print("-" * 100)
-
-asset_totals = asset_breakdown_df.groupby('symbol').agg({
-    'total_tvl_usd': 'sum',
-    'chain': 'nunique',
-    'num_protocols': 'sum'
-}).reset_index()
-asset_totals.columns = ['symbol', 'total_tvl', 'num_chains', 'total_protocols']
-asset_totals = asset_totals.sort_values('total_tvl', ascending=False)
-
-# Save asset totals
-asset_totals.to_csv('lending_assets_total_across_chains.csv', index=False)
-print(f"✓ Asset totals saved to lending_assets_total_across_chains.csv")
-
-print()
-top_30_assets = asset_totals.head(30)
-for idx, row in top_30_assets.iterrows():
-    print(f"{row['symbol']:<15} ${row['total_tvl']:>18,.2f} {row['num_chains']:>11} {row['total_protocols']:>14}")
-
-# Create asset type summary
-print("\n" + "=" * 80)
-print("Asset Type Summary (Aggregated Across All Chains)")
-print("=" * 80)
-
-asset_type_summary = asset_breakdown_df.groupby('asset_type').agg({
-    'total_tvl_usd': 'sum',
-    'symbol': 'nunique',
-    'chain': 'nunique'
-}).reset_index()
-asset_type_summary.columns = ['asset_type', 'total_tvl', 'num_unique_assets', 'num_chains']
-asset_type_summary = asset_type_summary.sort_values('total_tvl', ascending=False)
-
-print(f"\n{'Asset Type':<20} {'Total TVL':>20} {'# Unique Assets':>18} {'# Chains':>12}")
-print("-" * 80)
-for idx, row in asset_type_summary.iterrows():
-    print(f"{row['asset_type']:<20} ${row['total_tvl']:>18,.2f} {row['num_unique_assets']:>17} {row['num_chains']:>11}")
-
-# Save asset type summary
-asset_type_summary.to_csv('lending_assets_by_type_summary.csv', index=False)
-print(f"\n✓ Asset type summary saved to lending_assets_by_type_summary.csv")
-
-# Create detailed breakdown by asset type and chain
-print("\n" + "=" * 80)
-print("Asset Type Breakdown by Chain")
-print("=" * 80)
-
-asset_type_by_chain = asset_breakdown_df.groupby(['chain', 'asset_type']).agg({
-    'total_tvl_usd': 'sum',
-    'symbol': 'nunique'
-}).reset_index()
-asset_type_by_chain.columns = ['chain', 'asset_type', 'total_tvl', 'num_assets']
-asset_type_by_chain = asset_type_by_chain.sort_values(['chain', 'total_tvl'], ascending=[True, False])
-
-# Save asset type by chain
-asset_type_by_chain.to_csv('lending_assets_by_type_and_chain.csv', index=False)
-print(f"✓ Asset type by chain saved to lending_assets_by_type_and_chain.csv")
-
-# Print top chains for each asset type
-for asset_type in ['BTC Tokens', 'ETH LSTs', 'ETH', 'Stablecoins', 'Other Assets']:
-    print(f"\n{asset_type} - Top 10 Chains:")
-    print("-" * 80)
-    type_data = asset_type_by_chain[asset_type_by_chain['asset_type'] == asset_type]
-    type_data_sorted = type_data.sort_values('total_tvl', ascending=False).head(10)
-    
-    if len(type_data_sorted) > 0:
-        print(f"{'Chain':<20} {'Total TVL':>20} {'# Assets':>12}")
-        print("-" * 80)
-        for idx, row in type_data_sorted.iterrows():
-            print(f"{row['chain']:<20} ${row['total_tvl']:>18,.2f} {row['num_assets']:>11}")
+
+    # Filter for EVM chains
+    print("\n⛓️  Filtering for EVM chains...")
+    evm_lending_pools = lending_pools[lending_pools['chain'].isin(evm_chains)].copy()
+    print(f"Total lending pools on EVM chains: {len(evm_lending_pools)}")
+
+    # Check if we have the necessary columns
+    print("\n🔍 Checking available data fields...")
+    sample_pool = evm_lending_pools.iloc[0] if len(evm_lending_pools) > 0 else None
+    if sample_pool is not None:
+        print("\nSample pool data:")
+        print(f"  Project: {sample_pool.get('project', 'N/A')}")
+        print(f"  Symbol: {sample_pool.get('symbol', 'N/A')}")
+        print(f"  Chain: {sample_pool.get('chain', 'N/A')}")
+        print(f"  TVL: ${sample_pool.get('tvlUsd', 0):,.2f}")
+        print(f"  Available keys: {list(sample_pool.keys())}")
+
+    # Group by chain and asset symbol
+    section('aggregate by chain and asset')
+    print("\n📈 Aggregating TVL by chain and asset...")
+
+    # One groupby over (chain, symbol), keeping first-appearance order like the pools feed
+    pair_keys = ['chain', 'symbol']
+    pair_groups = evm_lending_pools.groupby(pair_keys, sort=False, observed=True)
+    asset_breakdown_df = pair_groups['tvlUsd'].sum().rename('total_tvl_usd').reset_index()
+
+    # Unique protocols per asset in order of appearance
+    pair_protocols = evm_lending_pools.drop_duplicates(pair_keys + ['project']).groupby(pair_keys, sort=False, observed=True)['project']
+    asset_breakdown_df['num_protocols'] = pair_protocols.size().to_numpy()
+    asset_breakdown_df['protocols'] = pair_protocols.agg(', '.join).to_numpy()
+
+    # Underlying tokens of the first pool of each asset
+    if 'underlyingTokens' in evm_lending_pools.columns:
+        first_pools = evm_lending_pools.drop_duplicates(pair_keys).set_index(pair_keys)['underlyingTokens']
+        asset_breakdown_df['underlyingTokens'] = first_pools.reindex(pd.MultiIndex.from_frame(asset_breakdown_df[pair_keys])).to_numpy()
     else:
-        print("  No data available")
+        asset_breakdown_df['underlyingTokens'] = [[] for _ in range(len(asset_breakdown_df))]
+
+    pools_per_chain = evm_lending_pools['chain'].value_counts(sort=False)
+    for chain, chain_assets in asset_breakdown_df.groupby('chain', sort=False, observed=True):
+        print(f"\n  Processing {chain}: {pools_per_chain[chain]} pools")
+        for _, row in chain_assets[chain_assets['total_tvl_usd'] > 1000000].iterrows():  # Only print assets with > $1M TVL
+            print(f"    {row['symbol']}: ${row['total_tvl_usd']:,.2f} across {row['num_protocols']} protocols")
+
+    # Classify each distinct symbol once via the shared taxonomy (asset_taxonomy.json)
+    section('classify assets')
+    asset_breakdown_df['asset_type'] = get_taxonomy().classify_symbols(asset_breakdown_df['symbol'])
+
+    # Sort by chain and TVL
+    asset_breakdown_df = asset_breakdown_df.sort_values(['chain', 'total_tvl_usd'], ascending=[True, False])
+
+    # Save detailed breakdown
+    section('summaries and CSVs')
+    output_file = 'lending_assets_by_chain_detailed.csv'
+    asset_breakdown_df.to_csv(output_file, index=False)
+    print(f"\n✓ Detailed data saved to {output_file}")
+
+    # Rollups of the (chain, symbol) breakdown. Each pair is one row, so row
+    # counts stand in for nunique and the per-type views are slices of these.
+    chain_summary = asset_breakdown_df.groupby('chain', observed=True).agg(
+        total_tvl=('total_tvl_usd', 'sum'),
+        num_unique_assets=('symbol', 'size'),
+        total_protocol_count=('num_protocols', 'sum'),
+    ).reset_index().sort_values('total_tvl', ascending=False)
+
+    asset_totals = asset_breakdown_df.groupby('symbol', observed=True).agg(
+        total_tvl=('total_tvl_usd', 'sum'),
+        num_chains=('chain', 'size'),
+        total_protocols=('num_protocols', 'sum'),
+        asset_type=('asset_type', 'first'),
+    ).reset_index().sort_values('total_tvl', ascending=False)
+
+    asset_type_by_chain = asset_breakdown_df.groupby(['chain', 'asset_type'], observed=True).agg(
+        total_tvl=('total_tvl_usd', 'sum'),
+        num_assets=('symbol', 'size'),
+    ).reset_index().sort_values(['chain', 'total_tvl'], ascending=[True, False])
+
+    asset_type_summary = asset_type_by_chain.groupby('asset_type').agg(
+        total_tvl=('total_tvl', 'sum'),
+        num_chains=('chain', 'size'),
+    )
+    asset_type_summary.insert(1, 'num_unique_assets', asset_totals.groupby('asset_type').size())
+    asset_type_summary = asset_type_summary.reset_index().sort_values('total_tvl', ascending=False)
+
+    # Save chain summary
+    chain_summary.to_csv('lending_assets_by_chain_summary.csv', index=False)
+    print(f"✓ Chain summary saved to lending_assets_by_chain_summary.csv")
+
+    # Print summary
+    print("\n" + "=" * 80)
+    print("Summary: Lending Assets by Chain (EVM only)")
+    print("=" * 80)
+    print(f"\nTotal EVM chains analyzed: {len(chain_summary)}")
+    print(f"Total unique assets: {asset_breakdown_df['symbol'].nunique()}")
+    print(f"Total TVL in lending on EVM chains: ${chain_summary['total_tvl'].sum():,.2f}")
+
+    print("\n📊 Top 20 Chains by Total Lending TVL:")
+    print("-" * 100)
+    print(f"{'Chain':<20} {'Total TVL':>20} {'# Assets':>12} {'# Protocols':>15}")
+    print("-" * 100)
+    top_20_chains = chain_summary.head(20)
+    for idx, row in top_20_chains.iterrows():
+        print(f"{row['chain']:<20} ${row['total_tvl']:>18,.2f} {row['num_unique_assets']:>11} {row['total_protocol_count']:>14}")
+
+    # Print top assets across all EVM chains
+    print("\n" + "=" * 80)
+    print("Top 30 Supplied Assets Across All EVM Chains (Aggregated)")
+    print("=" * 80)
+    print("-" * 100)
+    print(f"{'Asset':<15} {'Total TVL':>20} {'# Chains':>12} {'# Protocols':>15}")
+    print("-" * 100)
+
+    # Save asset totals
+    asset_totals.drop(columns='asset_type').to_csv('lending_assets_total_across_chains.csv', index=False)
+    print(f"✓ Asset totals saved to lending_assets_total_across_chains.csv")
+
+    print()
+    top_30_assets = asset_totals.head(30)
+    for idx, row in top_30_assets.iterrows():
+        print(f"{row['symbol']:<15} ${row['total_tvl']:>18,.2f} {row['num_chains']:>11} {row['total_protocols']:>14}")
+
+    # Create asset type summary
+    print("\n" + "=" * 80)
+    print("Asset Type Summary (Aggregated Across All Chains)")
+    print("=" * 80)
+
+    print(f"\n{'Asset Type':<20} {'Total TVL':>20} {'# Unique Assets':>18} {'# Chains':>12}")
+    print("-" * 80)
+    for idx, row in asset_type_summary.iterrows():
+        print(f"{row['asset_type']:<20} ${row['total_tvl']:>18,.2f} {row['num_unique_assets']:>17} {row['num_chains']:>11}")
 
-# Create detailed breakdown for each asset type
-print("\n" + "=" * 80)
-print("Top Assets by Type")
-print("=" * 80)
+    # Save asset type summary
+    asset_type_summary.to_csv('lending_assets_by_type_summary.csv', index=False)
+    print(f"\n✓ Asset type summary saved to lending_assets_by_type_summary.csv")
 
-for asset_type in ['BTC Tokens', 'ETH LSTs', 'ETH', 'Stablecoins', 'Other Assets']:
-    print(f"\n{asset_type} - Top 10 Assets (Aggregated Across All Chains):")
-    print("-" * 80)
-    
-    type_assets = asset_breakdown_df[asset_breakdown_df['asset_type'] == asset_type]
-    type_totals = type_assets.groupby('symbol').agg({
-        'total_tvl_usd': 'sum',
-        'chain': 'nunique',
-        'num_protocols': 'sum'
-    }).reset_index()
-    type_totals.columns = ['symbol', 'total_tvl', 'num_chains', 'total_protocols']
-    type_totals = type_totals.sort_values('total_tvl', ascending=False).head(10)
-    
-    if len(type_totals) > 0:
-        print(f"{'Asset':<15} {'Total TVL':>20} {'# Chains':>12} {'# Protocols':>15}")
+    # Create detailed breakdown by asset type and chain
+    print("\n" + "=" * 80)
+    print("Asset Type Breakdown by Chain")
+    print("=" * 80)
+
+    # Save asset type by chain
+    asset_type_by_chain.to_csv('lending_assets_by_type_and_chain.csv', index=False)
+    print(f"✓ Asset type by chain saved to lending_assets_by_type_and_chain.csv")
+
+    # Print top chains for each asset type
+    for asset_type in ['BTC Tokens', 'ETH LSTs', 'ETH', 'Stablecoins', 'Other Assets']:
+        print(f"\n{asset_type} - Top 10 Chains:")
         print("-" * 80)
-        for idx, row in type_totals.iterrows():
-            print(f"{row['symbol']:<15} ${row['total_tvl']:>18,.2f} {row['num_chains']:>11} {row['total_protocols']:>14}")
-    else:
-        print("  No data available")
-
-print("\n" + "=" * 80)
-print("✅ Analysis Complete!")
-print("=" * 80)
-print("\n📁 Output Files:")
-print("  1. lending_assets_by_chain_detailed.csv - Full breakdown by chain and asset (with asset_type)")
-print("  2. lending_assets_by_chain_summary.csv - Summary by chain")
-print("  3. lending_assets_total_across_chains.csv - Assets aggregated across all chains")
-print("  4. lending_assets_by_type_summary.csv - Summary by asset type (BTC, ETH LSTs, etc.)")
-print("  5. lending_assets_by_type_and_chain.csv - Asset type breakdown by chain")
-print("  6. yield_pools_raw.json - Raw API response for debugging")
-print("\n📊 Asset Types:")
-print("  • BTC Tokens - WBTC, CBBTC, BTCB, LBTC, TBTC, etc.")
-print("  • ETH LSTs - WEETH, WSTETH, RSETH, RETH, EZETH, etc.")
-print("  • ETH - All other ETH variants (WETH, ETH, etc.)")
-print("  • Stablecoins - Assets containing USD or EUR in name")
-print("  • Other Assets - All remaining assets")
+        type_data = asset_type_by_chain[asset_type_by_chain['asset_type'] == asset_type]
+        type_data_sorted = type_data.sort_values('total_tvl', ascending=False).head(10)
+
+        if len(type_data_sorted) > 0:
+            print(f"{'Chain':<20} {'Total TVL':>20} {'# Assets':>12}")
+            print("-" * 80)
+            for idx, row in type_data_sorted.iterrows():
+                print(f"{row['chain']:<20} ${row['total_tvl']:>18,.2f} {row['num_assets']:>11}")
+        else:
+            print("  No data available")
+
+    # Create detailed breakdown for each asset type
+    print("\n" + "=" * 80)
+    print("Top Assets by Type")
+    print("=" * 80)
+
+    for asset_type in ['BTC Tokens', 'ETH LSTs', 'ETH', 'Stablecoins', 'Other Assets']:
+        print(f"\n{asset_type} - Top 10 Assets (Aggregated Across All Chains):")
+        print("-" * 80)
+
+        type_totals = asset_totals[asset_totals['asset_type'] == asset_type].head(10)
+
+        if len(type_totals) > 0:
+            print(f"{'Asset':<15} {'Total TVL':>20} {'# Chains':>12} {'# Protocols':>15}")
+            print("-" * 80)
+            for idx, row in type_totals.iterrows():
+                print(f"{row['symbol']:<15} ${row['total_tvl']:>18,.2f} {row['num_chains']:>11} {row['total_protocols']:>14}")
+        else:
+            print("  No data available")
+
+    print("\n" + "=" * 80)
+    print("✅ Analysis Complete!")
+    print("=" * 80)
+    print("\n📁 Output Files:")
+    print("  1. lending_assets_by_chain_detailed.csv - Full breakdown by chain and asset (with asset_type)")
+    print("  2. lending_assets_by_chain_summary.csv - Summary by chain")
+    print("  3. lending_assets_total_across_chains.csv - Assets aggregated across all chains")
+    print("  4. lending_assets_by_type_summary.csv - Summary by asset type (BTC, ETH LSTs, etc.)")
+    print("  5. lending_assets_by_type_and_chain.csv - Asset type breakdown by chain")
+    print("  6. yield_pools_raw.json - Raw API response for debugging")
+    print("\n📊 Asset Types:")
+    print("  • BTC Tokens - WBTC, CBBTC, BTCB, LBTC, TBTC, etc.")
+    print("  • ETH LSTs - WEETH, WSTETH, RSETH, RETH, EZETH, etc.")
+    print("  • ETH - All other ETH variants (WETH, ETH, etc.)")
+    print("  • Stablecoins - Assets containing USD or EUR in name")
+    print("  • Other Assets - All remaining assets")
+
+    return asset_breakdown_df
+
+
+def main():
+    if run() is None:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""
+Shared HTTP layer for all DeFiLlama API traffic.
+
+Scripts get their requests session from get_session() instead of creating a
+bare requests.Session. The session behaves exactly like before unless a
+fixture mode is selected with environment variables:
+
+    LLAMA_HTTP_MODE       live (default), record, replay or mock
+    LLAMA_FIXTURE_DIR     where fixtures are stored (default: fixtures/http)
+    LLAMA_REPLAY_LATENCY  seconds of latency injected per replayed response
+    LLAMA_MOCK_URL        mock server base URL (default: http://127.0.0.1:8765)
+
+Requests and throttle sleeps are also reported to instrumentation.py when run
+timing is enabled (LLAMA_TIMING=1).
+
+Concurrent fetchers run on fetch_concurrent() with thread_session() per worker
+and share one RateLimiter instead of sleeping after every request; they send
+through get_with_retry()/post_with_retry(), which back off on HTTP 429.
+
+record  - performs live requests and saves every response, gzip-compressed,
+          keyed by method, URL (including the query string) and request body
+replay  - serves recorded responses without touching the network
+mock    - sends requests to a local mock server that serves the same fixtures
+
+Start the mock server with:
+
+    python src/llama_http.py serve --port 8765 --latency 0.05
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import requests
+import urllib3
+from requests.structures import CaseInsensitiveDict
+
+import instrumentation
+
+urllib3.disable_warnings()
+
+MODES = ('live', 'record', 'replay', 'mock')
+DEFAULT_FIXTURE_DIR = os.path.join('fixtures', 'http')
+DEFAULT_MOCK_URL = 'http://127.0.0.1:8765'
+
+
+class FixtureNotFoundError(requests.exceptions.ConnectionError):
+    """Raised in replay mode when a request was never recorded"""
+
+
+def http_mode():
+    """Return the configured HTTP mode"""
+    mode = os.environ.get('LLAMA_HTTP_MODE', 'live').lower()
+    if mode not in MODES:
+        raise ValueError(f"LLAMA_HTTP_MODE must be one of {', '.join(MODES)}, got '{mode}'")
+    return mode
+
+
+def is_offline():
+    """True when responses come from fixtures rather than the live APIs"""
+    return http_mode() in ('replay', 'mock')
+
+
+def fixture_dir():
+    """Return the configured fixture directory"""
+    return os.environ.get('LLAMA_FIXTURE_DIR', DEFAULT_FIXTURE_DIR)
+
+
+def throttle(seconds):
+    """Rate-limit sleep between API calls, skipped when serving fixtures"""
+    if not is_offline():
+        time.sleep(seconds)
+        instrumentation.record('throttle', seconds)
+
+
+def canonical_request(method, url, params=None, data=None, json_body=None):
+    """Return (method, full URL, body bytes) used to key a request"""
+    if json_body is not None:
+        body = json.dumps(json_body, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        prepared = requests.Request(method, url, params=params).prepare()
+    else:
+        prepared = requests.Request(method, url, params=params, data=data).prepare()
+        body = prepared.body or b''
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+    return method.upper(), prepared.url, body
+
+
+def fixture_key(method, url, body=b''):
+    """Stable hash of method, URL and body"""
+    digest = hashlib.sha1()
+    digest.update(method.upper().encode('utf-8'))
+    digest.update(b' ')
+    digest.update(url.encode('utf-8'))
+    digest.update(b'\n')
+    digest.update(body or b'')
+    return digest.hexdigest()
+
+
+def fixture_path(method, url, body=b'', directory=None):
+    """Path of the fixture file for a request, grouped by host"""
+    host = urlsplit(url).netloc or 'unknown'
+    return os.path.join(directory or fixture_dir(), host, fixture_key(method, url, body) + '.http.gz')
+
+
+def save_fixture(method, url, body, status_code, content, content_type='application/json', directory=None):
+    """Write one response as a gzip file: a JSON header line followed by the raw body"""
+    path = fixture_path(method, url, body, directory)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    meta = {
+        'method': method.upper(),
+        'url': url,
+        'status': status_code,
+        'content_type': content_type,
+    }
+    tmp_path = path + '.tmp'
+    with gzip.open(tmp_path, 'wb', compresslevel=6) as f:
+        f.write(json.dumps(meta).encode('utf-8') + b'\n')
+        f.write(content)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_fixture(method, url, body=b'', directory=None):
+    """Return (meta, content) for a recorded request, or None if missing"""
+    path = fixture_path(method, url, body, directory)
+    if not os.path.exists(path):
+        return None
+    with gzip.open(path, 'rb') as f:
+        header = f.readline()
+        content = f.read()
+    return json.loads(header), content
+
+
+def _build_response(meta, content, url):
+    """Turn a fixture into a requests.Response"""
+    response = requests.Response()
+    response.status_code = meta['status']
+    response.reason = 'OK' if meta['status'] == 200 else ''
+    response.headers = CaseInsensitiveDict({'Content-Type': meta.get('content_type', 'application/json')})
+    response._content = content
+    response.encoding = 'utf-8'
+    response.url = url
+    return response
+
+
+class LlamaSession(requests.Session):
+    """requests.Session with record, replay and mock modes"""
+
+    def __init__(self, mode=None, directory=None, latency=None, mock_url=None):
+        super().__init__()
+        self.mode = mode or http_mode()
+        self.fixture_dir = directory or fixture_dir()
+        self.latency = float(latency if latency is not None else os.environ.get('LLAMA_REPLAY_LATENCY', 0))
+        self.mock_url = (mock_url or os.environ.get('LLAMA_MOCK_URL', DEFAULT_MOCK_URL)).rstrip('/')
+
+    def request(self, method, url, params=None, data=None, headers=None, json=None, **kwargs):
+        if not instrumentation.enabled():
+            return self._dispatch(method, url, params, data, headers, json, **kwargs)
+        start = time.perf_counter()
+        try:
+            response = self._dispatch(method, url, params, data, headers, json, **kwargs)
+        except Exception:
+            instrumentation.record_http(method.upper(), url, 'error', 0, time.perf_counter() - start, self.mode)
+            raise
+        row = instrumentation.record_http(method.upper(), response.url or url, response.status_code,
+                                          len(response.content), time.perf_counter() - start, self.mode)
+        return instrumentation.instrument_response(response, row)
+
+    def _dispatch(self, method, url, params=None, data=None, headers=None, json=None, **kwargs):
+        if self.mode == 'live':
+            return super().request(method, url, params=params, data=data, headers=headers, json=json, **kwargs)
+
+        method, full_url, body = canonical_request(method, url, params, data, json)
+
+        if self.mode == 'record':
+            response = super().request(method, url, params=params, data=data, headers=headers, json=json, **kwargs)
+            save_fixture(method, full_url, body, response.status_code, response.content,
+                         response.headers.get('Content-Type', 'application/json'), self.fixture_dir)
+            return response
+
+        if self.mode == 'mock':
+            parts = urlsplit(full_url)
+            mock_target = f"{self.mock_url}/{parts.netloc}{parts.path}"
+            if parts.query:
+                mock_target += f"?{parts.query}"
+            return super().request(method, mock_target, data=body or None, headers=headers, **kwargs)
+
+        fixture = load_fixture(method, full_url, body, self.fixture_dir)
+        if fixture is None:
+            raise FixtureNotFoundError(f"No recorded fixture for {method} {full_url}")
+        if self.latency:
+            time.sleep(self.latency)
+        meta, content = fixture
+        return _build_response(meta, content, full_url)
+
+
+def get_session():
+    """Create the shared session (SSL verification disabled, as in every script)"""
+    session = LlamaSession()
+    session.verify = False
+    return session
+
+
+_thread_sessions = threading.local()
+
+
+def thread_session():
+    """get_session() cached per thread, for worker pools that share nothing else"""
+    session = getattr(_thread_sessions, 'session', None)
+    if session is None:
+        session = _thread_sessions.session = get_session()
+    return session
+
+
+class RateLimiter:
+    """Spaces requests from any number of threads at least min_interval apart.
+
+    Replaces per-request throttle() sleeps for concurrent fetchers, so N
+    workers share one request rate instead of each sleeping on its own.
+    Skipped when serving fixtures, like throttle().
+    """
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        if not self.min_interval or is_offline():
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+            instrumentation.record('throttle', start - now)
+
+
+def request_with_retry(method, url, limiter=None, retries=3, backoff=2.0, session=None, **kwargs):
+    """Request through the rate limiter, backing off and retrying on HTTP 429"""
+    session = session or thread_session()
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            limiter.wait()
+        response = session.request(method, url, **kwargs)
+        if response.status_code != 429 or attempt == retries:
+            return response
+        throttle(backoff * 2 ** attempt)
+    return response
+
+
+def get_with_retry(url, limiter=None, retries=3, backoff=2.0, session=None, **kwargs):
+    return request_with_retry('GET', url, limiter, retries, backoff, session, **kwargs)
+
+
+def post_with_retry(url, limiter=None, retries=3, backoff=2.0, session=None, **kwargs):
+    return request_with_retry('POST', url, limiter, retries, backoff, session, **kwargs)
+
+
+def fetch_concurrent(items, fetch, workers=8):
+    """Call fetch(item) on a bounded thread pool; yields (item, result, error) as each finishes"""
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(fetch, item): item for item in items}
+        for future in as_completed(futures):
+            error = future.exception()
+            yield futures[future], (None if error else future.result()), error
+
+
+def make_mock_handler(directory, latency=0.0):
+    """Build a request handler class serving fixtures from directory"""
+
+    class MockLlamaHandler(BaseHTTPRequestHandler):
+        def _serve(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length) if length else b''
+            # Request path is /<original host>/<original path>?<query>
+            original_url = 'https://' + self.path.lstrip('/')
+            fixture = load_fixture(self.command, original_url, body, directory)
+            if latency:
+                time.sleep(latency)
+            if fixture is None:
+                payload = json.dumps({'error': f"No recorded fixture for {self.command} {original_url}"}).encode('utf-8')
+                self.send_response(404)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                return
+            meta, content = fixture
+            self.send_response(meta['status'])
+            self.send_header('Content-Type', meta.get('content_type', 'application/json'))
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        do_GET = _serve
+        do_POST = _serve
+
+        def log_message(self, format, *args):
+            pass
+
+    return MockLlamaHandler
+
+
+def serve(directory=None, host='127.0.0.1', port=8765, latency=0.0):
+    """Run the mock server until interrupted"""
+    directory = directory or fixture_dir()
+    server = ThreadingHTTPServer((host, port), make_mock_handler(directory, latency))
+    print(f"🧪 Serving fixtures from {directory} on http://{host}:{port} (latency {latency}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def fixture_summary(directory=None):
+    """Count recorded fixtures and compressed bytes per host"""
+    directory = directory or fixture_dir()
+    summary = {}
+    if not os.path.isdir(directory):
+        return summary
+    for host in sorted(os.listdir(directory)):
+        host_dir = os.path.join(directory, host)
+        if not os.path.isdir(host_dir):
+            continue
+        files = [f for f in os.listdir(host_dir) if f.endswith('.http.gz')]
+        size = sum(os.path.getsize(os.path.join(host_dir, f)) for f in files)
+        summary[host] = {'fixtures': len(files), 'bytes': size}
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='DeFiLlama HTTP fixture tools')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help='Serve recorded fixtures over HTTP')
+    serve_parser.add_argument('--fixtures', default=None, help='Fixture directory')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8765)
+    serve_parser.add_argument('--latency', type=float, default=0.0, help='Seconds of latency per response')
+
+    list_parser = subparsers.add_parser('list', help='Summarize recorded fixtures')
+    list_parser.add_argument('--fixtures', default=None, help='Fixture directory')
+
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        serve(args.fixtures, args.host, args.port, args.latency)
+    elif args.command == 'list':
+        summary = fixture_summary(args.fixtures)
+        if not summary:
+            print("No fixtures recorded")
+        for host, stats in summary.items():
+            print(f"{host:<30} {stats['fixtures']:>6} fixtures {stats['bytes'] / 1e6:>10.2f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+"""
+Memory Profiling Hooks
+Opt-in memory snapshots at stage boundaries. instrumentation.py calls enter()
+and exit() around every section()/stage(), so the same markers used for run
+timing attribute memory to pipeline stages.
+
+    LLAMA_MEMORY=rss                RSS at each boundary and per-stage peak RSS
+    LLAMA_MEMORY=trace              also tracemalloc: traced peak and the top
+                                    retained allocation sites per stage (slow)
+    LLAMA_MEMORY_BUDGETS            JSON file of stage pattern -> peak RSS budget in MB
+                                    (default: memory_budgets.json in the working directory, if present)
+    LLAMA_MEMORY_BUDGET_ACTION      warn (default) or fail
+
+Budget patterns are fnmatch patterns over the stage path joined with ';', for
+example "*;stablecoin records" or "*stablecoin_analysis;8. *".
+
+Per-stage peaks come from VmHWM, which is reset at every stage start
+(/proc/self/clear_refs) so nested stages each get their own peak. Where that is
+unavailable the process-wide high-water mark is used instead.
+"""
+
+import fnmatch
+import json
+import os
+import resource
+import sys
+import tracemalloc
+
+DEFAULT_BUDGET_FILE = 'memory_budgets.json'
+TOP_ALLOCATIONS = 5
+MIN_ALLOCATION_BYTES = 100_000
+
+MEMORY_FIELDS = ['stage', 'rss_start_mb', 'rss_end_mb', 'rss_delta_mb', 'peak_rss_mb',
+                 'traced_peak_mb', 'budget_mb', 'over_budget', 'top_allocations']
+
+
+class MemoryBudgetExceeded(RuntimeError):
+    """Raised at the end of a stage whose peak RSS exceeded its budget in fail mode"""
+
+
+def memory_mode():
+    """Return None, 'rss' or 'trace' from LLAMA_MEMORY"""
+    value = os.environ.get('LLAMA_MEMORY', '').lower()
+    if value in ('', '0', 'off', 'false', 'no'):
+        return None
+    if value == 'trace':
+        return 'trace'
+    return 'rss'
+
+
+def read_rss():
+    """Return (current RSS, high-water mark) in MB"""
+    rss = hwm = None
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    rss = int(line.split()[1]) / 1024
+                elif line.startswith('VmHWM:'):
+                    hwm = int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if hwm is None:
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        hwm = maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+    return (rss if rss is not None else hwm), hwm
+
+
+def reset_peak_rss():
+    """Reset VmHWM to the current RSS; False where the kernel does not allow it"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def load_budgets(path=None):
+    """Load {pattern: MB} budgets from JSON"""
+    path = path or os.environ.get('LLAMA_MEMORY_BUDGETS') or DEFAULT_BUDGET_FILE
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        budgets = json.load(f)
+    return {pattern: float(mb) for pattern, mb in budgets.items() if not pattern.startswith('_')}
+
+
+class MemoryProfiler:
+    """Tracks RSS (and optionally tracemalloc) between stage boundaries"""
+
+    def __init__(self, mode='rss', budgets=None, action=None):
+        self.mode = mode
+        self.budgets = budgets if budgets is not None else load_budgets()
+        self.action = (action or os.environ.get('LLAMA_MEMORY_BUDGET_ACTION', 'warn')).lower()
+        self.frames = []
+        self.records = []
+        self.violations = []
+        self.can_reset = reset_peak_rss()
+        if mode == 'trace' and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def enter(self, path):
+        rss, hwm = read_rss()
+        if self.frames:
+            # Fold the parent's peak so far into it before resetting the counter
+            self.frames[-1]['peak'] = max(self.frames[-1]['peak'], hwm)
+        frame = {'path': path, 'rss_start': rss, 'peak': rss}
+        if self.can_reset:
+            reset_peak_rss()
+        else:
+            frame['peak'] = hwm
+        if self.mode == 'trace':
+            current, traced_peak = tracemalloc.get_traced_memory()
+            if self.frames:
+                self.frames[-1]['traced_peak'] = max(self.frames[-1].get('traced_peak', 0), traced_peak)
+            tracemalloc.reset_peak()
+            frame['traced_peak'] = current
+            frame['snapshot'] = tracemalloc.take_snapshot()
+        self.frames.append(frame)
+
+    def exit(self, path):
+        if not self.frames or self.frames[-1]['path'] != path:
+            return None
+        frame = self.frames.pop()
+        rss, hwm = read_rss()
+        peak = max(frame['peak'], hwm)
+        record = {
+            'stage': ';'.join(path),
+            'rss_start_mb': round(frame['rss_start'], 1),
+            'rss_end_mb': round(rss, 1),
+            'rss_delta_mb': round(rss - frame['rss_start'], 1),
+            'peak_rss_mb': round(peak, 1),
+            'traced_peak_mb': None,
+            'budget_mb': None,
+            'over_budget': False,
+            'top_allocations': '',
+        }
+        if self.mode == 'trace':
+            traced_peak = max(frame['traced_peak'], tracemalloc.get_traced_memory()[1])
+            record['traced_peak_mb'] = round(traced_peak / 1e6, 1)
+            record['top_allocations'] = self._top_allocations(frame['snapshot'])
+            if self.frames:
+                self.frames[-1]['traced_peak'] = max(self.frames[-1].get('traced_peak', 0), traced_peak)
+        if self.frames:
+            self.frames[-1]['peak'] = max(self.frames[-1]['peak'], peak)
+
+        self._check_budget(record)
+        self.records.append(record)
+        if record['over_budget'] and self.action == 'fail':
+            raise MemoryBudgetExceeded(
+                f"{' > '.join(path)} peaked at {record['peak_rss_mb']:.0f} MB "
+                f"(budget {record['budget_mb']:.0f} MB)")
+        return record
+
+    def _top_allocations(self, before):
+        after = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, os.path.join(os.path.dirname(__file__), 'instrumentation.py')),
+        ])
+        stats = after.compare_to(before, 'lineno')
+        top = [s for s in stats if s.size_diff >= MIN_ALLOCATION_BYTES][:TOP_ALLOCATIONS]
+        return ' | '.join(
+            f"{os.path.basename(s.traceback[0].filename)}:{s.traceback[0].lineno} {s.size_diff / 1e6:+.1f} MB"
+            for s in top
+        )
+
+    def _check_budget(self, record):
+        matches = [mb for pattern, mb in self.budgets.items() if fnmatch.fnmatchcase(record['stage'], pattern)]
+        if not matches:
+            return
+        budget = min(matches)
+        record['budget_mb'] = budget
+        if record['peak_rss_mb'] > budget:
+            record['over_budget'] = True
+            self.violations.append(record)
+            print(f"⚠️  Memory budget exceeded: {record['stage'].replace(';', ' > ')} peaked at "
+                  f"{record['peak_rss_mb']:.0f} MB (budget {budget:.0f} MB)", file=sys.stderr)
+
+
+def print_memory_summary(records):
+    if not records:
+        return
+    print("\nPeak RSS by stage:")
+    for record in sorted(records, key=lambda r: -r['peak_rss_mb'])[:10]:
+        flag = ' ❌ over budget' if record['over_budget'] else ''
+        budget = f" / {record['budget_mb']:.0f}" if record['budget_mb'] else ''
+        print(f"  {record['peak_rss_mb']:>8.0f}{budget} MB  {record['rss_delta_mb']:>+8.0f} MB retained  "
+              f"{' > '.join(record['stage'].split(';')[-3:])}{flag}")
+        if record['top_allocations']:
+            print(f"            {record['top_allocations'][:140]}")
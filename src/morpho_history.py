@@ -0,0 +1,150 @@
+"""
+Morpho Market History
+Keeps every fetched Morpho market state in one table instead of a single
+current snapshot, so market sizes and shares can be followed over time
+without refetching or keeping dated copies of morpho_plume_markets.csv:
+
+    history = MorphoMarketHistory.load()
+    history.append(markets_frame(markets))    # returns the number of new states
+    history.save()
+    history.asset_series('supply_usd', by='collateral_asset', start='2026-01-01')
+
+Rows are keyed by (chain_id, market_id, timestamp), timestamp being the
+market state's own timestamp from the API in UTC (the fetch time when it
+has none). append() skips states already stored under the same key and
+states whose values equal the market's latest stored state, so re-running
+a fetch only adds what changed.
+
+asset_series() takes each market's latest state as of every period of a
+date grid (one pivot and forward fill over all markets) and sums the markets
+per asset, for any window and frequency.
+
+The table is stored as Parquet when pyarrow is installed, CSV otherwise.
+src/morpho_markets.py and rwa_lending/fetch_morpho_plume_markets.py append
+to it on every fetch.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from protocol_tvls import has_parquet
+
+HISTORY_BASENAME = 'morpho_market_history'
+KEY_COLUMNS = ['chain_id', 'market_id', 'timestamp']
+ASSET_COLUMNS = ['collateral_asset', 'loan_asset']
+STATE_COLUMNS = ['supply_usd', 'borrow_usd', 'collateral_usd', 'liquidity_usd',
+                 'supply_apy', 'borrow_apy', 'utilization']
+COLUMNS = KEY_COLUMNS + ASSET_COLUMNS + STATE_COLUMNS
+
+
+def now_utc():
+    """Current time as a naive UTC timestamp, like the state timestamps"""
+    return pd.Timestamp.now(tz='UTC').tz_localize(None).floor('s')
+
+
+def market_states(markets_df, fetched_at=None):
+    """History rows for a markets table (morpho_markets.markets_frame)"""
+    if markets_df.empty:
+        return pd.DataFrame(columns=COLUMNS)
+    fetched_at = pd.Timestamp(fetched_at) if fetched_at is not None else now_utc()
+    states = markets_df.reindex(columns=COLUMNS).copy()
+    states['timestamp'] = pd.to_datetime(markets_df['last_updated']).fillna(fetched_at)
+    states[STATE_COLUMNS] = states[STATE_COLUMNS].apply(pd.to_numeric, errors='coerce')
+    return states
+
+
+def _same_values(a, b):
+    """Row-wise equality of two aligned state frames, NaN equal to NaN"""
+    a, b = a.to_numpy(dtype=float), b.to_numpy(dtype=float)
+    return ((a == b) | (np.isnan(a) & np.isnan(b))).all(axis=1)
+
+
+class MorphoMarketHistory:
+    """Append-only Morpho market states keyed by (chain_id, market_id, timestamp)"""
+
+    def __init__(self, states=None):
+        self.states = states if states is not None else pd.DataFrame(columns=COLUMNS)
+
+    @classmethod
+    def load(cls, directory='.'):
+        """The stored history, or an empty one if none was written yet"""
+        parquet_path = os.path.join(directory, f"{HISTORY_BASENAME}.parquet")
+        csv_path = os.path.join(directory, f"{HISTORY_BASENAME}.csv")
+        if os.path.exists(parquet_path) and has_parquet():
+            return cls(pd.read_parquet(parquet_path))
+        if os.path.exists(csv_path):
+            return cls(pd.read_csv(csv_path, parse_dates=['timestamp'], dtype={'market_id': str}))
+        return cls()
+
+    def save(self, directory='.'):
+        """Write the table atomically as Parquet (or CSV without pyarrow); returns the path"""
+        if has_parquet():
+            path = os.path.join(directory, f"{HISTORY_BASENAME}.parquet")
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            self.states.to_parquet(tmp_path, index=False)
+        else:
+            path = os.path.join(directory, f"{HISTORY_BASENAME}.csv")
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            self.states.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        return path
+
+    def append(self, markets_df, fetched_at=None):
+        """Add the new and changed states of a markets table; returns how many were added"""
+        new = market_states(markets_df, fetched_at)
+        new = new.drop_duplicates(KEY_COLUMNS, keep='last')
+        if not self.states.empty:
+            stored = pd.MultiIndex.from_frame(self.states[KEY_COLUMNS])
+            new = new[~pd.MultiIndex.from_frame(new[KEY_COLUMNS]).isin(stored)]
+
+            # Drop states equal to the market's latest stored one
+            latest = self.latest().set_index(['chain_id', 'market_id'])
+            previous = latest.reindex(pd.MultiIndex.from_frame(new[['chain_id', 'market_id']]))
+            known = previous['timestamp'].notna().to_numpy()
+            unchanged = known & _same_values(new[STATE_COLUMNS], previous[STATE_COLUMNS])
+            new = new[~unchanged]
+
+        if new.empty:
+            return 0
+        states = new if self.states.empty else pd.concat([self.states, new], ignore_index=True)
+        self.states = states.sort_values(KEY_COLUMNS, kind='stable').reset_index(drop=True)
+        return len(new)
+
+    def latest(self, as_of=None):
+        """Latest state of every market, as of a date if given"""
+        states = self.states
+        if as_of is not None:
+            states = states[states['timestamp'] <= pd.Timestamp(as_of)]
+        states = states.sort_values('timestamp', kind='stable')
+        return states.drop_duplicates(['chain_id', 'market_id'], keep='last').reset_index(drop=True)
+
+    def asset_series(self, value='supply_usd', by='collateral_asset', start=None, end=None, freq='D',
+                     chain_ids=None):
+        """value summed per asset over a date grid, one column per asset.
+
+        Each market counts with its latest state as of each period (forward
+        filled between states) under its latest asset label. Markets with no
+        state yet at a period are left out of it.
+        """
+        states = self.states
+        if chain_ids is not None:
+            states = states[states['chain_id'].isin(chain_ids)]
+        if states.empty:
+            return pd.DataFrame()
+        states = states.sort_values('timestamp', kind='stable')
+
+        periods = states['timestamp'].dt.floor(freq)
+        wide = states.pivot_table(index=periods, columns=['chain_id', 'market_id'], values=value,
+                                  aggfunc='last', dropna=False)
+        last = pd.Timestamp(end).floor(freq) if end is not None else wide.index.max()
+        grid = pd.date_range(wide.index.min(), max(last, wide.index.min()), freq=freq)
+        wide = wide.reindex(wide.index.union(grid)).ffill().reindex(grid)
+        if start is not None:
+            wide = wide[wide.index >= pd.Timestamp(start)]
+
+        labels = self.latest().set_index(['chain_id', 'market_id'])[by].reindex(wide.columns)
+        series = wide.T.groupby(labels.to_numpy(), sort=True).sum(min_count=1).T
+        series.index.name = 'date'
+        return series
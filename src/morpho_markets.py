@@ -0,0 +1,312 @@
+"""
+Morpho Markets Fetcher
+Fetches every Morpho market on any number of chains from the Morpho GraphQL
+API (https://api.morpho.org/graphql) into one normalized markets table:
+
+    markets = fetch_markets([1, 8453, 98866])
+    df = markets_frame(markets)
+
+Each chain is paged through with first/skip in PAGE_SIZE pages ordered by
+uniqueKey, so results are never truncated. The first page of every chain is
+requested concurrently and reports the chain's total market count; the
+remaining pages of all chains are then requested concurrently too. All
+requests share one RateLimiter (the API allows 5,000 requests per 5 minutes)
+and go through llama_http, so record/replay fixtures work as for DeFiLlama.
+
+Run directly for a CSV across chains:
+
+    python src/morpho_markets.py 1 8453 98866 --output morpho_markets.csv
+
+Both this and rwa_lending/fetch_morpho_plume_markets.py (the Plume-only
+report) append the fetched states to the market history (morpho_history.py).
+"""
+
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+
+from llama_http import RateLimiter, fetch_concurrent, post_with_retry
+from morpho_history import MorphoMarketHistory
+
+MORPHO_API_URL = "https://api.morpho.org/graphql"
+PLUME_CHAIN_ID = 98866
+PAGE_SIZE = 500
+DEFAULT_WORKERS = 8
+REQUEST_INTERVAL = 0.1  # Shared by all workers: at most 10 requests/second
+
+MARKETS_QUERY = """
+query GetMarkets($chainId: Int!, $first: Int!, $skip: Int!) {
+  markets(
+    where: { chainId_in: [$chainId] }
+    first: $first
+    skip: $skip
+    orderBy: UniqueKey
+    orderDirection: Asc
+  ) {
+    items {
+      uniqueKey
+      lltv
+      oracleAddress
+      irmAddress
+      loanAsset {
+        address
+        symbol
+        name
+        decimals
+      }
+      collateralAsset {
+        address
+        symbol
+        name
+        decimals
+      }
+      state {
+        supplyAssets
+        supplyAssetsUsd
+        borrowAssets
+        borrowAssetsUsd
+        collateralAssets
+        collateralAssetsUsd
+        liquidityAssets
+        liquidityAssetsUsd
+        supplyApy
+        borrowApy
+        utilization
+        fee
+        timestamp
+      }
+      dailyApys {
+        netSupplyApy
+        netBorrowApy
+      }
+    }
+    pageInfo {
+      countTotal
+    }
+  }
+}
+"""
+
+
+class MorphoAPIError(Exception):
+    """Raised when a markets page fails; payload is the parsed response, if any"""
+
+    def __init__(self, message, payload=None):
+        super().__init__(message)
+        self.payload = payload
+
+
+def fetch_page(chain_id, skip, limiter=None, page_size=PAGE_SIZE):
+    """(markets, total market count on the chain) for one page of one chain"""
+    payload = {
+        'query': MARKETS_QUERY,
+        'variables': {'chainId': chain_id, 'first': page_size, 'skip': skip},
+    }
+    response = post_with_retry(MORPHO_API_URL, limiter, json=payload,
+                               headers={'Content-Type': 'application/json'})
+    try:
+        data = response.json()
+    except ValueError:
+        raise MorphoAPIError(f"Failed to parse JSON response (status {response.status_code}): "
+                             f"{response.text[:500]}")
+    if response.status_code != 200:
+        raise MorphoAPIError(f"HTTP Error {response.status_code}: {response.reason}", data)
+    if 'errors' in data:
+        messages = '; '.join(error.get('message', 'Unknown error') for error in data['errors'])
+        raise MorphoAPIError(f"GraphQL API returned errors: {messages}", data)
+
+    markets = (data.get('data') or {}).get('markets') or {}
+    items = markets.get('items') or []
+    count_total = (markets.get('pageInfo') or {}).get('countTotal', len(items))
+    return items, count_total
+
+
+def fetch_markets(chain_ids, page_size=PAGE_SIZE, workers=DEFAULT_WORKERS, interval=REQUEST_INTERVAL):
+    """Every market on the given chains, in chain_ids order then by uniqueKey.
+
+    Each market gets a chainId key. Raises MorphoAPIError (or the request
+    error) if any page fails, rather than returning a partial list.
+    """
+    limiter = RateLimiter(interval)
+    chain_ids = list(dict.fromkeys(chain_ids))
+    pages = {}
+
+    def fetch(task):
+        chain_id, skip = task
+        return fetch_page(chain_id, skip, limiter, page_size)
+
+    def collect(tasks):
+        for task, result, error in fetch_concurrent(tasks, fetch, workers):
+            if error is not None:
+                raise error
+            pages[task] = result
+
+    collect([(chain_id, 0) for chain_id in chain_ids])
+    collect([(chain_id, skip) for chain_id in chain_ids
+             for skip in range(page_size, pages[(chain_id, 0)][1], page_size)])
+
+    markets, seen = [], set()
+    for (chain_id, skip) in sorted(pages, key=lambda task: (chain_ids.index(task[0]), task[1])):
+        for market in pages[(chain_id, skip)][0]:
+            # A market listed between two page requests can shift a neighbour onto both pages
+            key = (chain_id, market.get('uniqueKey'))
+            if key not in seen:
+                seen.add(key)
+                markets.append({**market, 'chainId': chain_id})
+    return markets
+
+
+# Markets table columns: (nested object of the GraphQL item or None, key, default)
+MARKET_FIELDS = {
+    'chain_id': (None, 'chainId', None),
+    'market_id': (None, 'uniqueKey', ''),
+    'collateral_asset': ('collateralAsset', 'symbol', ''),
+    'collateral_address': ('collateralAsset', 'address', ''),
+    'loan_asset': ('loanAsset', 'symbol', ''),
+    'loan_address': ('loanAsset', 'address', ''),
+    'lltv': (None, 'lltv', 0),  # Loan-to-Value ratio, scaled by 1e18
+    'supply_assets': ('state', 'supplyAssets', 0),
+    'supply_usd': ('state', 'supplyAssetsUsd', 0),
+    'borrow_assets': ('state', 'borrowAssets', 0),
+    'borrow_usd': ('state', 'borrowAssetsUsd', 0),
+    'collateral_assets': ('state', 'collateralAssets', 0),
+    'collateral_usd': ('state', 'collateralAssetsUsd', 0),
+    'liquidity_assets': ('state', 'liquidityAssets', 0),
+    'liquidity_usd': ('state', 'liquidityAssetsUsd', 0),
+    'supply_apy': ('state', 'supplyApy', 0),
+    'borrow_apy': ('state', 'borrowApy', 0),
+    'net_supply_apy': ('dailyApys', 'netSupplyApy', 0),
+    'net_borrow_apy': ('dailyApys', 'netBorrowApy', 0),
+    'utilization': ('state', 'utilization', 0),
+    'fee': ('state', 'fee', 0),
+    'oracle_address': (None, 'oracleAddress', ''),
+    'irm_address': (None, 'irmAddress', ''),
+}
+MARKET_COLUMNS = (['chain_id', 'market_id', 'pair'] + list(MARKET_FIELDS)[2:] + ['last_updated'])
+# Token amounts and lltv are uint256 values the API may send as strings; they
+# can exceed float precision (2**53), so they stay exact Python ints
+AMOUNT_COLUMNS = ['lltv', 'supply_assets', 'borrow_assets', 'collateral_assets', 'liquidity_assets']
+# USD values, APYs, utilization and fee
+NUMERIC_COLUMNS = [column for column, (_, _, default) in MARKET_FIELDS.items()
+                   if default == 0 and column not in AMOUNT_COLUMNS]
+
+
+def to_int(value):
+    """Exact int from an int, an integer string or an integral float; anything else becomes NaN"""
+    if isinstance(value, (int, np.integer)) and not isinstance(value, bool):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return np.nan
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return int(value)
+    return np.nan
+
+
+def to_amounts(values):
+    """Object array of exact ints (NaN where unparseable), so the CSV keeps every digit"""
+    amounts = np.empty(len(values), dtype=object)
+    amounts[:] = [to_int(value) for value in values]
+    return amounts
+
+
+def to_float(values):
+    """Float array from numbers or numeric strings; anything unparseable becomes NaN"""
+    try:
+        return np.array(values, dtype=float)
+    except (TypeError, ValueError):
+        return pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').to_numpy(dtype=float)
+
+
+def markets_frame(markets):
+    """The normalized markets table, largest deposits first.
+
+    Flattens the GraphQL items one column at a time from MARKET_FIELDS.
+    Token amounts and lltv become exact ints (AMOUNT_COLUMNS); USD values and
+    rates become float per column (numpy's parser, with pd.to_numeric only for
+    columns holding unparseable values). last_updated is the state timestamp
+    in UTC.
+    """
+    if not markets:
+        return pd.DataFrame()
+    objects = {key: [market.get(key) or {} for market in markets]
+               for key in {key for key, _, _ in MARKET_FIELDS.values() if key is not None}}
+    columns = {}
+    for column, (key, field, default) in MARKET_FIELDS.items():
+        items = markets if key is None else objects[key]
+        values = [item.get(field, default) for item in items]
+        if column in AMOUNT_COLUMNS:
+            columns[column] = to_amounts(values)
+        elif column in NUMERIC_COLUMNS:
+            columns[column] = to_float(values)
+        else:
+            columns[column] = values
+    df = pd.DataFrame(columns)
+
+    collateral_symbols = pd.Series([item.get('symbol', 'Unknown') for item in objects['collateralAsset']], dtype=str)
+    loan_symbols = pd.Series([item.get('symbol', 'Unknown') for item in objects['loanAsset']], dtype=str)
+    df['pair'] = collateral_symbols + '/' + loan_symbols
+    timestamps = pd.to_numeric(pd.Series([item.get('timestamp') for item in objects['state']]), errors='coerce')
+    df['last_updated'] = pd.to_datetime(timestamps.where(timestamps > 0), unit='s')
+
+    return df[MARKET_COLUMNS].sort_values('supply_usd', ascending=False, kind='stable')
+
+
+def asset_variants(asset):
+    """Names an RWA asset may be listed under, most preferred first (nALPHA: NALPHA, ALPHA, nALPHA)"""
+    variants = [asset.upper()]
+    if asset.startswith('n'):
+        variants.append(asset[1:])
+    variants.append(asset)
+    return list(dict.fromkeys(variants))
+
+
+def resolve_aliases(assets, names):
+    """Lookup table {asset: name it is listed under} for the assets found among names"""
+    names = set(names)
+    aliases = {}
+    for asset in assets:
+        found = [variant for variant in asset_variants(asset) if variant in names]
+        if found:
+            aliases[asset] = found[0]
+    return aliases
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fetch Morpho markets on any number of chains')
+    parser.add_argument('chain_ids', nargs='*', type=int, default=[PLUME_CHAIN_ID],
+                        help=f'Chain IDs (default: {PLUME_CHAIN_ID}, Plume)')
+    parser.add_argument('--output', default='morpho_markets.csv', help='CSV to write')
+    parser.add_argument('--raw', default='morpho_markets_raw_response.json', help='Raw market items JSON')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    args = parser.parse_args()
+
+    print(f"\n🔍 Querying Morpho API for markets on chains {', '.join(map(str, args.chain_ids))}...")
+    markets = fetch_markets(args.chain_ids, workers=args.workers)
+    with open(args.raw, 'w') as f:
+        json.dump(markets, f, indent=2)
+
+    df = markets_frame(markets)
+    df.to_csv(args.output, index=False)
+
+    history = MorphoMarketHistory.load()
+    added = history.append(df)
+    history_path = history.save()
+
+    print(f"\n{'Chain ID':>10} {'Markets':>10} {'Supply (USD)':>20} {'Borrowed (USD)':>20}")
+    print("-" * 64)
+    if not df.empty:
+        for chain_id, rows in df.groupby('chain_id', sort=False):
+            print(f"{chain_id:>10} {len(rows):>10} ${rows['supply_usd'].sum():>18,.2f} "
+                  f"${rows['borrow_usd'].sum():>18,.2f}")
+    print(f"\n✅ Saved {len(df):,} markets to {args.output}")
+    print(f"✓ Raw market items saved to {args.raw}")
+    print(f"✓ {added:,} new market states appended to {history_path}")
+
+
+if __name__ == "__main__":
+    main()
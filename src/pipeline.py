@@ -0,0 +1,110 @@
+"""
+Analysis Pipeline
+Runs the import and analysis stages as function calls in one process, so
+stages share loaded data (the stablecoin index, the yield pools snapshot)
+and interpreter and pandas startup is paid once instead of per stage:
+
+    python src/pipeline.py                        # full run: import, then the analyses
+    python src/pipeline.py lending_tvl_by_chain lst_lrt_tvl_by_chain
+    python src                                    # same as pipeline.py (src/__main__.py)
+
+Every stage is a module exposing run() with keyword inputs (defaulting to
+the files of the working directory) that returns its main outputs. Stage
+modules are imported only when their stage runs, and each stage runs under
+instrumentation.stage(), so its section() steps nest under it in run
+reports. The scripts still run on their own (python src/<stage>.py), and
+the command exits non-zero when any stage failed.
+
+The rwa_lending scripts also expose run() but are not stages here: they
+live outside src/, query the Morpho API rather than DeFiLlama and make up
+the separate Plume report (see rwa_lending/README.md).
+"""
+
+import argparse
+import importlib
+import sys
+import traceback
+
+from instrumentation import stage
+
+# Stage name -> (module, function)
+STAGES = {
+    'import': ('defillama_import', 'run'),
+    'stablecoin_analysis': ('stablecoin_analysis', 'run'),
+    'lending_tvl_by_chain': ('lending_tvl_by_chain', 'run'),
+    'new_chains_lending_growth_simple': ('new_chains_lending_growth_simple', 'run'),
+    'lending_assets_by_chain': ('lending_assets_by_chain', 'run'),
+    'lst_lrt_tvl_by_chain': ('lst_lrt_tvl_by_chain', 'run'),
+    'new_chains_lending_growth': ('new_chains_lending_growth', 'run'),
+    'chain_launch_analysis': ('chain_launch_analysis', 'run'),
+    'stablecoin_growth_analysis': ('stablecoin_growth_analysis', 'run'),
+    'plotting_stables': ('plotting_stables', 'run'),
+    'plot_stable_perc_over_time': ('plot_stable_perc_over_time', 'run'),
+    'protocol_tvl_history': ('fetch_protocol_tvl_history', 'run'),
+    'google_sheets_upload': ('google_sheets_upload', 'main'),
+}
+
+# Run by defillama_import.py after every fetch, in this order
+ANALYSIS_STAGES = [
+    'stablecoin_analysis',
+    'lending_tvl_by_chain',
+    'new_chains_lending_growth_simple',
+    'lending_assets_by_chain',
+    'lst_lrt_tvl_by_chain',
+]
+
+
+def stage_function(name):
+    """Import the stage's module and return its entry function"""
+    module_name, function_name = STAGES[name]
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def run_stage(name, **inputs):
+    """Run one stage and return its outputs; errors propagate"""
+    with stage(name):
+        return stage_function(name)(**inputs)
+
+
+def run_stages(names, inputs=None):
+    """Run stages in order; a failed stage is reported and the rest still run.
+
+    inputs maps a stage name to keyword arguments for its run(). Returns
+    {stage name: outputs}, None for stages that raised or returned None
+    (a run() that gives up returns None, see the scripts' main()).
+    """
+    inputs = inputs or {}
+    results = {}
+    for name in names:
+        try:
+            results[name] = run_stage(name, **inputs.get(name, {}))
+        except Exception:
+            print(f"\n❌ Stage {name} failed:")
+            traceback.print_exc()
+            results[name] = None
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run DeFiLlama import and analysis stages in one process')
+    parser.add_argument('stages', nargs='*', help='Stages to run (default: import, which runs the analyses)')
+    parser.add_argument('--list', action='store_true', help='List stages and exit')
+    args = parser.parse_args()
+
+    if args.list:
+        for name, (module_name, function_name) in STAGES.items():
+            print(f"{name:<36} {module_name}.{function_name}()")
+        return
+
+    unknown = [name for name in args.stages if name not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+    results = run_stages(args.stages or ['import'])
+    failed = [name for name, outputs in results.items() if outputs is None]
+    if failed:
+        print(f"\n❌ {len(failed)} stage(s) failed: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
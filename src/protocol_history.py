@@ -0,0 +1,177 @@
+"""
+Protocol History Store
+Fetches /protocol/{slug} once per protocol and keeps the parts the analyses
+use: the total daily TVL series and the daily series of every chainTvls key.
+Histories are fetched concurrently and checkpointed per protocol (see
+checkpoints.py), so every script that needs protocol histories shares one
+fetch per run, and interrupted runs resume where they stopped.
+
+    store = ProtocolHistoryStore()
+    store.populate(protocols)                     # cached or fetched
+    dates, tvl = store.chain_series('aave-v3', 'Base')
+    frame = store.chain_frame({('aave-v3', 'Base'), ...})
+
+Used by fetch_protocol_tvl_history.py and new_chains_lending_growth.py.
+"""
+
+import numpy as np
+import pandas as pd
+
+from checkpoints import CheckpointStore
+from llama_http import RateLimiter, fetch_concurrent, get_with_retry
+
+CHECKPOINT_DIR = 'protocol_history_checkpoints'
+CHECKPOINT_MAX_AGE = 12 * 3600  # Refetch histories older than this
+DEFAULT_WORKERS = 8
+REQUEST_INTERVAL = 0.125  # Shared by all workers: at most 8 requests/second
+
+# Non-series entries inside a chainTvls history dict
+_SERIES_SKIP_KEYS = {'tvl', 'tokensInUsd', 'tokens'}
+
+
+def parse_series(history):
+    """(timestamps, values) lists from any chainTvls history shape the API returns.
+
+    Handles {'tvl': [{date, totalLiquidityUSD}]}, plain lists of
+    {date, totalLiquidityUSD|tvl} points, {'tvl': {timestamp: value}} and
+    {timestamp: value} dicts.
+    """
+    if isinstance(history, dict) and 'tvl' in history:
+        history = history['tvl']
+    if isinstance(history, list):
+        points = [
+            (point['date'], point.get('totalLiquidityUSD', point.get('tvl', 0)))
+            for point in history if isinstance(point, dict) and 'date' in point
+        ]
+    elif isinstance(history, dict):
+        points = [(key, value) for key, value in history.items() if key not in _SERIES_SKIP_KEYS]
+    else:
+        points = []
+
+    timestamps, values = [], []
+    for timestamp, value in points:
+        try:
+            timestamp = int(timestamp)
+            value = float(value or 0)
+        except (ValueError, TypeError):
+            continue
+        timestamps.append(timestamp)
+        values.append(value)
+    return timestamps, values
+
+
+def fetch_history(protocol, limiter):
+    """Fetch one protocol's total and per-chain daily TVL; None if the response has none"""
+    url = f"https://api.llama.fi/protocol/{protocol['slug']}"
+    response = get_with_retry(url, limiter, headers={'User-Agent': 'curl/7.64.1'}, timeout=30)
+    if response.status_code != 200:
+        raise RuntimeError(f"API returned status {response.status_code}")
+    data = response.json()
+    if 'tvl' not in data or not isinstance(data['tvl'], list):
+        return None
+    dates, tvl = parse_series(data['tvl'])
+    chain_tvls = {}
+    for key, history in (data.get('chainTvls') or {}).items():
+        chain_dates, chain_values = parse_series(history)
+        if chain_dates:
+            chain_tvls[key] = {'date': chain_dates, 'tvl': chain_values}
+    return {
+        'name': protocol.get('name', ''),
+        'slug': protocol['slug'],
+        'category': protocol.get('category', ''),
+        'date': dates,
+        'tvl': tvl,
+        'chain_tvls': chain_tvls,
+    }
+
+
+class ProtocolHistoryStore:
+    """Checkpointed /protocol/{slug} histories, loaded into memory by populate()"""
+
+    def __init__(self, directory=CHECKPOINT_DIR, max_age=CHECKPOINT_MAX_AGE):
+        self.checkpoints = CheckpointStore(directory, max_age=max_age)
+        self.histories = {}
+
+    def cached(self, slug):
+        history = self.checkpoints.get(slug)
+        # Checkpoints from before per-chain series were stored are refetched
+        if history is None or 'chain_tvls' not in history:
+            return None
+        return history
+
+    def populate(self, protocols, workers=DEFAULT_WORKERS, fresh=False, interval=REQUEST_INTERVAL):
+        """Load or fetch the history of every protocol; returns the number that failed"""
+        if fresh:
+            self.checkpoints.clear()
+
+        failed = 0
+        to_fetch = []
+        queued = set()
+        for protocol in protocols:
+            slug = protocol.get('slug')
+            if not slug:
+                print(f"⚠️  Skipping {protocol.get('name', '')} - no slug available")
+                failed += 1
+                continue
+            if slug in self.histories:
+                continue
+            history = self.cached(slug)
+            if history is not None:
+                self.histories[slug] = history
+            elif slug not in queued:
+                queued.add(slug)
+                to_fetch.append(protocol)
+
+        print(f"📊 {len(self.histories)} protocol histories restored from {self.checkpoints.directory}/, "
+              f"fetching {len(to_fetch)} with {workers} workers...")
+        print("⏱️  This will take approximately {:.1f} minutes...".format(len(to_fetch) * interval / 60))
+
+        limiter = RateLimiter(interval)
+        results = fetch_concurrent(to_fetch, lambda protocol: fetch_history(protocol, limiter), workers)
+        for i, (protocol, history, error) in enumerate(results, 1):
+            label = f"[{i}/{len(to_fetch)}] {protocol.get('name', '')} ({protocol.get('category', '')})"
+            if error is not None:
+                print(f"{label} ❌ Error: {str(error)}")
+                failed += 1
+            elif history is None:
+                print(f"{label} ⚠️  No TVL history found in response")
+                failed += 1
+            else:
+                # Checkpoint as soon as each protocol finishes
+                self.checkpoints.put(protocol['slug'], history)
+                self.histories[protocol['slug']] = history
+                print(f"{label} ✅ {len(history['date'])} daily records")
+
+            # Progress update every 50 protocols
+            if i % 50 == 0:
+                print(f"\n{'=' * 80}")
+                print(f"Progress: {i}/{len(to_fetch)} protocols fetched")
+                print(f"Loaded: {len(self.histories)} | Failed: {failed}")
+                print(f"{'=' * 80}\n")
+        return failed
+
+    def chain_series(self, slug, chain):
+        """Daily (epoch seconds, TVL) numpy arrays of one protocol on one chain"""
+        series = self.histories.get(slug, {}).get('chain_tvls', {}).get(chain)
+        if series is None:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        return np.asarray(series['date'], dtype=np.int64), np.asarray(series['tvl'], dtype=float)
+
+    def chain_frame(self, pairs):
+        """Long (protocol_slug, chain, date, tvl) frame for the given (slug, chain) pairs"""
+        slugs, chains, dates, values = [], [], [], []
+        for slug, chain in pairs:
+            timestamps, tvl = self.chain_series(slug, chain)
+            if len(timestamps):
+                slugs.append(np.full(len(timestamps), slug, dtype=object))
+                chains.append(np.full(len(timestamps), chain, dtype=object))
+                dates.append(timestamps)
+                values.append(tvl)
+        if not dates:
+            return pd.DataFrame({'protocol_slug': [], 'chain': [], 'date': pd.to_datetime([]), 'tvl': []})
+        return pd.DataFrame({
+            'protocol_slug': np.concatenate(slugs),
+            'chain': np.concatenate(chains),
+            'date': pd.to_datetime(np.concatenate(dates), unit='s'),
+            'tvl': np.concatenate(values),
+        })
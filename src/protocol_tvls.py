@@ -0,0 +1,137 @@
+"""
+Protocol Chain TVL Table
+Normalizes the nested chainTvls dicts of the /protocols feed into a long table
+with one row per protocol, chain and metric:
+
+    protocol, protocol_slug, category, chain, metric, value
+
+metric is 'base' for plain chain keys ('Ethereum') and the lowercased suffix
+for keys like 'Ethereum-borrowed' (borrowed, staking, pool2, ...). Protocol-level
+aggregate keys ('borrowed', 'staking', ...) are dropped since they are sums
+over the per-chain keys.
+
+defillama_import.py writes the table at fetch time, so analyses filter and
+aggregate it directly instead of re-parsing chainTvls strings out of
+tvl_data.csv. It is stored as Parquet when pyarrow is installed, CSV otherwise.
+category_cube.py aggregates it per category, chain and metric.
+"""
+
+import json
+import os
+
+import pandas as pd
+
+TABLE_BASENAME = 'protocol_chain_tvls'
+COLUMNS = ['protocol', 'protocol_slug', 'category', 'chain', 'metric', 'value']
+CATEGORICAL_COLUMNS = ['protocol', 'protocol_slug', 'category', 'chain', 'metric']
+
+# Suffixes DeFiLlama appends to chain keys ('Ethereum-borrowed')
+METRIC_SUFFIXES = {'borrowed', 'staking', 'pool2', 'treasury', 'vesting', 'offers',
+                   'doublecounted', 'liquidstaking', 'dcandlsoverlap'}
+# Protocol-wide totals that are not chains
+AGGREGATE_KEYS = METRIC_SUFFIXES | {'tvl'}
+
+
+def has_parquet():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def classify_chain_keys(keys):
+    """Split a Series of chainTvls keys into chain and metric columns.
+
+    Each distinct key is classified once and the result is broadcast back by
+    position, so the cost scales with the number of distinct keys rather than
+    rows. Protocol-wide totals ('borrowed', 'tvl', ...) get a missing metric.
+    """
+    codes, uniques = pd.factorize(keys)
+    uniques = pd.Series(uniques, dtype=object)
+    parts = uniques.str.rpartition('-')
+    suffix = parts[2].str.lower()
+    has_suffix = parts[1].eq('-') & suffix.isin(METRIC_SUFFIXES)
+    chain = parts[0].where(has_suffix, uniques)
+    metric = suffix.where(has_suffix, 'base').where(~uniques.str.lower().isin(AGGREGATE_KEYS))
+    return pd.DataFrame({
+        'chain': chain.to_numpy()[codes],
+        'metric': metric.to_numpy()[codes],
+    }, index=keys.index)
+
+
+def _tvl_value(value):
+    if isinstance(value, dict):
+        value = value.get('tvl', 0)
+    return float(value) if value else 0.0
+
+
+def normalize_chain_tvls(protocols):
+    """Build the long protocol/chain/metric table from the /protocols JSON list"""
+    owners, keys, values = [], [], []
+    for index, protocol in enumerate(protocols):
+        chain_tvls = protocol.get('chainTvls') or {}
+        if chain_tvls:
+            owners.extend([index] * len(chain_tvls))
+            keys.extend(chain_tvls.keys())
+            values.extend(chain_tvls.values())
+        elif protocol.get('chain') and protocol.get('chain') != 'Multi-Chain':
+            # No breakdown: the whole TVL sits on the protocol's single chain
+            owners.append(index)
+            keys.append(protocol['chain'])
+            values.append(protocol.get('tvl'))
+
+    protocol_fields = pd.DataFrame({
+        'protocol': [protocol.get('name') for protocol in protocols],
+        'protocol_slug': [protocol.get('slug') for protocol in protocols],
+        'category': [protocol.get('category') for protocol in protocols],
+    }, dtype=object)
+    df = protocol_fields.iloc[owners].reset_index(drop=True)
+    df = df.join(classify_chain_keys(pd.Series(keys, dtype=object)))
+    df['value'] = [_tvl_value(value) for value in values]
+    df = df[df['metric'].notna()].reset_index(drop=True)[COLUMNS]
+    for column in CATEGORICAL_COLUMNS:
+        df[column] = df[column].astype('category')
+    return df
+
+
+def save_protocol_chain_tvls(df, directory='.'):
+    """Write the table as Parquet (or CSV without pyarrow); returns the path"""
+    if has_parquet():
+        path = os.path.join(directory, f"{TABLE_BASENAME}.parquet")
+        df.to_parquet(path, index=False)
+    else:
+        path = os.path.join(directory, f"{TABLE_BASENAME}.csv")
+        df.to_csv(path, index=False)
+    return path
+
+
+def load_protocol_chain_tvls(directory='.'):
+    """Load the table written by defillama_import.py.
+
+    Falls back to normalizing tvl_data.json when the table has not been
+    written yet (outputs from before it existed).
+    """
+    parquet_path = os.path.join(directory, f"{TABLE_BASENAME}.parquet")
+    csv_path = os.path.join(directory, f"{TABLE_BASENAME}.csv")
+    json_path = os.path.join(directory, 'tvl_data.json')
+
+    if os.path.exists(parquet_path) and has_parquet():
+        return pd.read_parquet(parquet_path)
+    if os.path.exists(csv_path):
+        df = pd.read_csv(csv_path, dtype={column: 'category' for column in CATEGORICAL_COLUMNS})
+        return df
+    if os.path.exists(json_path):
+        with open(json_path) as f:
+            return normalize_chain_tvls(json.load(f))
+    raise FileNotFoundError(
+        f"{TABLE_BASENAME}.parquet/.csv not found. Please run the main import script first.")
+
+
+def metric_values(df, metric='base', category=None):
+    """Rows of one metric (optionally one category) with positive values"""
+    mask = (df['metric'] == metric) & (df['value'] > 0)
+    if category is not None:
+        mask &= df['category'] == category
+    return df[mask]
+
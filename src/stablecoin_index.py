@@ -0,0 +1,117 @@
+"""
+Stablecoin Market Cap Index
+Per-chain stablecoin totals and per-(chain, symbol) circulating supply at the
+latest date of all_stablecoins_chain_distribution.csv and at anchor dates a
+fixed number of days before it, computed in one groupby and kept as a small
+snapshot next to the distribution data:
+
+    index = load_stablecoin_index()
+    index.chain_totals()                    # chain -> total at the latest date
+    index.chain_totals(30)                  # ... 30 days before the latest date
+    index.symbol_values(7)                  # (chain, stablecoin_symbol) -> circulating
+    index.symbol_values(symbol='USDC')      # chain -> USDC circulating
+
+Values are the same sums as filtering the distribution frame on the anchor
+date and grouping by chain (or chain and symbol); an anchor date missing
+from the data gives empty results, like the filter would.
+
+defillama_import.py writes the snapshot right after the distribution CSV.
+load_stablecoin_index() rebuilds and rewrites it from the CSV when it is
+missing, older than the CSV or lacks a requested anchor.
+"""
+
+import os
+import pickle
+from datetime import timedelta
+
+import pandas as pd
+
+DISTRIBUTION_FILE = 'all_stablecoins_chain_distribution.csv'
+INDEX_FILE = 'stablecoin_mcap_index.pkl'
+ANCHOR_DAYS = (0, 7, 30, 90)
+
+
+class StablecoinMcapIndex:
+    """Chain totals and (chain, symbol) values at the latest date and each anchor"""
+
+    def __init__(self, latest_date, anchor_days, totals, symbols):
+        self.latest_date = latest_date
+        self.anchor_days = tuple(anchor_days)
+        self.totals = totals      # (days_ago, chain) -> circulating
+        self.symbols = symbols    # (days_ago, chain, stablecoin_symbol) -> circulating
+
+    @classmethod
+    def build(cls, df, anchor_days=ANCHOR_DAYS):
+        """Index a distribution frame (date, chain, stablecoin_symbol, circulating)"""
+        anchor_days = tuple(sorted(set(anchor_days) | {0}))
+        dates = pd.to_datetime(df['date'])
+        latest_date = dates.max()
+        days_ago = {latest_date - timedelta(days=days): days for days in anchor_days}
+        at_anchor = dates.isin(list(days_ago))
+        rows = pd.DataFrame({
+            'days_ago': dates[at_anchor].map(days_ago),
+            'chain': df.loc[at_anchor, 'chain'],
+            'stablecoin_symbol': df.loc[at_anchor, 'stablecoin_symbol'],
+            'circulating': df.loc[at_anchor, 'circulating'],
+        })
+        totals = rows.groupby(['days_ago', 'chain'])['circulating'].sum()
+        symbols = rows.groupby(['days_ago', 'chain', 'stablecoin_symbol'])['circulating'].sum()
+        return cls(latest_date, anchor_days, totals, symbols)
+
+    def anchor_date(self, days_ago=0):
+        return self.latest_date - timedelta(days=days_ago)
+
+    def _at(self, series, days_ago):
+        if days_ago not in self.anchor_days:
+            raise KeyError(f"No {days_ago}-day anchor in the index (anchors: {self.anchor_days})")
+        return series[series.index.get_level_values('days_ago') == days_ago].droplevel('days_ago')
+
+    def chain_totals(self, days_ago=0):
+        """Total circulating stablecoins per chain, days_ago days before the latest date"""
+        return self._at(self.totals, days_ago)
+
+    def symbol_values(self, days_ago=0, symbol=None):
+        """Circulating supply per (chain, stablecoin_symbol), or per chain for one symbol"""
+        values = self._at(self.symbols, days_ago)
+        if symbol is None:
+            return values
+        values = values[values.index.get_level_values('stablecoin_symbol') == symbol]
+        return values.droplevel('stablecoin_symbol')
+
+    def save(self, directory='.'):
+        path = os.path.join(directory, INDEX_FILE)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self.__dict__, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, directory='.'):
+        """The saved snapshot, or None if it is missing or unreadable"""
+        try:
+            with open(os.path.join(directory, INDEX_FILE), 'rb') as f:
+                state = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+        index = cls.__new__(cls)
+        index.__dict__.update(state)
+        return index
+
+
+def load_stablecoin_index(directory='.', anchor_days=ANCHOR_DAYS):
+    """The index of the distribution CSV in directory: the snapshot if current, else rebuilt from the CSV.
+
+    Raises FileNotFoundError when neither a current snapshot nor the CSV exists.
+    """
+    index_path = os.path.join(directory, INDEX_FILE)
+    csv_path = os.path.join(directory, DISTRIBUTION_FILE)
+    index = StablecoinMcapIndex.load(directory)
+    if index is not None and set(anchor_days) <= set(index.anchor_days):
+        if not os.path.exists(csv_path) or os.path.getmtime(index_path) >= os.path.getmtime(csv_path):
+            return index
+
+    df = pd.read_csv(csv_path, usecols=['date', 'chain', 'stablecoin_symbol', 'circulating'])
+    index = StablecoinMcapIndex.build(df, anchor_days)
+    index.save(directory)
+    return index
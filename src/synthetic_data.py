@@ -0,0 +1,679 @@
+"""
+Synthetic DeFiLlama Dataset Generator
+Builds realistic API payloads at a configurable scale for scale testing:
+- /v2/chains and /v2/historicalChainTvl/{chain}
+- stablecoins list and per-stablecoin chainBalances
+- /protocols with nested chainTvls (including -borrowed / -staking keys)
+- /protocol/{slug} histories for the largest protocols
+- yields pools, bridge volumes, chain overviews and coin prices
+- Morpho GraphQL market items, as fetched repeatedly (morpho_markets())
+
+Payloads are written into the llama_http fixture store, so every script can run
+against them with LLAMA_HTTP_MODE=replay. The CSVs the analysis scripts read can
+be written directly too, and `curve` measures a script's wall time and peak RSS
+across a range of scales.
+
+Usage:
+    python src/synthetic_data.py generate --scale 2 --out synthetic/2x --csv
+    python src/synthetic_data.py curve src/lending_tvl_by_chain.py --scales 1 2 5 10
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from as_of_snapshots import chain_history_frame, save_chain_tvl_history
+from coin_prices import batch_urls, prices_url
+from llama_http import canonical_request, save_fixture
+from protocol_tvls import normalize_chain_tvls, save_protocol_chain_tvls
+
+# Roughly today's production size at scale 1
+BASE_SIZES = {
+    'chains': 400,
+    'coins': 200,
+    'protocols': 5000,
+    'pools': 15000,
+    'protocol_histories': 300,
+}
+DEFAULT_DAYS = 1500
+DAY_SECONDS = 86400
+
+KNOWN_CHAINS = [
+    'Ethereum', 'Solana', 'Tron', 'BSC', 'Bitcoin', 'Base', 'Arbitrum', 'Hyperliquid L1',
+    'Avalanche', 'Sui', 'Polygon', 'Aptos', 'OP Mainnet', 'Sonic', 'Berachain', 'Mantle',
+    'Linea', 'Plasma', 'Unichain', 'Sei', 'Ink', 'Near', 'TON', 'Celo', 'Stellar', 'Algorand',
+    'Noble', 'Hedera', 'Polkadot', 'ZKsync Era', 'World Chain', 'XRPL', 'Cosmos', 'Kaia',
+    'Scroll', 'Blast', 'Mode', 'Fraxtal', 'Gnosis', 'Cronos', 'Fantom', 'Metis', 'Corn',
+    'Flare', 'Rootstock', 'Conflux', 'X Layer', 'Monad', 'StarkNet', 'Plume Mainnet',
+    'Katana', 'Taiko', 'Manta', 'Zircuit', 'BOB', 'Lisk', 'Gravity', 'opBNB', 'Kava', 'Moonbeam',
+]
+
+KNOWN_STABLECOINS = [
+    ('Tether', 'USDT'), ('USD Coin', 'USDC'), ('Ethena USDe', 'USDe'), ('Dai', 'DAI'),
+    ('USDS', 'USDS'), ('World Liberty Financial USD', 'USD1'), ('PayPal USD', 'PYUSD'),
+    ('First Digital USD', 'FDUSD'), ('Frax', 'FRAX'), ('TrueUSD', 'TUSD'), ('EURC', 'EURC'),
+    ('crvUSD', 'crvUSD'), ('GHO', 'GHO'), ('Resolv USD', 'USR'), ('Falcon USD', 'USDf'),
+]
+
+CATEGORY_WEIGHTS = {
+    'Dexs': 0.24, 'Lending': 0.12, 'Yield': 0.10, 'Liquid Staking': 0.06, 'CDP': 0.05,
+    'Bridge': 0.05, 'Derivatives': 0.08, 'Yield Aggregator': 0.06, 'RWA': 0.04,
+    'Restaking': 0.03, 'Liquid Restaking': 0.03, 'Basis Trading': 0.02, 'Farm': 0.04,
+    'Staking Pool': 0.03, 'Canonical Bridge': 0.02, 'RWA Lending': 0.01, 'Onchain Capital Allocator': 0.02,
+}
+
+POOL_SYMBOLS = [
+    'USDC', 'USDT', 'DAI', 'USDE', 'SUSDE', 'USDS', 'PYUSD', 'FRAX', 'GHO', 'EURC', 'CRVUSD',
+    'WETH', 'ETH', 'WEETH', 'WSTETH', 'STETH', 'RSETH', 'RETH', 'EZETH', 'CBETH', 'WRSETH',
+    'METH', 'OSETH', 'ETHX', 'WBTC', 'CBBTC', 'BTCB', 'LBTC', 'TBTC', 'SOLVBTC', 'FBTC', 'EBTC',
+    'SOL', 'JITOSOL', 'MSOL', 'ARB', 'OP', 'LINK', 'AAVE', 'UNI', 'MKR', 'CRV', 'PENDLE',
+    'USDC-WETH', 'WETH-USDT', 'WBTC-WETH', 'USDC-USDT',
+]
+
+# Morpho collateral symbols, with the n-prefixed RWA names calculate_morpho_share.py resolves
+MORPHO_COLLATERAL = ['nALPHA', 'nBASIS', 'nTBILL', 'ALPHA', 'NINSTO', 'nOPAL', 'WETH', 'pUSD']
+
+
+def day_floor(dt):
+    """Midnight UTC timestamp (seconds) for a datetime"""
+    return int(datetime(dt.year, dt.month, dt.day, tzinfo=timezone.utc).timestamp())
+
+
+def heavy_tail(rng, n, top, exponent):
+    """Descending Zipf-like sizes with some multiplicative noise"""
+    ranks = np.arange(1, n + 1, dtype=float)
+    return top / ranks ** exponent * rng.lognormal(0, 0.25, n)
+
+
+def random_walk(rng, n, end_value, volatility=0.03, drift=0.001):
+    """Positive daily series of length n that ends at end_value"""
+    if n <= 0:
+        return np.empty(0)
+    steps = rng.normal(drift, volatility, n)
+    path = np.exp(np.cumsum(steps))
+    return path / path[-1] * end_value
+
+
+class SyntheticDataset:
+    """Deterministic synthetic DeFiLlama universe at a given size"""
+
+    def __init__(self, chains=None, coins=None, days=DEFAULT_DAYS, protocols=None, pools=None,
+                 protocol_histories=None, seed=42, end_date=None):
+        self.n_chains = chains or BASE_SIZES['chains']
+        self.n_coins = coins or BASE_SIZES['coins']
+        self.n_days = days
+        self.n_protocols = protocols or BASE_SIZES['protocols']
+        self.n_pools = pools or BASE_SIZES['pools']
+        self.n_protocol_histories = BASE_SIZES['protocol_histories'] if protocol_histories is None else protocol_histories
+        self.seed = seed
+        self.end_ts = day_floor(end_date or datetime.now(timezone.utc))
+        self.timestamps = self.end_ts - DAY_SECONDS * np.arange(self.n_days - 1, -1, -1, dtype=np.int64)
+
+        rng = np.random.default_rng(seed)
+        self._build_chains(rng)
+        self._build_stablecoins(rng)
+        self._build_protocols(rng)
+
+    @classmethod
+    def at_scale(cls, scale=1.0, days=DEFAULT_DAYS, seed=42, end_date=None):
+        """Dataset with every breadth dimension multiplied by scale"""
+        sizes = {key: max(1, int(round(value * scale))) for key, value in BASE_SIZES.items()}
+        return cls(days=days, seed=seed, end_date=end_date, **sizes)
+
+    def sizes(self):
+        return {
+            'chains': self.n_chains,
+            'coins': self.n_coins,
+            'days': self.n_days,
+            'protocols': self.n_protocols,
+            'pools': self.n_pools,
+            'protocol_histories': self.n_protocol_histories,
+        }
+
+    # ----- universe -----
+
+    def _build_chains(self, rng):
+        names = KNOWN_CHAINS[:self.n_chains]
+        names += [f"Chain{i:04d}" for i in range(len(names), self.n_chains)]
+        self.chain_names = names
+        self.chain_tvl = heavy_tail(rng, self.n_chains, 7e10, 1.7)
+        # Top chains have full history, the rest launched at random points
+        launch = rng.integers(0, max(self.n_days - 30, 1), self.n_chains)
+        launch[:min(10, self.n_chains)] = 0
+        self.chain_launch = launch
+        self.chain_weights = 1 / np.arange(1, self.n_chains + 1) ** 1.1
+        self.chain_weights /= self.chain_weights.sum()
+
+    def _build_stablecoins(self, rng):
+        names = KNOWN_STABLECOINS[:self.n_coins]
+        names += [(f"Synthetic Dollar {i}", f"SUSD{i}") for i in range(len(names), self.n_coins)]
+        self.coin_names = names
+        self.coin_supply = heavy_tail(rng, self.n_coins, 1.6e11, 1.5)
+        self.coin_start = rng.integers(0, max(self.n_days - 30, 1), self.n_coins)
+        self.coin_start[:min(4, self.n_coins)] = 0
+        self.coin_chains = []
+        for i in range(self.n_coins):
+            n = int(max(1, min(self.n_chains, round(self.n_chains * 0.35 / (i + 1) ** 0.9))))
+            chosen = rng.choice(self.n_chains, size=n, replace=False, p=self.chain_weights)
+            shares = rng.dirichlet(np.full(n, 0.6))
+            self.coin_chains.append((np.sort(chosen), shares))
+
+    def _build_protocols(self, rng):
+        categories = list(CATEGORY_WEIGHTS)
+        weights = np.array(list(CATEGORY_WEIGHTS.values()))
+        self.protocol_category = rng.choice(categories, size=self.n_protocols, p=weights / weights.sum())
+        self.protocol_tvl = heavy_tail(rng, self.n_protocols, 3e10, 1.3)
+        self.protocol_chains = []
+        for i in range(self.n_protocols):
+            n = int(min(self.n_chains, max(1, rng.geometric(0.45))))
+            chosen = rng.choice(self.n_chains, size=n, replace=False, p=self.chain_weights)
+            self.protocol_chains.append((chosen, rng.dirichlet(np.ones(n))))
+        self.protocol_listed = rng.integers(0, max(self.n_days - 7, 1), self.n_protocols)
+        self.protocol_staking = rng.random(self.n_protocols) < 0.1
+
+    # ----- payloads -----
+
+    def chains(self):
+        return [
+            {
+                'gecko_id': f"{name.lower().replace(' ', '-')}-token" if i % 3 != 2 else None,
+                'tvl': float(self.chain_tvl[i]),
+                'tokenSymbol': name[:4].upper() if i % 3 != 2 else None,
+                'cmcId': str(1000 + i) if i % 3 != 2 else None,
+                'name': name,
+                'chainId': i + 1,
+            }
+            for i, name in enumerate(self.chain_names)
+        ]
+
+    def chain_history(self, index):
+        rng = np.random.default_rng((self.seed, 1, index))
+        start = self.chain_launch[index]
+        values = random_walk(rng, self.n_days - start, float(self.chain_tvl[index]))
+        return [{'date': int(ts), 'tvl': float(v)} for ts, v in zip(self.timestamps[start:], values)]
+
+    def stablecoins(self):
+        assets = []
+        for i, (name, symbol) in enumerate(self.coin_names):
+            chain_idx, _ = self.coin_chains[i]
+            assets.append({
+                'id': str(i + 1),
+                'name': name,
+                'symbol': symbol,
+                'gecko_id': name.lower().replace(' ', '-'),
+                'pegType': 'peggedEUR' if symbol == 'EURC' else 'peggedUSD',
+                'pegMechanism': 'fiat-backed',
+                'circulating': {'peggedUSD': float(self.coin_supply[i])},
+                'chains': [self.chain_names[c] for c in chain_idx],
+                'price': 1.0,
+            })
+        return {'peggedAssets': assets}
+
+    def stablecoin_series(self, index):
+        """Yield (chain index, timestamps, values) for one stablecoin"""
+        rng = np.random.default_rng((self.seed, 2, index))
+        chain_idx, shares = self.coin_chains[index]
+        for c, share in zip(chain_idx, shares):
+            start = max(self.coin_start[index], self.chain_launch[c])
+            values = random_walk(rng, self.n_days - start, float(self.coin_supply[index] * share), 0.02, 0.0015)
+            yield c, self.timestamps[start:], values
+
+    def stablecoin_detail(self, index):
+        name, symbol = self.coin_names[index]
+        chain_balances = {}
+        for c, timestamps, values in self.stablecoin_series(index):
+            chain_balances[self.chain_names[c]] = {
+                'tokens': [{'date': int(ts), 'circulating': {'peggedUSD': float(v)}} for ts, v in zip(timestamps, values)]
+            }
+        return {'id': str(index + 1), 'name': name, 'symbol': symbol, 'chainBalances': chain_balances}
+
+    def protocols(self):
+        rng = np.random.default_rng((self.seed, 3))
+        result = []
+        for i in range(self.n_protocols):
+            chain_idx, shares = self.protocol_chains[i]
+            category = str(self.protocol_category[i])
+            tvl = float(self.protocol_tvl[i])
+            chain_tvls = {}
+            borrowed_total = 0.0
+            staking_total = 0.0
+            for c, share in zip(chain_idx, shares):
+                chain = self.chain_names[c]
+                chain_tvls[chain] = tvl * float(share)
+                if category in ('Lending', 'RWA Lending'):
+                    borrowed = chain_tvls[chain] * float(rng.uniform(0.2, 0.75))
+                    chain_tvls[f"{chain}-borrowed"] = borrowed
+                    borrowed_total += borrowed
+                if self.protocol_staking[i]:
+                    staking = chain_tvls[chain] * float(rng.uniform(0.01, 0.2))
+                    chain_tvls[f"{chain}-staking"] = staking
+                    staking_total += staking
+            if borrowed_total:
+                chain_tvls['borrowed'] = borrowed_total
+            if staking_total:
+                chain_tvls['staking'] = staking_total
+            chains = [self.chain_names[c] for c in chain_idx]
+            result.append({
+                'id': str(i + 1),
+                'name': f"Protocol {i}",
+                'slug': f"protocol-{i}",
+                'symbol': f"P{i}",
+                'category': category,
+                'chain': chains[0] if len(chains) == 1 else 'Multi-Chain',
+                'chains': chains,
+                'tvl': tvl,
+                'chainTvls': chain_tvls,
+                'change_1h': float(rng.normal(0, 0.5)),
+                'change_1d': float(rng.normal(0, 2)),
+                'change_7d': float(rng.normal(0, 5)),
+                'mcap': float(tvl * rng.uniform(0.1, 3)),
+                'listedAt': int(self.timestamps[self.protocol_listed[i]]),
+            })
+        return result
+
+    def protocol_detail(self, index):
+        rng = np.random.default_rng((self.seed, 4, index))
+        start = self.protocol_listed[index]
+        timestamps = self.timestamps[start:]
+        chain_idx, shares = self.protocol_chains[index]
+        chain_tvls = {}
+        total = np.zeros(len(timestamps))
+        for c, share in zip(chain_idx, shares):
+            values = random_walk(rng, len(timestamps), float(self.protocol_tvl[index] * share))
+            total += values
+            chain_tvls[self.chain_names[c]] = {
+                'tvl': [{'date': int(ts), 'totalLiquidityUSD': float(v)} for ts, v in zip(timestamps, values)]
+            }
+        return {
+            'id': str(index + 1),
+            'name': f"Protocol {index}",
+            'slug': f"protocol-{index}",
+            'category': str(self.protocol_category[index]),
+            'chains': [self.chain_names[c] for c in chain_idx],
+            'tvl': [{'date': int(ts), 'totalLiquidityUSD': float(v)} for ts, v in zip(timestamps, total)],
+            'chainTvls': chain_tvls,
+        }
+
+    def pools(self):
+        rng = np.random.default_rng((self.seed, 5))
+        lending = np.flatnonzero(np.isin(self.protocol_category, ['Lending', 'RWA Lending', 'CDP']))
+        other = np.flatnonzero(~np.isin(self.protocol_category, ['Lending', 'RWA Lending', 'CDP']))
+        n_lending = min(self.n_pools, int(self.n_pools * 0.4)) if len(lending) else 0
+        projects = np.concatenate([
+            rng.choice(lending, size=n_lending) if n_lending else np.empty(0, dtype=int),
+            rng.choice(other, size=self.n_pools - n_lending) if len(other) else rng.choice(lending, size=self.n_pools - n_lending),
+        ]).astype(int)
+        symbol_weights = 1 / np.arange(1, len(POOL_SYMBOLS) + 1) ** 0.7
+        symbols = rng.choice(POOL_SYMBOLS, size=self.n_pools, p=symbol_weights / symbol_weights.sum())
+        tvls = rng.lognormal(13, 2.2, self.n_pools)
+        data = []
+        for i in range(self.n_pools):
+            p = projects[i]
+            chain_idx, _ = self.protocol_chains[p]
+            chain = self.chain_names[chain_idx[rng.integers(0, len(chain_idx))]]
+            data.append({
+                'chain': chain,
+                'project': f"protocol-{p}",
+                'symbol': str(symbols[i]),
+                'tvlUsd': float(tvls[i]),
+                'apyBase': float(rng.gamma(2, 2)),
+                'apyReward': None,
+                'apy': float(rng.gamma(2, 2.5)),
+                'pool': f"{self.seed:08x}-{i:04x}-4000-8000-{p:012x}",
+                'stablecoin': 'USD' in str(symbols[i]),
+                'ilRisk': 'no',
+                'exposure': 'single' if '-' not in str(symbols[i]) else 'multi',
+                'underlyingTokens': [f"0x{(i * 2654435761) % (1 << 160):040x}"],
+            })
+        return {'status': 'success', 'data': data}
+
+    def bridge_volume(self, index):
+        rng = np.random.default_rng((self.seed, 6, index))
+        scale = float(self.chain_tvl[index]) * 0.01
+        return [
+            {'date': str(int(ts)), 'depositUSD': float(rng.lognormal(0, 0.5) * scale),
+             'withdrawUSD': float(rng.lognormal(0, 0.5) * scale), 'depositTxs': int(rng.integers(0, 5000)),
+             'withdrawTxs': int(rng.integers(0, 5000))}
+            for ts in self.timestamps[-30:]
+        ]
+
+    def chain_overview(self, index):
+        rng = np.random.default_rng((self.seed, 7, index))
+        return {'chain': self.chain_names[index], 'totalDataChart': [],
+                'activeAddresses': int(rng.integers(0, 2_000_000)) if index % 4 == 0 else 0}
+
+    def coin_price(self, gecko_id, index):
+        rng = np.random.default_rng((self.seed, 8, index))
+        key = f"coingecko:{gecko_id}"
+        return {'coins': {key: {'price': float(rng.lognormal(0, 2)), 'symbol': gecko_id[:4].upper(),
+                                'timestamp': self.end_ts, 'confidence': 0.99}}}
+
+    def morpho_markets(self, chain_id, markets=None, fetch=0):
+        """Morpho GraphQL market items of one chain as returned by the fetch-th fetch.
+
+        Between fetches about half the markets change state, a quarter are
+        re-stamped with their previous values and the rest are returned
+        as is; every 13th market has no state timestamp and every 17th no
+        collateral.
+        """
+        n = markets or max(1, self.n_pools // 12)
+        rng = np.random.default_rng((self.seed, 9, chain_id))
+        collateral = rng.choice(MORPHO_COLLATERAL, size=n)
+        supply = heavy_tail(rng, n, 5e7, 1.2)
+        changed_at = np.zeros(n, dtype=np.int64)
+        stamped_at = np.zeros(n, dtype=np.int64)
+        for k in range(1, fetch + 1):
+            roll = np.random.default_rng((self.seed, 10, chain_id, k)).random(n)
+            changed_at[roll < 0.5] = k
+            stamped_at[roll < 0.75] = k
+
+        items = []
+        for i in range(n):
+            state_rng = np.random.default_rng((self.seed, 11, chain_id, i, int(changed_at[i])))
+            supply_usd = float(supply[i] * state_rng.lognormal(0, 0.1))
+            utilization = float(state_rng.uniform(0, 0.95))
+            items.append({
+                'uniqueKey': f"0x{chain_id:08x}{i:056x}",
+                'chainId': chain_id,
+                'lltv': str(860000000000000000),
+                'oracleAddress': f"0x{i:040x}",
+                'irmAddress': f"0x{chain_id:040x}",
+                'loanAsset': {'address': f"0x{1:040x}", 'symbol': 'pUSD', 'name': 'Plume USD', 'decimals': 6},
+                'collateralAsset': None if i % 17 == 0 else {
+                    'address': f"0x{i + 2:040x}", 'symbol': str(collateral[i]), 'name': str(collateral[i]), 'decimals': 18,
+                },
+                'state': {
+                    'supplyAssets': str(int(supply_usd * 1e6)),
+                    'supplyAssetsUsd': supply_usd,
+                    'borrowAssets': str(int(supply_usd * utilization * 1e6)),
+                    'borrowAssetsUsd': supply_usd * utilization,
+                    'collateralAssets': str(int(supply_usd * 1.5 * 1e18)),
+                    'collateralAssetsUsd': supply_usd * 1.5,
+                    'liquidityAssets': str(int(supply_usd * (1 - utilization) * 1e6)),
+                    'liquidityAssetsUsd': supply_usd * (1 - utilization),
+                    'supplyApy': float(state_rng.gamma(2, 0.02)),
+                    'borrowApy': float(state_rng.gamma(2, 0.03)),
+                    'utilization': utilization,
+                    'fee': 0,
+                    'timestamp': None if i % 13 == 0 else self.end_ts + int(stamped_at[i]) * 3600 + i,
+                },
+                'dailyApys': {'netSupplyApy': float(state_rng.gamma(2, 0.02)), 'netBorrowApy': float(state_rng.gamma(2, 0.03))},
+            })
+        return items
+
+    # ----- CSVs -----
+
+    def distribution_frame(self):
+        """Same columns as all_stablecoins_chain_distribution.csv"""
+        parts = []
+        for i, (name, symbol) in enumerate(self.coin_names):
+            for c, timestamps, values in self.stablecoin_series(i):
+                parts.append(pd.DataFrame({
+                    'stablecoin_id': i + 1,
+                    'stablecoin_name': name,
+                    'stablecoin_symbol': symbol,
+                    'date': pd.to_datetime(timestamps, unit='s'),
+                    'chain': self.chain_names[c],
+                    'circulating': values,
+                }))
+        df = pd.concat(parts, ignore_index=True)
+        df['native_bridged_standard'] = ''
+        return df.sort_values(['date', 'stablecoin_id', 'chain'])
+
+    def chain_tvl_frame(self):
+        """Same columns as chain_tvl_data.csv"""
+        records = []
+        for i, name in enumerate(self.chain_names):
+            history = self.chain_history(i)
+            current = history[-1]['tvl']
+
+            def growth(days):
+                past = history[max(len(history) - 1 - days, 0)]['tvl']
+                return (current - past) / past if past > 0 else None
+
+            records.append({
+                'Chain': name,
+                'Current TVL': current,
+                'DeFi Launch Date': datetime.fromtimestamp(history[0]['date']),
+                '7d Growth': growth(7),
+                '30d Growth': growth(30),
+                '90d Growth': growth(90),
+            })
+        return pd.DataFrame(records).sort_values('Current TVL', ascending=False)
+
+
+def _dump(payload):
+    return json.dumps(payload, separators=(',', ':')).encode('utf-8')
+
+
+def _save(url, payload, directory, params=None):
+    method, full_url, body = canonical_request('GET', url, params)
+    save_fixture(method, full_url, body, 200, _dump(payload), directory=directory)
+
+
+def write_fixtures(dataset, directory):
+    """Write every endpoint the pipeline touches into the fixture store"""
+    start = time.time()
+    count = 0
+
+    chains = dataset.chains()
+    _save("https://api.llama.fi/v2/chains", chains, directory)
+    count += 1
+    for i, chain in enumerate(chains):
+        name = chain['name']
+        _save(f"https://api.llama.fi/v2/historicalChainTvl/{name}", dataset.chain_history(i), directory)
+        _save(f"https://bridges.llama.fi/bridgevolume/{name}?id=0", dataset.bridge_volume(i), directory)
+        _save(f"https://api.llama.fi/overview/chains/{name}", dataset.chain_overview(i), directory)
+        count += 3
+
+    # comprehensive_chain_analysis.py prices the tokens of the top 100 chains by
+    # TVL in batched requests (see coin_prices.py)
+    prices = {}
+    for i, chain in sorted(enumerate(chains), key=lambda item: item[1].get('tvl', 0), reverse=True)[:100]:
+        if chain['gecko_id']:
+            prices.update(dataset.coin_price(chain['gecko_id'], i)['coins'])
+    for url, batch in batch_urls(prices_url(), sorted(prices)):
+        _save(url, {'coins': {coin: prices[coin] for coin in batch}}, directory)
+        count += 1
+
+    stablecoins = dataset.stablecoins()
+    _save("https://stablecoins.llama.fi/stablecoins", stablecoins, directory, {'includePrices': True})
+    # chain_comparison_analysis reads the bare asset list from the api host
+    _save("https://api.llama.fi/stablecoins", stablecoins['peggedAssets'], directory)
+    count += 2
+    for i in range(dataset.n_coins):
+        _save(f"https://stablecoins.llama.fi/stablecoin/{i + 1}", dataset.stablecoin_detail(i), directory)
+        count += 1
+
+    _save("https://api.llama.fi/protocols", dataset.protocols(), directory)
+    count += 1
+    for i in np.argsort(-dataset.protocol_tvl)[:dataset.n_protocol_histories]:
+        _save(f"https://api.llama.fi/protocol/protocol-{i}", dataset.protocol_detail(int(i)), directory)
+        count += 1
+
+    _save("https://yields.llama.fi/pools", dataset.pools(), directory)
+    count += 1
+
+    print(f"✓ Wrote {count} fixtures to {directory} in {time.time() - start:.1f}s")
+    return count
+
+
+def write_csvs(dataset, directory):
+    """Write the CSV/JSON inputs read by the analysis scripts"""
+    os.makedirs(directory, exist_ok=True)
+    distribution = dataset.distribution_frame()
+    distribution.to_csv(os.path.join(directory, 'all_stablecoins_chain_distribution.csv'), index=False)
+    protocols = dataset.protocols()
+    with open(os.path.join(directory, 'tvl_data.json'), 'w') as f:
+        json.dump(protocols, f)
+    pd.DataFrame(protocols).to_csv(os.path.join(directory, 'tvl_data.csv'), index=False)
+    save_protocol_chain_tvls(normalize_chain_tvls(protocols), directory)
+    dataset.chain_tvl_frame().to_csv(os.path.join(directory, 'chain_tvl_data.csv'), index=False)
+    histories = {name: dataset.chain_history(i) for i, name in enumerate(dataset.chain_names)}
+    save_chain_tvl_history(chain_history_frame(histories), directory)
+    print(f"✓ Wrote CSVs to {directory} ({len(distribution):,} distribution rows)")
+    return len(distribution)
+
+
+def process_peak_rss_mb():
+    """Peak RSS of the current process in MB.
+
+    Reads VmHWM on Linux: ru_maxrss of an exec'd child also counts the
+    parent's peak at fork time, VmHWM only counts the child's own memory.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+# Runs a script like `python script.py` would, then reports its own peak RSS
+_MEASURE_WRAPPER = """
+import os, runpy, sys
+peak_file, script = sys.argv[1], sys.argv[2]
+sys.argv = sys.argv[2:]
+sys.path.insert(0, os.path.dirname(script))
+try:
+    runpy.run_path(script, run_name='__main__')
+finally:
+    sys.path.insert(0, {src_dir!r})
+    from synthetic_data import process_peak_rss_mb
+    with open(peak_file, 'w') as f:
+        f.write(str(process_peak_rss_mb()))
+"""
+
+
+def measure_script(script, workdir, env=None, args=()):
+    """Run a script in workdir and return wall time, peak RSS and exit code"""
+    script = os.path.abspath(script)
+    wrapper = _MEASURE_WRAPPER.format(src_dir=os.path.dirname(os.path.abspath(__file__)))
+    fd, peak_file = tempfile.mkstemp(suffix='.rss')
+    os.close(fd)
+    try:
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, '-c', wrapper, peak_file, script, *args], cwd=workdir, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        seconds = time.perf_counter() - start
+        with open(peak_file) as f:
+            peak = f.read().strip()
+    finally:
+        os.remove(peak_file)
+    return {
+        'seconds': seconds,
+        'peak_rss_mb': float(peak) if peak else float('nan'),
+        'returncode': proc.returncode,
+        'stderr_tail': proc.stderr.decode('utf-8', 'replace')[-2000:],
+    }
+
+
+def replay_env(fixture_directory, latency=0.0):
+    """Environment for running a script against a fixture store"""
+    env = dict(os.environ)
+    env['LLAMA_HTTP_MODE'] = 'replay'
+    env['LLAMA_FIXTURE_DIR'] = os.path.abspath(fixture_directory)
+    env['LLAMA_REPLAY_LATENCY'] = str(latency)
+    env['MPLBACKEND'] = 'Agg'
+    return env
+
+
+def scaling_curve(script, scales, out_dir, days=DEFAULT_DAYS, seed=42, latency=0.0):
+    """Measure script throughput and peak memory at each scale"""
+    rows = []
+    for scale in scales:
+        scale_dir = os.path.join(out_dir, f"{scale:g}x")
+        fixtures = os.path.join(scale_dir, 'fixtures')
+        workdir = os.path.join(scale_dir, 'work')
+        print(f"\n📈 Scale {scale:g}x")
+        dataset = SyntheticDataset.at_scale(scale, days=days, seed=seed)
+        if not os.path.isdir(fixtures):
+            write_fixtures(dataset, fixtures)
+        if not os.path.exists(os.path.join(workdir, 'tvl_data.csv')):
+            write_csvs(dataset, workdir)
+        input_rows = sum(len(pd.read_csv(os.path.join(workdir, f), usecols=[0]))
+                         for f in ('all_stablecoins_chain_distribution.csv', 'tvl_data.csv'))
+
+        result = measure_script(script, workdir, replay_env(fixtures, latency))
+        status = '✓' if result['returncode'] == 0 else f"✗ exit {result['returncode']}"
+        print(f"  {status} {result['seconds']:.2f}s, peak RSS {result['peak_rss_mb']:.0f} MB")
+        if result['returncode'] != 0:
+            print(result['stderr_tail'])
+
+        rows.append({
+            'script': os.path.basename(script),
+            'scale': scale,
+            **dataset.sizes(),
+            'input_rows': input_rows,
+            'seconds': round(result['seconds'], 3),
+            'rows_per_second': round(input_rows / result['seconds'], 1) if result['seconds'] > 0 else None,
+            'peak_rss_mb': round(result['peak_rss_mb'], 1),
+            'returncode': result['returncode'],
+        })
+
+    curve_df = pd.DataFrame(rows)
+    output_file = os.path.join(out_dir, f"scaling_curve_{os.path.splitext(os.path.basename(script))[0]}.csv")
+    curve_df.to_csv(output_file, index=False)
+    print(f"\n✓ Scaling curve saved to {output_file}")
+    print(curve_df[['scale', 'input_rows', 'seconds', 'rows_per_second', 'peak_rss_mb']].to_string(index=False))
+    return curve_df
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Synthetic DeFiLlama dataset generator')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    gen = subparsers.add_parser('generate', help='Write synthetic fixtures (and optionally CSVs)')
+    gen.add_argument('--out', default=os.path.join('synthetic', '1x'))
+    gen.add_argument('--scale', type=float, default=1.0, help='Multiplier for chains, coins, protocols and pools')
+    gen.add_argument('--chains', type=int)
+    gen.add_argument('--coins', type=int)
+    gen.add_argument('--protocols', type=int)
+    gen.add_argument('--pools', type=int)
+    gen.add_argument('--protocol-histories', type=int)
+    gen.add_argument('--days', type=int, default=DEFAULT_DAYS)
+    gen.add_argument('--seed', type=int, default=42)
+    gen.add_argument('--csv', action='store_true', help='Also write the analysis input CSVs')
+
+    curve = subparsers.add_parser('curve', help='Measure a script across scales in replay mode')
+    curve.add_argument('script')
+    curve.add_argument('--scales', type=float, nargs='+', default=[1, 2, 5, 10])
+    curve.add_argument('--out', default='synthetic')
+    curve.add_argument('--days', type=int, default=DEFAULT_DAYS)
+    curve.add_argument('--seed', type=int, default=42)
+    curve.add_argument('--latency', type=float, default=0.0)
+
+    args = parser.parse_args()
+
+    if args.command == 'generate':
+        sizes = {key: max(1, int(round(value * args.scale))) for key, value in BASE_SIZES.items()}
+        for key in sizes:
+            override = getattr(args, key)
+            if override is not None:
+                sizes[key] = override
+        dataset = SyntheticDataset(days=args.days, seed=args.seed, **sizes)
+        print(f"🧪 Generating synthetic dataset: {dataset.sizes()}")
+        write_fixtures(dataset, os.path.join(args.out, 'fixtures'))
+        if args.csv:
+            write_csvs(dataset, os.path.join(args.out, 'work'))
+        print(f"\nRun a script against it with:")
+        print(f"  LLAMA_HTTP_MODE=replay LLAMA_FIXTURE_DIR={os.path.join(args.out, 'fixtures')} python src/defillama_import.py")
+    elif args.command == 'curve':
+        scaling_curve(args.script, args.scales, args.out, args.days, args.seed, args.latency)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Yield Pools Snapshot
+Downloads https://yields.llama.fi/pools once and keeps it as a snapshot in the
+working directory, so the pool analyses that defillama_import.py runs back to
+back (lending_assets_by_chain.py, lst_lrt_tvl_by_chain.py) share one download
+and one JSON parse:
+
+    pools_df = load_pools()          # snapshot if fresh, else fetched and saved
+
+The snapshot is the parsed DataFrame pickled with chain, project and symbol
+as categoricals. Pickle keeps those and the list-valued columns
+(underlyingTokens, rewardTokens) exactly as parsed and loads without touching
+JSON. Snapshots older than SNAPSHOT_MAX_AGE are refetched. Within one process
+every caller gets the same frame: filter it (or .copy()) rather than modify it.
+
+The raw response is also written, compactly, to yield_pools_raw.json for
+debugging.
+"""
+
+import json
+import os
+import pickle
+import time
+
+import pandas as pd
+
+from llama_http import get_session, throttle
+
+POOLS_URL = "https://yields.llama.fi/pools"
+SNAPSHOT_FILE = 'yield_pools_snapshot.pkl'
+RAW_FILE = 'yield_pools_raw.json'
+SNAPSHOT_MAX_AGE = 3600  # Pool TVLs update hourly
+CATEGORICAL_COLUMNS = ['chain', 'project', 'symbol']
+
+_loaded = {}
+
+
+def fetch_pools(directory='.'):
+    """Download the pools feed and return it as a frame; writes the raw response too"""
+    response = get_session().get(POOLS_URL)
+    throttle(0.25)
+    if response.status_code != 200:
+        raise RuntimeError(f"Status code {response.status_code}")
+    pools_data = response.json()
+    with open(os.path.join(directory, RAW_FILE), 'w') as f:
+        json.dump(pools_data, f, separators=(',', ':'))
+    print(f"✓ Successfully fetched {len(pools_data.get('data', []))} pools")
+    print(f"✓ Raw data saved to {RAW_FILE}")
+
+    pools_df = pd.DataFrame(pools_data['data'])
+    for column in CATEGORICAL_COLUMNS:
+        if column in pools_df.columns:
+            pools_df[column] = pools_df[column].astype('category')
+    return pools_df
+
+
+def save_snapshot(pools_df, directory='.'):
+    path = os.path.join(directory, SNAPSHOT_FILE)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    pools_df.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_snapshot(directory='.', max_age=SNAPSHOT_MAX_AGE):
+    """The saved snapshot, or None if it is missing, stale or unreadable"""
+    path = os.path.join(directory, SNAPSHOT_FILE)
+    try:
+        if max_age is not None and time.time() - os.path.getmtime(path) > max_age:
+            return None
+        return pd.read_pickle(path)
+    except (OSError, ValueError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+
+
+def load_pools(directory='.', max_age=SNAPSHOT_MAX_AGE, refresh=False):
+    """The shared pools frame: cached in-process, else the snapshot, else a fresh download.
+
+    Raises on a failed download like fetch_pools().
+    """
+    key = os.path.abspath(directory)
+    if not refresh and key in _loaded:
+        return _loaded[key]
+
+    pools_df = None if refresh else load_snapshot(directory, max_age)
+    if pools_df is not None:
+        print(f"✓ Loaded {len(pools_df)} pools from {SNAPSHOT_FILE}")
+    else:
+        pools_df = fetch_pools(directory)
+        save_snapshot(pools_df, directory)
+        print(f"✓ Snapshot saved to {SNAPSHOT_FILE}")
+    _loaded[key] = pools_df
+    return pools_df
@@ -0,0 +1,29 @@
+"""Shared fixtures: a small synthetic DeFiLlama universe (see src/synthetic_data.py)"""
+
+import os
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, os.path.join(ROOT, 'rwa_lending'))
+
+from synthetic_data import SyntheticDataset, write_csvs  # noqa: E402
+
+# Fixed end date so every run sees the same dataset
+END_DATE = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture(scope='session')
+def dataset():
+    return SyntheticDataset.at_scale(0.05, days=400, seed=7, end_date=END_DATE)
+
+
+@pytest.fixture(scope='session')
+def data_dir(dataset, tmp_path_factory):
+    """Directory holding the CSV/Parquet inputs the analysis scripts read"""
+    directory = tmp_path_factory.mktemp('synthetic')
+    write_csvs(dataset, str(directory))
+    return str(directory)
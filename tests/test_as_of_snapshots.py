@@ -0,0 +1,94 @@
+"""AsOfSnapshots and SeriesIndex against the per-chain nearest-point scan they replaced"""
+
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from as_of_snapshots import AsOfSnapshots, SeriesIndex, chain_history_frame, epoch_seconds
+
+# Before most launches, mid-history, a noon tie between two daily points, and past the end
+AS_OF_DATES = ['2024-06-01 00:00', '2024-09-01 00:00', '2025-01-15 12:00', '2025-07-01 00:00']
+
+
+def nearest_point(points, timestamp):
+    """The old lookup: closest (timestamp, value) by absolute distance, the earlier one on a tie"""
+    return min(points, key=lambda point: abs(point[0] - timestamp))
+
+
+def old_report(dataset, dates):
+    """Report rows computed per chain and per stablecoin series like september_2024_tvl_analysis used to"""
+    histories = {name: [(p['date'], p['tvl']) for p in dataset.chain_history(i)]
+                 for i, name in enumerate(dataset.chain_names)}
+    distribution = dataset.distribution_frame()
+    series = {
+        key: list(zip(epoch_seconds(group['date']), group['circulating']))
+        for key, group in distribution.sort_values('date').groupby(['stablecoin_id', 'chain'])
+    }
+
+    rows = []
+    for date in pd.to_datetime(dates):
+        timestamp = int(epoch_seconds([date])[0])
+        stablecoins = {}
+        for (_, chain), points in series.items():
+            circulating = nearest_point(points, timestamp)[1]
+            if circulating > 0:
+                stablecoins[chain] = stablecoins.get(chain, 0) + circulating
+        for chain, points in histories.items():
+            tvl = nearest_point(points, timestamp)[1]
+            row = {'as_of_date': date, 'chain': chain, 'defi_tvl': tvl,
+                   'stablecoin_tvl': stablecoins.get(chain, 0.0), 'current_tvl': points[-1][1]}
+            for days in (30, 90):
+                past = nearest_point(points, int(epoch_seconds([date - timedelta(days=days)])[0]))[1]
+                row[f'growth_{days}d'] = (tvl - past) / past if past > 0 else np.nan
+            rows.append(row)
+    report = pd.DataFrame(rows)
+    report['total_tvl'] = report['defi_tvl'] + report['stablecoin_tvl']
+    return report[report['total_tvl'] > 0]
+
+
+@pytest.fixture(scope='module')
+def engine(dataset):
+    histories = {name: dataset.chain_history(i) for i, name in enumerate(dataset.chain_names)}
+    return AsOfSnapshots(chain_history_frame(histories), dataset.distribution_frame())
+
+
+def test_report_matches_nearest_point_scan(dataset, engine):
+    new = engine.report(AS_OF_DATES).set_index(['as_of_date', 'chain']).sort_index()
+    old = old_report(dataset, AS_OF_DATES).set_index(['as_of_date', 'chain']).sort_index()
+
+    assert new.index.equals(old.index)
+    for column in ['defi_tvl', 'stablecoin_tvl', 'total_tvl', 'growth_30d', 'growth_90d', 'current_tvl']:
+        pd.testing.assert_series_equal(new[column], old[column], check_names=False, rtol=1e-9)
+
+
+def test_report_is_sorted_by_date_then_total_tvl(engine):
+    report = engine.report(AS_OF_DATES)
+    for _, rows in report.groupby('as_of_date', sort=False):
+        assert rows['total_tvl'].is_monotonic_decreasing
+    assert report['as_of_date'].is_monotonic_increasing
+
+
+def test_load_reads_the_written_histories(data_dir, engine):
+    loaded = AsOfSnapshots.load(data_dir).report(AS_OF_DATES)
+    pd.testing.assert_frame_equal(loaded, engine.report(AS_OF_DATES), rtol=1e-9)
+
+
+def test_series_index_nearest_matches_brute_force():
+    rng = np.random.default_rng(3)
+    codes = rng.integers(0, 6, 400)
+    timestamps = rng.integers(0, 10_000, 400)
+    values = rng.normal(size=400)
+    index = SeriesIndex(codes, timestamps, values)
+
+    # Groups 6 and 7 have no points
+    query_codes = rng.integers(0, 8, 300)
+    query_timestamps = rng.integers(-500, 10_500, 300)
+    order = np.lexsort((timestamps, codes))
+    for code, timestamp, value in zip(query_codes, query_timestamps, index.nearest(query_codes, query_timestamps)):
+        points = [(t, v) for c, t, v in zip(codes[order], timestamps[order], values[order]) if c == code]
+        if not points:
+            assert np.isnan(value)
+        else:
+            assert value == nearest_point(points, timestamp)[1]
@@ -0,0 +1,94 @@
+"""AssetTaxonomy against the hard-coded classifiers it replaced"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from asset_taxonomy import AssetTaxonomy, compile_rules
+
+EDGE_SYMBOLS = ['BETH', 'SETH', 'beth', 'wstETH', 'weETH', 'USDETH', 'ETHUSD', 'SETH-USDC', 'XDAI', 'EURe',
+                'sUSDe', 'BTC', 'btc.b', 'ETH+', 'WSTETH-ETH-25X', 'GTMSUSDC', 'SOL', '']
+
+
+def old_classify_asset(symbol):
+    """lending_assets_by_chain's classifier before asset_taxonomy.json"""
+    symbol_upper = symbol.upper()
+
+    btc_tokens = [
+        'WBTC', 'CBBTC', 'BTCB', 'LBTC', 'BTC.B', 'TBTC', 'SOLVBTC',
+        'VBGTWBTC', 'XSOLVBTC', 'EBTC', 'FBTC', 'ENZOBTC', 'UBTC',
+        'STBTC', 'M-BTC', 'HYPERCBBTCD', 'GTWBTCC', 'MHYPERBTC',
+        'NWBTC', 'YBTC.B', 'BTC', 'CDCBTC', 'FIABTC', 'MWCBBTC',
+        'SMCBBTC', 'HGBTC'
+    ]
+    if symbol_upper in btc_tokens:
+        return 'BTC Tokens'
+
+    eth_lsts = [
+        'WEETH', 'WSTETH', 'STETH', 'RSETH', 'RETH', 'TETH',
+        'EZETH', 'OSETH', 'WRSETH', 'ETH+', 'WSTETH-ETH-25X',
+        'WEETHS', 'WSUPEROETHB', 'CBETH', 'SFRXETH', 'FRXETH',
+        'EETH', 'PUFETH', 'AGETH', 'SAVETH', 'OETH', 'SVETH',
+        'ETHX', 'METH', 'DETH', 'BSDETH', 'CSETH', 'HGETH',
+        'YNETHX', 'GTMSETHC', 'STEAKETH', 'AVGWETHCORE', 'NWETH',
+        'AWETH', 'MHYETH', 'HYPERETHD', 'MHYPERETH', 'YOETH',
+        'GTMSUSDC', 'FLRETH', 'STHETH'
+    ]
+    if symbol_upper in eth_lsts:
+        return 'ETH LSTs'
+
+    if 'ETH' in symbol_upper and symbol_upper not in ['BETH', 'SETH']:
+        return 'ETH'
+
+    if 'USD' in symbol_upper or 'EUR' in symbol_upper or 'DAI' in symbol_upper:
+        return 'Stablecoins'
+
+    return 'Other Assets'
+
+
+OLD_LST_LRT_TOKENS = {
+    'WEETH': 'Ether.fi', 'WSTETH': 'Lido', 'RSETH': 'KelpDAO', 'EZETH': 'Renzo', 'WRSETH': 'KelpDAO',
+    'CBETH': 'Coinbase', 'WSUPEROETHB': 'Superform', 'RETH': 'Rocket Pool', 'GTMSETHC': 'Gravita',
+    'DETH': 'DineroDAO', 'FLRETH': 'Flare', 'STEAKETH': 'Steakhouse', 'YOETH': 'Yearn', 'METH': 'Mantle',
+    'CSETH': 'Coinshift', 'BSDETH': 'Based', 'NWETH': 'Nimbora', 'TETH': 'Tangible',
+}
+
+
+@pytest.fixture(scope='module')
+def taxonomy():
+    return AssetTaxonomy.load()
+
+
+@pytest.fixture(scope='module')
+def symbols(dataset, taxonomy):
+    pool_symbols = [pool['symbol'] for pool in dataset.pools()['data']]
+    return pd.Series(pool_symbols + list(taxonomy.exact) + EDGE_SYMBOLS, dtype=object)
+
+
+def test_classify_matches_old_classifier(taxonomy, symbols):
+    for symbol in symbols:
+        assert taxonomy.classify(symbol) == old_classify_asset(symbol), symbol
+
+
+def test_classify_symbols_matches_per_symbol_classify(taxonomy, symbols):
+    column = pd.concat([symbols, pd.Series([None, np.nan], dtype=object)], ignore_index=True)
+    classified = taxonomy.classify_symbols(column)
+
+    assert classified.index.equals(column.index)
+    assert list(classified[:len(symbols)]) == [old_classify_asset(symbol) for symbol in symbols]
+    assert classified[len(symbols):].isna().all()
+
+
+def test_lst_lrt_issuers_match_old_table(taxonomy):
+    assert taxonomy.lst_lrt_issuers == OLD_LST_LRT_TOKENS
+
+
+def test_first_listed_rule_wins_whatever_the_substring_position():
+    taxonomy = AssetTaxonomy({'rules': [
+        {'asset_type': 'B', 'contains': ['USD']},
+        {'asset_type': 'A', 'contains': ['ETH'], 'except': ['ETHUSD']},
+    ]})
+    assert taxonomy.classify('ETHUSD') == 'B'
+    assert taxonomy.classify('WETH') == 'A'
+    assert taxonomy.classify('SOL') == 'Other Assets'
+    assert compile_rules([]).match('ANY') is None
@@ -0,0 +1,55 @@
+"""CategoryCube.chain_summary against the per-category groupbys and merge it replaced"""
+
+import pandas as pd
+import pytest
+
+from category_cube import CategoryCube
+from protocol_tvls import metric_values, normalize_chain_tvls
+
+
+def old_chain_summary(table, category):
+    """lending_tvl_by_chain's old TVL/borrowed groupbys, merged per chain"""
+    tvl = metric_values(table, 'base', category).astype({'chain': str})
+    borrowed = metric_values(table, 'borrowed', category).astype({'chain': str})
+
+    summary = tvl.groupby('chain').agg(base=('value', 'sum'), base_protocols=('value', 'count'))
+    if borrowed.empty:
+        summary['borrowed'] = 0.0
+        summary['borrowed_protocols'] = 0
+    else:
+        borrowed = borrowed.groupby('chain').agg(borrowed=('value', 'sum'), borrowed_protocols=('value', 'count'))
+        summary = summary.join(borrowed, how='left')
+        summary['borrowed'] = summary['borrowed'].fillna(0)
+        summary['borrowed_protocols'] = summary['borrowed_protocols'].fillna(0).astype(int)
+    summary['utilization_rate'] = (summary['borrowed'] / summary['base'] * 100).round(2)
+    return summary
+
+
+@pytest.fixture(scope='module')
+def table(dataset):
+    return normalize_chain_tvls(dataset.protocols())
+
+
+@pytest.fixture(scope='module')
+def cube(table):
+    return CategoryCube(table)
+
+
+def test_chain_summary_matches_old_groupbys(table, cube):
+    assert 'Lending' in cube.categories()
+    for category in cube.categories():
+        new = cube.chain_summary(category)
+        new.index = new.index.astype(str)
+        old = old_chain_summary(table, category)
+        pd.testing.assert_frame_equal(new.sort_index(), old[new.columns].sort_index(), check_dtype=False, check_names=False)
+
+
+def test_cube_of_one_category_slice_matches_full_cube(table, cube):
+    lending = CategoryCube(table[table['category'] == 'Lending'])
+    pd.testing.assert_frame_equal(lending.chain_summary('Lending'), cube.chain_summary('Lending'))
+
+
+def test_chain_share_sums_to_100_per_category(cube):
+    shares = cube.chain_share()
+    totals = shares.groupby(level='category', observed=True)['share'].sum()
+    assert ((totals - 100).abs() < 0.01 * shares.groupby(level='category', observed=True).size()).all()
@@ -0,0 +1,66 @@
+"""Batched coin price lookups against the one-request-per-coin lookups they replaced"""
+
+import pytest
+
+from coin_prices import PriceService, batch_urls, coin_key, prices_url
+from llama_http import get_session
+from synthetic_data import replay_env, write_fixtures
+
+
+@pytest.fixture(scope='module')
+def fixture_dir(dataset, tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp('fixtures'))
+    write_fixtures(dataset, directory)
+    return directory
+
+
+@pytest.fixture
+def replay(fixture_dir, monkeypatch):
+    for name in ('LLAMA_HTTP_MODE', 'LLAMA_FIXTURE_DIR', 'LLAMA_REPLAY_LATENCY'):
+        monkeypatch.setenv(name, replay_env(fixture_dir)[name])
+
+
+@pytest.mark.parametrize('max_url_length', [60, 120, 2000])
+def test_batches_cover_every_coin_in_order_within_the_limit(max_url_length):
+    coins = [coin_key(f"token-{i}" * (1 + i % 4)) for i in range(200)]
+    prefix = prices_url()
+    batches = list(batch_urls(prefix, coins, max_url_length))
+
+    assert [coin for _, batch in batches for coin in batch] == coins
+    for url, batch in batches:
+        assert url == prefix + ','.join(batch)
+        assert len(url) <= max_url_length or len(batch) == 1
+    # Greedy: the first coin of each batch would not have fit in the one before
+    for (url, _), (_, following) in zip(batches, batches[1:]):
+        assert len(url) + 1 + len(following[0]) > max_url_length
+
+
+def test_key_longer_than_the_limit_gets_its_own_request():
+    prefix = prices_url()
+    long_key = coin_key('x' * 100)
+    batches = list(batch_urls(prefix, ['coingecko:a', long_key, 'coingecko:b'], max_url_length=len(prefix) + 30))
+    assert [batch for _, batch in batches] == [['coingecko:a'], [long_key], ['coingecko:b']]
+
+
+def test_batched_prices_match_per_coin_prices(dataset, replay):
+    chains = dataset.chains()
+    # Old path: one /prices/current/coingecko:<id> request per chain token
+    expected = {chain['gecko_id']: dataset.coin_price(chain['gecko_id'], i)['coins'][coin_key(chain['gecko_id'])]
+                for i, chain in enumerate(chains) if chain['gecko_id']}
+
+    service = PriceService(session=get_session(), interval=0)
+    prices = service.by_gecko_id([chain['gecko_id'] for chain in chains])
+
+    assert prices == expected
+    assert service.requests == len(list(batch_urls(prices_url(), sorted(map(coin_key, expected)))))
+    assert not service.errors
+
+    # Cached: a second lookup makes no requests
+    assert service.by_gecko_id(list(expected)) == expected
+    assert service.requests == len(list(batch_urls(prices_url(), sorted(map(coin_key, expected)))))
+
+
+def test_failed_batch_is_reported_per_coin(replay):
+    service = PriceService(session=get_session(), interval=0)
+    assert service.by_gecko_id(['not-a-token']) == {}
+    assert service.error('not-a-token').startswith('Error fetching token data')
@@ -0,0 +1,106 @@
+"""MorphoMarketHistory.append against a row-by-row model of its dedup rules"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from calculate_morpho_share import run as morpho_share
+from morpho_history import KEY_COLUMNS, STATE_COLUMNS, MorphoMarketHistory, market_states
+from morpho_markets import PLUME_CHAIN_ID, markets_frame
+
+FETCHES = 5
+
+
+def fetched_at(fetch):
+    return pd.Timestamp('2025-06-01') + pd.Timedelta(hours=6 * fetch)
+
+
+def naive_append(rows, markets_df, fetch_time):
+    """Add each state unless its key is stored or it equals the market's latest stored state"""
+    new = market_states(markets_df, fetch_time).drop_duplicates(KEY_COLUMNS, keep='last')
+    keys = {tuple(row[column] for column in KEY_COLUMNS) for row in rows}
+    latest = {}
+    for row in sorted(rows, key=lambda row: row['timestamp']):
+        latest[(row['chain_id'], row['market_id'])] = row
+
+    added = []
+    for row in new.to_dict('records'):
+        if tuple(row[column] for column in KEY_COLUMNS) in keys:
+            continue
+        previous = latest.get((row['chain_id'], row['market_id']))
+        if previous is not None and all(
+                row[column] == previous[column] or (np.isnan(row[column]) and np.isnan(previous[column]))
+                for column in STATE_COLUMNS):
+            continue
+        added.append(row)
+    return rows + added, len(added)
+
+
+@pytest.fixture(scope='module')
+def fetches(dataset):
+    return [markets_frame(dataset.morpho_markets(PLUME_CHAIN_ID, fetch=fetch)) for fetch in range(FETCHES)]
+
+
+def test_append_matches_row_by_row_dedup(fetches):
+    history = MorphoMarketHistory()
+    rows = []
+    for fetch, markets_df in enumerate(fetches):
+        added = history.append(markets_df, fetched_at(fetch))
+        rows, expected_added = naive_append(rows, markets_df, fetched_at(fetch))
+        assert added == expected_added
+
+    expected = pd.DataFrame(rows)[history.states.columns].sort_values(KEY_COLUMNS).reset_index(drop=True)
+    pd.testing.assert_frame_equal(history.states, expected, check_dtype=False)
+    # Every fetch after the first re-stamps some unchanged markets; those must not be stored again
+    assert len(history.states) < sum(len(markets_df) for markets_df in fetches)
+
+
+def test_reappending_a_fetch_adds_nothing(fetches):
+    history = MorphoMarketHistory()
+    assert history.append(fetches[0], fetched_at(0)) == len(fetches[0])
+    assert history.append(fetches[0], fetched_at(0)) == 0
+    # Markets without a state timestamp get the new fetch time but the same values
+    assert history.append(fetches[0], fetched_at(1)) == 0
+
+
+def test_latest_is_the_last_state_per_market(fetches):
+    history = MorphoMarketHistory()
+    for fetch, markets_df in enumerate(fetches):
+        history.append(markets_df, fetched_at(fetch))
+
+    latest = history.latest().set_index('market_id').sort_index()
+    last_fetch = market_states(fetches[-1], fetched_at(FETCHES - 1)).set_index('market_id').sort_index()
+    pd.testing.assert_frame_equal(latest[STATE_COLUMNS], last_fetch[STATE_COLUMNS], check_dtype=False)
+
+
+def test_history_round_trips(fetches, tmp_path):
+    history = MorphoMarketHistory()
+    for fetch, markets_df in enumerate(fetches):
+        history.append(markets_df, fetched_at(fetch))
+    history.save(str(tmp_path))
+
+    loaded = MorphoMarketHistory.load(str(tmp_path))
+    pd.testing.assert_frame_equal(loaded.states, history.states, check_dtype=False)
+    assert loaded.append(fetches[-1], fetched_at(FETCHES - 1)) == 0
+
+
+def test_supply_history_counts_only_plume_markets(dataset, tmp_path, monkeypatch):
+    # The same collateral on Plume ($1M) and on Ethereum ($9M), as left by a multi-chain fetch
+    plume, other = (dict(dataset.morpho_markets(chain_id, markets=2)[1]) for chain_id in (PLUME_CHAIN_ID, 1))
+    for market, supply_usd in ((plume, 1e6), (other, 9e6)):
+        market['collateralAsset'] = dict(market['collateralAsset'], symbol='nALPHA')
+        market['state'] = dict(market['state'], supplyAssetsUsd=supply_usd)
+    markets_df = markets_frame([plume, other])
+
+    history = MorphoMarketHistory()
+    history.append(markets_df, fetched_at(0))
+    history.save(str(tmp_path))
+    series = history.asset_series('supply_usd', chain_ids=[PLUME_CHAIN_ID])
+    assert series['nALPHA'].iloc[-1] == 1e6
+
+    markets_df[markets_df['chain_id'] == PLUME_CHAIN_ID].to_csv(tmp_path / 'morpho_plume_markets.csv', index=False)
+    # Run from elsewhere: the history is read next to the markets file
+    monkeypatch.chdir(tmp_path.parent)
+    [result] = morpho_share(str(tmp_path / 'morpho_plume_markets.csv'), total_tvl={'nALPHA': 15e6})
+    assert result['morpho_supply'] == 1e6
+    assert result['supply_history'] == {'Now': 1e6}
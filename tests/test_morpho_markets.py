@@ -0,0 +1,117 @@
+"""markets_frame and resolve_aliases against the per-market and per-asset code they replaced"""
+
+from datetime import datetime, timezone
+from itertools import combinations
+
+import pandas as pd
+import pytest
+
+from morpho_markets import AMOUNT_COLUMNS, NUMERIC_COLUMNS, PLUME_CHAIN_ID, markets_frame, resolve_aliases
+
+ASSETS = ['nALPHA', 'nBASIS', 'nTBILL', 'nOPAL', 'NINSTO', 'ALPHA', 'nelix', 'n', 'WETH']
+CANDIDATE_NAMES = ['NALPHA', 'ALPHA', 'nALPHA', 'BASIS', 'nTBILL', 'NTBILL', 'OPAL', 'NINSTO', 'elix', 'N']
+
+
+def old_morpho_name(asset, names):
+    """calculate_morpho_share's old lookup: exact, then without the n prefix, then upper case; the last hit wins"""
+    match = None
+    if asset in names:
+        match = asset
+    asset_without_n = asset[1:] if asset.startswith('n') else asset
+    if asset_without_n in names:
+        match = asset_without_n
+    asset_upper = asset.upper()
+    if asset_upper in names:
+        match = asset_upper
+    return match
+
+
+def old_market_record(market):
+    """The old per-market row builder, with the state timestamp read as UTC"""
+    loan_asset = market.get('loanAsset') or {}
+    collateral_asset = market.get('collateralAsset') or {}
+    state = market.get('state') or {}
+    daily_apys = market.get('dailyApys') or {}
+    timestamp = state.get('timestamp')
+    return {
+        'chain_id': market.get('chainId'),
+        'market_id': market.get('uniqueKey', ''),
+        'pair': f"{collateral_asset.get('symbol', 'Unknown')}/{loan_asset.get('symbol', 'Unknown')}",
+        'collateral_asset': collateral_asset.get('symbol', ''),
+        'collateral_address': collateral_asset.get('address', ''),
+        'loan_asset': loan_asset.get('symbol', ''),
+        'loan_address': loan_asset.get('address', ''),
+        'lltv': market.get('lltv', 0),
+        'supply_assets': state.get('supplyAssets', 0),
+        'supply_usd': state.get('supplyAssetsUsd', 0),
+        'borrow_assets': state.get('borrowAssets', 0),
+        'borrow_usd': state.get('borrowAssetsUsd', 0),
+        'collateral_assets': state.get('collateralAssets', 0),
+        'collateral_usd': state.get('collateralAssetsUsd', 0),
+        'liquidity_assets': state.get('liquidityAssets', 0),
+        'liquidity_usd': state.get('liquidityAssetsUsd', 0),
+        'supply_apy': state.get('supplyApy', 0),
+        'borrow_apy': state.get('borrowApy', 0),
+        'net_supply_apy': daily_apys.get('netSupplyApy', 0),
+        'net_borrow_apy': daily_apys.get('netBorrowApy', 0),
+        'utilization': state.get('utilization', 0),
+        'fee': state.get('fee', 0),
+        'oracle_address': market.get('oracleAddress', ''),
+        'irm_address': market.get('irmAddress', ''),
+        'last_updated': (datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+                         if timestamp else None),
+    }
+
+
+@pytest.fixture(scope='module')
+def markets(dataset):
+    return dataset.morpho_markets(PLUME_CHAIN_ID) + dataset.morpho_markets(1, markets=10)
+
+
+def test_markets_frame_matches_per_market_records(markets):
+    new = markets_frame(markets)
+    old = pd.DataFrame([old_market_record(market) for market in markets])
+    old[NUMERIC_COLUMNS] = old[NUMERIC_COLUMNS].astype(float)
+    # Token amounts are compared exactly: collateral amounts are ~1e25, past float precision
+    for column in AMOUNT_COLUMNS:
+        assert [str(value) for value in new[column].sort_index()] == [str(int(value)) for value in old[column]]
+        old[column] = old[column].map(int)
+    old['last_updated'] = pd.to_datetime(old['last_updated'])
+    old = old.sort_values('supply_usd', ascending=False, kind='stable')
+
+    pd.testing.assert_frame_equal(new, old[new.columns], check_dtype=False)
+
+
+def test_markets_frame_parses_numeric_strings_and_bad_values(markets):
+    broken = [dict(markets[0], lltv='not a number'), dict(markets[1], state=None)]
+    df = markets_frame(broken).set_index('market_id')
+
+    assert pd.isna(df.loc[markets[0]['uniqueKey'], 'lltv'])
+    assert df.loc[markets[1]['uniqueKey'], 'supply_usd'] == 0
+    assert pd.isna(df.loc[markets[1]['uniqueKey'], 'last_updated'])
+    assert markets_frame([]).empty
+
+
+def test_markets_frame_keeps_bigint_amounts_exact(markets, tmp_path):
+    lltv, supply_assets = 10**24 + 1, 2**200 + 1
+    market = dict(markets[1], lltv=str(lltv), state=dict(markets[1]['state'], supplyAssets=supply_assets))
+    df = markets_frame([market])
+    assert df['lltv'].iloc[0] == lltv and df['supply_assets'].iloc[0] == supply_assets
+
+    df.to_csv(tmp_path / 'markets.csv', index=False)
+    written = pd.read_csv(tmp_path / 'markets.csv', dtype=str)
+    assert written.loc[0, 'lltv'] == str(lltv)
+    assert written.loc[0, 'supply_assets'] == str(supply_assets)
+    assert written.loc[0, 'collateral_assets'] == market['state']['collateralAssets']
+
+
+def test_resolve_aliases_matches_old_lookup(markets):
+    # Assets may be listed under any mix of their variants, next to the synthetic collateral symbols
+    listed = {(market.get('collateralAsset') or {}).get('symbol', '') for market in markets}
+    assets = ASSETS + sorted(listed)
+    for size in range(len(CANDIDATE_NAMES) + 1):
+        for candidates in combinations(CANDIDATE_NAMES, size):
+            for names in (set(candidates), set(candidates) | listed):
+                aliases = resolve_aliases(assets, names)
+                for asset in assets:
+                    assert aliases.get(asset) == old_morpho_name(asset, names), (asset, names)
@@ -0,0 +1,83 @@
+"""classify_chain_keys and normalize_chain_tvls against the per-key split they replaced"""
+
+import pandas as pd
+import pytest
+
+from protocol_tvls import (AGGREGATE_KEYS, COLUMNS, METRIC_SUFFIXES, classify_chain_keys, load_protocol_chain_tvls,
+                           normalize_chain_tvls)
+
+EDGE_KEYS = ['Ethereum', 'Ethereum-borrowed', 'Ethereum-Staking', 'borrowed', 'tvl', 'TVL', 'staking',
+             'Arbitrum-pool2', 'Foo-bar', 'OP Mainnet-vesting', '-borrowed', 'Ethereum-', 'Sui-offers-borrowed']
+
+
+def split_chain_key(key):
+    """The old per-key split: (chain, metric), or None for protocol-wide totals"""
+    if key.lower() in AGGREGATE_KEYS:
+        return None
+    chain, sep, suffix = key.rpartition('-')
+    if sep and suffix.lower() in METRIC_SUFFIXES:
+        return chain, suffix.lower()
+    return key, 'base'
+
+
+def tvl_value(value):
+    if isinstance(value, dict):
+        value = value.get('tvl', 0)
+    return float(value) if value else 0.0
+
+
+def old_normalize_chain_tvls(protocols):
+    rows = []
+    for protocol in protocols:
+        fields = [protocol.get('name'), protocol.get('slug'), protocol.get('category')]
+        chain_tvls = protocol.get('chainTvls') or {}
+        if chain_tvls:
+            for key, value in chain_tvls.items():
+                split = split_chain_key(key)
+                if split is not None:
+                    rows.append(fields + [split[0], split[1], tvl_value(value)])
+        elif protocol.get('chain') and protocol.get('chain') != 'Multi-Chain':
+            rows.append(fields + [protocol['chain'], 'base', tvl_value(protocol.get('tvl'))])
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+@pytest.fixture(scope='module')
+def protocols(dataset):
+    return dataset.protocols()
+
+
+def test_classify_chain_keys_matches_split(protocols):
+    keys = pd.Series([key for protocol in protocols for key in (protocol.get('chainTvls') or {})] + EDGE_KEYS * 3,
+                     dtype=object)
+    classified = classify_chain_keys(keys)
+
+    for key, chain, metric in zip(keys, classified['chain'], classified['metric']):
+        split = split_chain_key(key)
+        if split is None:
+            assert pd.isna(metric), key
+        else:
+            assert (chain, metric) == split, key
+
+
+def test_classify_chain_keys_keeps_the_index():
+    keys = pd.Series(['Ethereum-borrowed', 'tvl', 'Base'], index=[10, 20, 30], dtype=object)
+    assert list(classify_chain_keys(keys).index) == [10, 20, 30]
+
+
+def test_normalize_matches_old_table(protocols):
+    protocols = protocols + [
+        {'name': 'Single', 'slug': 'single', 'category': 'Dexs', 'chain': 'Base', 'tvl': 5.0},
+        {'name': 'Multi', 'slug': 'multi', 'category': 'Dexs', 'chain': 'Multi-Chain', 'tvl': 7.0},
+        {'name': 'Edge', 'slug': 'edge', 'category': 'Lending', 'chainTvls': {key: 1.0 for key in EDGE_KEYS}},
+    ]
+    new = normalize_chain_tvls(protocols)
+    old = old_normalize_chain_tvls(protocols)
+
+    assert list(new.columns) == COLUMNS
+    pd.testing.assert_frame_equal(new.astype({column: object for column in COLUMNS[:-1]}), old)
+
+
+def test_written_table_loads_back(protocols, data_dir):
+    loaded = load_protocol_chain_tvls(data_dir)
+    expected = normalize_chain_tvls(protocols)
+    pd.testing.assert_frame_equal(loaded.astype(str), expected.astype(str))